@@ -1,8 +1,6 @@
 import base64
 import json
-import os
 import shutil
-import subprocess
 import time
 from pathlib import Path
 
@@ -16,7 +14,9 @@ from pulse8_core_cli.shared.module import (
     get_dotdocker_config_file_path,
     get_ghcrtoken_path,
     execute_shell_command,
+    execute_shell_steps,
 )
+from pulse8_core_cli.shared.runner import CommandFailedError, run_command
 
 
 def auth_login(email: str) -> None:
@@ -46,8 +46,21 @@ def auth_login(email: str) -> None:
         exit(1)
 
     print("[bold]authenticate against github.com...[bold]")
-    os.system(
-        "gh auth login --insecure-storage --git-protocol=https --hostname=github.com --web --scopes 'user:email'"
+    execute_shell_steps(
+        [
+            [
+                "gh",
+                "auth",
+                "login",
+                "--insecure-storage",
+                "--git-protocol=https",
+                "--hostname=github.com",
+                "--web",
+                "--scopes",
+                "user:email",
+            ]
+        ],
+        interactive=True,
     )
     if email not in get_github_emails():
         print("❌ The email you entered is not verified on your GitHub account.")
@@ -259,15 +272,19 @@ def setup_npmrc(token: str, email: str) -> None:
 
 
 def adjust_git_config(email: str):
-    os.system("git config --global core.longpaths true")
+    execute_shell_steps([["git", "config", "--global", "core.longpaths", "true"]])
     try:
         name = email.split("@")[0]
         name_parts = name.split(".")
         first_name = name_parts[0]
         last_name = name_parts[1]
         username = (first_name + " " + last_name).title()
-        os.system('git config --global user.name "' + username + '"')
-        os.system('git config --global user.email "' + email + '"')
+        execute_shell_steps(
+            [
+                ["git", "config", "--global", "user.name", username],
+                ["git", "config", "--global", "user.email", email],
+            ]
+        )
         print("email updated in git and username for git changed to " + username)
     except Exception:
         print(
@@ -276,17 +293,13 @@ def adjust_git_config(email: str):
 
 def get_github_emails():
     try:
-        result = subprocess.run(
-            ["gh", "api", "user/emails", "--jq", ".[].email"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            check=True,
-            text=True
+        result = run_command(
+            ["gh", "api", "user/emails", "--jq", ".[].email"], check=True
         )
         emails = result.stdout.lower().strip().split('\n')
         return emails
-    except subprocess.CalledProcessError as e:
+    except CommandFailedError as e:
         print("❌ Failed to get emails from GitHub. Make sure you ran:")
         print("   gh auth refresh -s user:email")
-        print(e.stderr)
+        print(e.result.stderr)
         return []
@@ -1,3 +1,5 @@
+from pathlib import Path
+
 import typer
 from typing_extensions import Annotated
 
@@ -6,6 +8,7 @@ from pulse8_core_cli.backend.functions import (
     backend_update,
     backend_release,
 )
+from pulse8_core_cli.shared.template_batch import DEFAULT_JOBS
 
 app = typer.Typer()
 
@@ -32,11 +35,32 @@ def create(
         bool, typer.Option(help="Skip answered questions")
     ] = False,
     ssh: Annotated[bool, typer.Option(help="Use SSH for git remote")] = False,
+    offline: Annotated[
+        bool, typer.Option(help="Only use the locally cached template")
+    ] = False,
+    answers_dir: Annotated[
+        Path,
+        typer.Option(
+            help="Create one project per answers file (*.yml, *.yaml) of the directory"
+        ),
+    ] = None,
+    jobs: Annotated[
+        int, typer.Option(help="Projects created in parallel with --answers-dir")
+    ] = DEFAULT_JOBS,
 ):
     """
     Create a new backend
     """
-    backend_create(create_remote_repository, answers_file, defaults, skip_answered, ssh)
+    backend_create(
+        create_remote_repository,
+        answers_file,
+        defaults,
+        skip_answered,
+        ssh,
+        offline,
+        answers_dir,
+        jobs,
+    )
 
 
 @app.command()
@@ -46,11 +70,18 @@ def update(
         bool, typer.Option(help="Use default answers and skip questions")
     ] = False,
     skip_answered: Annotated[bool, typer.Option(help="Skip answered questions")] = True,
+    offline: Annotated[
+        bool, typer.Option(help="Only use the locally cached template")
+    ] = False,
+    dry_run: Annotated[
+        bool,
+        typer.Option(help="Only print the files the update would change"),
+    ] = False,
 ):
     """
     Update an existing backend
     """
-    backend_update(answers_file, defaults, skip_answered)
+    backend_update(answers_file, defaults, skip_answered, offline, dry_run)
 
 
 @app.command()
@@ -1,6 +1,12 @@
-import os
+from pathlib import Path
 
 from pulse8_core_cli.shared.constants import TEMPLATE_REPO_BACKEND_FASTAPI, POETRY
+from pulse8_core_cli.shared.project_tasks import get_poetry_tasks
+from pulse8_core_cli.shared.task_runner import run_tasks
+from pulse8_core_cli.shared.template_batch import (
+    DEFAULT_JOBS,
+    create_templates_from_answers_dir,
+)
 from pulse8_core_cli.shared.template_management import (
     create_template,
     update_template,
@@ -8,16 +14,36 @@ from pulse8_core_cli.shared.template_management import (
 )
 
 
+def backend_fastapi_callback_after_git_init():
+    run_tasks(get_poetry_tasks(), force=True)
+
+
+def backend_fastapi_callback_after_update():
+    run_tasks(get_poetry_tasks())
+
+
 def backend_fastapi_create(
     create_remote_repo: bool,
     answers_file: str,
     defaults: bool,
     skip_answered: bool,
     ssh: bool,
+    offline: bool = False,
+    answers_dir: Path | None = None,
+    jobs: int = DEFAULT_JOBS,
 ):
-    def callback_after_git_init():
-        os.system(f"poetry lock --no-update")
-        os.system(f"poetry install --no-root")
+    if answers_dir is not None:
+        create_templates_from_answers_dir(
+            TEMPLATE_REPO_BACKEND_FASTAPI,
+            answers_dir,
+            callback_after_git_init=backend_fastapi_callback_after_git_init,
+            project_type="backend-fastapi",
+            jobs=jobs,
+            ssh=ssh,
+            offline=offline,
+            create_remote_repo=bool(create_remote_repo),
+        )
+        return
 
     create_template(
         TEMPLATE_REPO_BACKEND_FASTAPI,
@@ -26,21 +52,26 @@ def backend_fastapi_create(
         defaults,
         skip_answered,
         ssh,
-        callback_after_git_init=callback_after_git_init,
+        callback_after_git_init=backend_fastapi_callback_after_git_init,
+        offline=offline,
     )
 
 
-def backend_fastapi_update(answers_file: str, defaults: bool, skip_answered: bool):
-    def callback_after_update():
-        os.system(f"poetry lock --no-update")
-        os.system(f"poetry install --no-root")
-
+def backend_fastapi_update(
+    answers_file: str,
+    defaults: bool,
+    skip_answered: bool,
+    offline: bool = False,
+    dry_run: bool = False,
+):
     update_template(
         TEMPLATE_REPO_BACKEND_FASTAPI,
         answers_file,
         defaults,
         skip_answered,
-        callback_after_update=callback_after_update,
+        callback_after_update=backend_fastapi_callback_after_update,
+        offline=offline,
+        dry_run=dry_run,
     )
 
 
@@ -1,3 +1,4 @@
+from pathlib import Path
 from typing import Annotated
 
 import typer
@@ -7,6 +8,7 @@ from pulse8_core_cli.backend_fastapi.functions import (
     backend_fastapi_create,
     backend_fastapi_release,
 )
+from pulse8_core_cli.shared.template_batch import DEFAULT_JOBS
 
 app = typer.Typer()
 
@@ -33,12 +35,31 @@ def create(
         bool, typer.Option(help="Skip answered questions")
     ] = False,
     ssh: Annotated[bool, typer.Option(help="Use SSH for git remote")] = False,
+    offline: Annotated[
+        bool, typer.Option(help="Only use the locally cached template")
+    ] = False,
+    answers_dir: Annotated[
+        Path,
+        typer.Option(
+            help="Create one project per answers file (*.yml, *.yaml) of the directory"
+        ),
+    ] = None,
+    jobs: Annotated[
+        int, typer.Option(help="Projects created in parallel with --answers-dir")
+    ] = DEFAULT_JOBS,
 ):
     """
     Create a new backend
     """
     backend_fastapi_create(
-        create_remote_repository, answers_file, defaults, skip_answered, ssh
+        create_remote_repository,
+        answers_file,
+        defaults,
+        skip_answered,
+        ssh,
+        offline,
+        answers_dir,
+        jobs,
     )
 
 
@@ -49,11 +70,18 @@ def update(
         bool, typer.Option(help="Use default answers and skip questions")
     ] = False,
     skip_answered: Annotated[bool, typer.Option(help="Skip answered questions")] = True,
+    offline: Annotated[
+        bool, typer.Option(help="Only use the locally cached template")
+    ] = False,
+    dry_run: Annotated[
+        bool,
+        typer.Option(help="Only print the files the update would change"),
+    ] = False,
 ):
     """
     Update an existing backend
     """
-    backend_fastapi_update(answers_file, defaults, skip_answered)
+    backend_fastapi_update(answers_file, defaults, skip_answered, offline, dry_run)
 
 
 @app.command()
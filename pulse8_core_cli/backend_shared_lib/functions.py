@@ -1,10 +1,15 @@
-import os
+from pathlib import Path
 
 from pulse8_core_cli.shared.constants import (
     TEMPLATE_REPO_BACKEND_SHARED_LIB_JAVA,
     MAVEN,
 )
-from pulse8_core_cli.shared.module import get_maven_wrapper_executable
+from pulse8_core_cli.shared.project_tasks import get_maven_tasks
+from pulse8_core_cli.shared.task_runner import run_tasks
+from pulse8_core_cli.shared.template_batch import (
+    DEFAULT_JOBS,
+    create_templates_from_answers_dir,
+)
 from pulse8_core_cli.shared.template_management import (
     create_template,
     update_template,
@@ -12,16 +17,37 @@ from pulse8_core_cli.shared.template_management import (
 )
 
 
+def backend_shared_lib_callback_after_git_init():
+    run_tasks(get_maven_tasks(), force=True)
+
+
+def backend_shared_lib_callback_after_update():
+    run_tasks(get_maven_tasks())
+
+
 def backend_shared_lib_create(
     create_remote_repo: bool,
     answers_file: str,
     defaults: bool,
     skip_answered: bool,
     ssh: bool,
+    offline: bool = False,
+    answers_dir: Path | None = None,
+    jobs: int = DEFAULT_JOBS,
 ):
-    def callback_after_git_init():
-        os.system(f"{get_maven_wrapper_executable()} spotless:apply")
-        os.system(f"{get_maven_wrapper_executable()} clean install")
+    if answers_dir is not None:
+        create_templates_from_answers_dir(
+            TEMPLATE_REPO_BACKEND_SHARED_LIB_JAVA,
+            answers_dir,
+            callback_after_git_init=backend_shared_lib_callback_after_git_init,
+            check_win_registry=True,
+            project_type="backend-shared-lib",
+            jobs=jobs,
+            ssh=ssh,
+            offline=offline,
+            create_remote_repo=bool(create_remote_repo),
+        )
+        return
 
     create_template(
         TEMPLATE_REPO_BACKEND_SHARED_LIB_JAVA,
@@ -30,26 +56,30 @@ def backend_shared_lib_create(
         defaults,
         skip_answered,
         ssh,
-        callback_after_git_init=callback_after_git_init,
+        callback_after_git_init=backend_shared_lib_callback_after_git_init,
         check_win_registry=True,
         caller_command="pulse8 backend-shared-lib create",
+        offline=offline,
     )
 
 
-def backend_shared_lib_update(answers_file: str, defaults: bool, skip_answered: bool):
-    def callback_after_update():
-        os.system(f"{get_maven_wrapper_executable()} spotless:apply")
-        os.system(f"git add -u :/")
-        os.system(f"{get_maven_wrapper_executable()} clean install")
-
+def backend_shared_lib_update(
+    answers_file: str,
+    defaults: bool,
+    skip_answered: bool,
+    offline: bool = False,
+    dry_run: bool = False,
+):
     update_template(
         TEMPLATE_REPO_BACKEND_SHARED_LIB_JAVA,
         answers_file,
         defaults,
         skip_answered,
-        callback_after_update=callback_after_update,
+        callback_after_update=backend_shared_lib_callback_after_update,
         check_win_registry=True,
         caller_command="pulse8 backend-shared-lib update",
+        offline=offline,
+        dry_run=dry_run,
     )
 
 
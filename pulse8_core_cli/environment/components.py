@@ -0,0 +1,190 @@
+import functools
+from dataclasses import dataclass
+from typing import Iterable
+
+from pulse8_core_cli.environment.constants import (
+    INFRA,
+    INFRA_DEPENDENCIES_INFRA,
+    INFRA_UNSUPPORTED_ARM,
+    KEY_CHOICES_INFRA,
+    KEY_CHOICES_SERVICES,
+    SERVICES,
+    SERVICES_DEPENDENCIES_INFRA,
+    SERVICES_DEPENDENCIES_SERVICES,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class ComponentDefinition:
+    key: str
+    # KEY_CHOICES_INFRA or KEY_CHOICES_SERVICES
+    kind: str
+    name: str
+    repository: str
+    branch: str
+    # direct dependencies
+    dependencies: tuple[str, ...]
+    supports_arm: bool = True
+
+    @property
+    def kustomization_name(self) -> str:
+        if self.kind == KEY_CHOICES_INFRA:
+            return f"pulse8-core-env-{self.key}"
+        return self.key
+
+    @property
+    def source_name(self) -> str:
+        return f"{self.kustomization_name}-repo"
+
+
+@dataclass(frozen=True, slots=True)
+class ComponentRegistry:
+    """
+    All components with their transitive dependencies and install order,
+    computed once. Unknown keys (e.g. services only defined by a stored setup)
+    have no dependencies.
+    """
+
+    components: dict[str, ComponentDefinition]
+    # transitive dependencies of every component
+    closures: dict[str, frozenset[str]]
+    # 0 for components without dependencies, else 1 + the highest dependency level
+    levels: dict[str, int]
+    # all components, dependencies first
+    order: tuple[str, ...]
+
+    def get(self, key: str) -> ComponentDefinition | None:
+        return self.components.get(key)
+
+    def get_kind(self, kind: str) -> list[ComponentDefinition]:
+        return [c for c in self.components.values() if c.kind == kind]
+
+    def sort(self, keys: Iterable[str]) -> list[str]:
+        """
+        Keys in install order - unknown keys first, as they have no dependencies.
+        """
+        position = {key: index for index, key in enumerate(self.order)}
+        return sorted(set(keys), key=lambda key: (position.get(key, -1), key))
+
+    def resolve(self, keys: Iterable[str]) -> list[str]:
+        """
+        The keys with all their transitive dependencies, in install order.
+        """
+        keys = set(keys)
+        return self.sort(
+            keys.union(*(self.closures.get(key, frozenset()) for key in keys))
+        )
+
+    def to_choices(self, keys: Iterable[str]) -> dict[str, list[str]]:
+        keys = self.sort(keys)
+        return {
+            KEY_CHOICES_INFRA: [
+                key
+                for key in keys
+                if key in self.components
+                and self.components[key].kind == KEY_CHOICES_INFRA
+            ],
+            KEY_CHOICES_SERVICES: [
+                key
+                for key in keys
+                if key not in self.components
+                or self.components[key].kind == KEY_CHOICES_SERVICES
+            ],
+        }
+
+    def get_graph(self, keys: Iterable[str]) -> dict[str, list[str]]:
+        """
+        Every key mapped to the direct dependencies among the keys.
+        """
+        keys = self.sort(keys)
+        selected = set(keys)
+        return {
+            key: [
+                dependency
+                for dependency in (
+                    self.components[key].dependencies if key in self.components else ()
+                )
+                if dependency in selected
+            ]
+            for key in keys
+        }
+
+    def get_waves(self, keys: Iterable[str]) -> list[list[str]]:
+        """
+        Group the keys into waves - every component of a wave only depends on
+        components of earlier waves.
+        """
+        waves: dict[int, list[str]] = dict()
+        for key in self.sort(keys):
+            waves.setdefault(self.levels.get(key, 0), []).append(key)
+        return [sorted(waves[level]) for level in sorted(waves)]
+
+
+def get_component_definitions() -> list[ComponentDefinition]:
+    definitions = [
+        ComponentDefinition(
+            key=key,
+            kind=KEY_CHOICES_INFRA,
+            name=infra["name"],
+            repository=infra["repository"],
+            branch=infra["branch"],
+            dependencies=tuple(INFRA_DEPENDENCIES_INFRA.get(key, [])),
+            supports_arm=key not in INFRA_UNSUPPORTED_ARM,
+        )
+        for key, infra in INFRA.items()
+    ]
+    definitions += [
+        ComponentDefinition(
+            key=key,
+            kind=KEY_CHOICES_SERVICES,
+            name=service["name"],
+            repository=service["repository"],
+            branch=service["branch"],
+            dependencies=tuple(
+                SERVICES_DEPENDENCIES_INFRA.get(key, [])
+                + SERVICES_DEPENDENCIES_SERVICES.get(key, [])
+            ),
+        )
+        for key, service in SERVICES.items()
+    ]
+    return definitions
+
+
+def build_component_registry(
+    definitions: list[ComponentDefinition],
+) -> ComponentRegistry:
+    components = {definition.key: definition for definition in definitions}
+    closures: dict[str, frozenset[str]] = dict()
+    levels: dict[str, int] = dict()
+
+    def visit(key: str, path: tuple[str, ...]) -> None:
+        if key in closures:
+            return
+        if key in path:
+            raise ValueError(
+                f"circular component dependencies: {' -> '.join(path + (key,))}"
+            )
+        dependencies = components[key].dependencies
+        for dependency in dependencies:
+            if dependency not in components:
+                raise ValueError(f"{key} depends on unknown component {dependency}")
+            visit(dependency, path + (key,))
+        closures[key] = frozenset(dependencies).union(
+            *(closures[dependency] for dependency in dependencies)
+        )
+        levels[key] = 1 + max((levels[d] for d in dependencies), default=-1)
+
+    for key in components:
+        visit(key, ())
+    declared = list(components)
+    order = tuple(
+        sorted(components, key=lambda key: (levels[key], declared.index(key)))
+    )
+    return ComponentRegistry(
+        components=components, closures=closures, levels=levels, order=order
+    )
+
+
+@functools.cache
+def get_component_registry() -> ComponentRegistry:
+    return build_component_registry(get_component_definitions())
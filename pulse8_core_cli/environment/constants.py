@@ -65,6 +65,74 @@ SERVICES = {
     },
 }
 
+INFRA = {
+    KEY_CHOICES_INFRA_POSTGRESQL: {
+        "name": "PostgreSQL",
+        "repository": "https://github.com/synpulse-group/pulse8-core-env-postgresql.git",
+        "branch": "main",
+    },
+    KEY_CHOICES_INFRA_KAFKA: {
+        "name": "Kafka (Confluent for Kubernetes)",
+        "repository": "https://github.com/synpulse-group/pulse8-core-env-kafka.git",
+        "branch": "main",
+    },
+    KEY_CHOICES_INFRA_REDIS: {
+        "name": "Redis",
+        "repository": "https://github.com/synpulse-group/pulse8-core-env-redis.git",
+        "branch": "main",
+    },
+    KEY_CHOICES_INFRA_EXASOL: {
+        "name": "Exasol",
+        "repository": "https://github.com/synpulse-group/pulse8-core-env-exasol.git",
+        "branch": "main",
+    },
+    KEY_CHOICES_INFRA_MARIADB: {
+        "name": "MariaDB",
+        "repository": "https://github.com/synpulse-group/pulse8-core-env-mariadb.git",
+        "branch": "main",
+    },
+    KEY_CHOICES_INFRA_PINOT: {
+        "name": "Pinot",
+        "repository": "https://github.com/synpulse-group/pulse8-core-env-pinot.git",
+        "branch": "main",
+    },
+    KEY_CHOICES_INFRA_TEEDY: {
+        "name": "Teedy",
+        "repository": "https://github.com/synpulse-group/pulse8-core-env-teedy.git",
+        "branch": "main",
+    },
+    KEY_CHOICES_INFRA_KEYCLOAK: {
+        "name": "Keycloak",
+        "repository": "https://github.com/synpulse-group/pulse8-core-env-keycloak.git",
+        "branch": "main",
+    },
+    KEY_CHOICES_INFRA_SPARK: {
+        "name": "Apache Spark",
+        "repository": "https://github.com/synpulse-group/pulse8-core-env-spark.git",
+        "branch": "main",
+    },
+    KEY_CHOICES_INFRA_NIFI: {
+        "name": "Apache NiFi",
+        "repository": "https://github.com/synpulse-group/pulse8-core-env-nifi.git",
+        "branch": "main",
+    },
+    KEY_CHOICES_INFRA_AIRFLOW: {
+        "name": "Apache Airflow",
+        "repository": "https://github.com/synpulse-group/pulse8-core-env-airflow.git",
+        "branch": "main",
+    },
+    KEY_CHOICES_INFRA_SUPERSET: {
+        "name": "Apache Superset",
+        "repository": "https://github.com/synpulse-group/pulse8-core-env-superset.git",
+        "branch": "main",
+    },
+    KEY_CHOICES_INFRA_CLOUDSERVER: {
+        "name": "Zenko Cloudserver (S3)",
+        "repository": "https://github.com/synpulse-group/pulse8-core-env-cloudserver.git",
+        "branch": "main",
+    },
+}
+
 INFRA_DEPENDENCIES_INFRA = {
     KEY_CHOICES_INFRA_KEYCLOAK: [
         KEY_CHOICES_INFRA_POSTGRESQL,
@@ -74,6 +142,9 @@ INFRA_DEPENDENCIES_INFRA = {
     ],
 }
 
+# not available for arm64 - maybe bring proxy solution in place
+INFRA_UNSUPPORTED_ARM = [KEY_CHOICES_INFRA_EXASOL]
+
 SERVICES_DEPENDENCIES_INFRA = {
     KEY_CHOICES_SERVICES_IAM: [
         KEY_CHOICES_INFRA_KEYCLOAK,
@@ -107,3 +178,53 @@ SERVICES_DEPENDENCIES_SERVICES = {
     KEY_CHOICES_SERVICES_WORKFLOW_ENGINE: [],
     KEY_CHOICES_SERVICES_ACCESS_CONTROL: [],
 }
+
+FLUX_NAMESPACE = "flux-system"
+# field manager used for server-side applies of the CLI
+KUBERNETES_FIELD_MANAGER = "pulse8-cli"
+
+# time a component may take to become ready when waiting for an environment
+DEFAULT_READY_TIMEOUT = "10m"
+COMPONENT_READY_TIMEOUTS = {
+    KEY_CHOICES_INFRA_KAFKA: "20m",
+    KEY_CHOICES_INFRA_PINOT: "15m",
+    KEY_CHOICES_INFRA_EXASOL: "20m",
+    KEY_CHOICES_INFRA_SPARK: "15m",
+    KEY_CHOICES_INFRA_AIRFLOW: "15m",
+}
+
+# pull-through caches shared by all environments - upstream registry: k3d registry name + host port
+REGISTRY_MIRRORS = {
+    "ghcr.io": {"name": "p8-cache-ghcr", "port": 5101},
+    "synpulse.jfrog.io": {"name": "p8-cache-jfrog", "port": 5102},
+}
+
+# resource profiles - full installs every component with its upstream defaults
+KEY_PROFILE = "profile"
+PROFILE_LITE = "lite"
+PROFILE_STANDARD = "standard"
+PROFILE_FULL = "full"
+PROFILES = [PROFILE_LITE, PROFILE_STANDARD, PROFILE_FULL]
+DEFAULT_PROFILE = PROFILE_FULL
+
+# images of the infra components, preloaded into new environments before any were
+# recorded - keep in sync with the charts of the pulse8-core-env-* repositories
+COMPONENT_IMAGES = {
+    KEY_CHOICES_INFRA_POSTGRESQL: ["docker.io/library/postgres:16"],
+    KEY_CHOICES_INFRA_KAFKA: [
+        "docker.io/confluentinc/confluent-operator:0.921.20",
+        "docker.io/confluentinc/cp-server:7.6.1",
+        "docker.io/confluentinc/cp-zookeeper:7.6.1",
+    ],
+    KEY_CHOICES_INFRA_REDIS: ["docker.io/library/redis:7"],
+    KEY_CHOICES_INFRA_EXASOL: ["docker.io/exasol/docker-db:7.1.25"],
+    KEY_CHOICES_INFRA_MARIADB: ["docker.io/library/mariadb:11"],
+    KEY_CHOICES_INFRA_PINOT: ["docker.io/apachepinot/pinot:1.1.0"],
+    KEY_CHOICES_INFRA_TEEDY: ["docker.io/sismics/docs:v1.11"],
+    KEY_CHOICES_INFRA_KEYCLOAK: ["quay.io/keycloak/keycloak:24.0"],
+    KEY_CHOICES_INFRA_SPARK: ["docker.io/apache/spark:3.5.1"],
+    KEY_CHOICES_INFRA_NIFI: ["docker.io/apache/nifi:1.25.0"],
+    KEY_CHOICES_INFRA_AIRFLOW: ["docker.io/apache/airflow:2.9.1"],
+    KEY_CHOICES_INFRA_SUPERSET: ["docker.io/apache/superset:4.0.1"],
+    KEY_CHOICES_INFRA_CLOUDSERVER: ["docker.io/zenko/cloudserver:8.8.24"],
+}
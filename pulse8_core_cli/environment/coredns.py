@@ -0,0 +1,178 @@
+import time
+from dataclasses import dataclass, field
+
+from rich import print
+
+from pulse8_core_cli.environment.manifests import apply_manifests
+from pulse8_core_cli.shared.kube_client import KubernetesApiError, get_kube_client
+from pulse8_core_cli.shared.profiling import profiled
+
+COREDNS_NAMESPACE = "kube-system"
+COREDNS_CONFIGMAP_NAME = "coredns"
+COREDNS_CONFIGMAP_TIMEOUT = 120
+# resolve *.local.synpulse8.com to the docker host from within the cluster
+COREDNS_REWRITE = [
+    "stop",
+    "name",
+    "regex",
+    r"(.*\.)?local\.synpulse8\.com",
+    "host.k3d.internal",
+]
+
+
+@dataclass
+class Directive:
+    """
+    A directive of a Corefile - a server block is a directive with its keys as
+    name / args, a plugin block is a directive with nested directives.
+    """
+
+    name: str
+    args: list[str] = field(default_factory=list)
+    block: list["Directive"] | None = None
+
+
+def parse_corefile(corefile: str) -> list[Directive]:
+    root: list[Directive] = []
+    stack = [root]
+    for raw_line in corefile.splitlines():
+        line = raw_line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        if line == "}":
+            if len(stack) == 1:
+                raise ValueError("unbalanced '}' in Corefile")
+            stack.pop()
+            continue
+        tokens = line.split()
+        opens_block = tokens[-1] == "{"
+        if opens_block:
+            tokens = tokens[:-1]
+        if tokens[-1].endswith("{"):
+            # keys written without a space before the brace, e.g. ".:53{"
+            tokens[-1] = tokens[-1][:-1]
+            opens_block = True
+        directive = Directive(name=tokens[0], args=tokens[1:])
+        stack[-1].append(directive)
+        if opens_block:
+            directive.block = []
+            stack.append(directive.block)
+    if len(stack) != 1:
+        raise ValueError("unclosed block in Corefile")
+    return root
+
+
+def render_corefile(directives: list[Directive], indent: int = 0) -> str:
+    lines = []
+    for directive in directives:
+        line = " " * indent + " ".join([directive.name, *directive.args])
+        if directive.block is None:
+            lines.append(line)
+            continue
+        lines.append(f"{line} {{")
+        rendered_block = render_corefile(directive.block, indent + 4)
+        if rendered_block:
+            lines.append(rendered_block.rstrip("\n"))
+        lines.append(" " * indent + "}")
+    return "\n".join(lines) + "\n"
+
+
+def find_directive(directives: list[Directive], name: str) -> int | None:
+    for index, directive in enumerate(directives):
+        if directive.name == name:
+            return index
+    return None
+
+
+def patch_corefile(corefile: str) -> str:
+    """
+    Add the local.synpulse8.com rewrite to the main server block and make sure the
+    reload plugin picks up the change. Returns the Corefile unchanged if it already
+    contains both.
+    """
+    server_blocks = parse_corefile(corefile)
+    server = next(
+        (
+            block
+            for block in server_blocks
+            if block.block is not None
+            and any(key in (".", ".:53") for key in [block.name, *block.args])
+        ),
+        None,
+    )
+    if server is None:
+        raise ValueError("no root server block in Corefile")
+    plugins = server.block
+    changed = False
+    rewrite_present = any(
+        plugin.name == "rewrite" and plugin.args == COREDNS_REWRITE
+        for plugin in plugins
+    )
+    if not rewrite_present:
+        # rewrite must run before the kubernetes plugin answers the query
+        index = find_directive(plugins, "kubernetes")
+        plugins.insert(
+            len(plugins) if index is None else index,
+            Directive(name="rewrite", args=list(COREDNS_REWRITE)),
+        )
+        changed = True
+    if find_directive(plugins, "reload") is None:
+        plugins.append(Directive(name="reload"))
+        changed = True
+    return render_corefile(server_blocks) if changed else corefile
+
+
+def get_coredns_configmap() -> dict:
+    deadline = time.monotonic() + COREDNS_CONFIGMAP_TIMEOUT
+    while True:
+        error = "configmap not found"
+        try:
+            configmap = get_kube_client().get(
+                "v1",
+                "ConfigMap",
+                COREDNS_CONFIGMAP_NAME,
+                namespace=COREDNS_NAMESPACE,
+            )
+        except (KubernetesApiError, OSError) as e:
+            configmap = None
+            error = str(e)
+        if configmap is not None:
+            return configmap
+        if time.monotonic() > deadline:
+            print("[bold red]failed to read coredns configuration[/bold red]")
+            print(error)
+            exit(1)
+        # k3s deploys coredns shortly after the api server becomes available
+        time.sleep(2)
+
+
+@profiled()
+def configure_coredns() -> None:
+    """
+    Patch the Corefile of the cluster with a single server-side apply.
+    CoreDNS reloads the changed Corefile by itself, no rollout restart needed.
+    """
+    configmap = get_coredns_configmap()
+    corefile = configmap.get("data", {}).get("Corefile", "")
+    try:
+        corefile_patched = patch_corefile(corefile)
+    except ValueError as e:
+        print(f"[bold red]failed to parse coredns configuration: {e}[/bold red]")
+        exit(1)
+    if corefile_patched == corefile:
+        print("[green]coredns configuration up to date[/green]")
+        return
+    apply_manifests(
+        [
+            {
+                "apiVersion": "v1",
+                "kind": "ConfigMap",
+                "metadata": {
+                    "name": COREDNS_CONFIGMAP_NAME,
+                    "namespace": COREDNS_NAMESPACE,
+                },
+                "data": {"Corefile": corefile_patched},
+            }
+        ],
+        message_success="applied new coredns configuration",
+    )
@@ -0,0 +1,326 @@
+import functools
+import json
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import yaml
+
+from pulse8_core_cli.environment.constants import (
+    KEY_CHOICES_INFRA,
+    KEY_CHOICES_SERVICES,
+)
+from pulse8_core_cli.shared.module import (
+    get_environments_db_path,
+    get_environments_dir_path,
+)
+
+SCHEMA_VERSION = 1
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS environments (
+    identifier TEXT PRIMARY KEY,
+    cluster TEXT NOT NULL,
+    setup TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    last_used_at REAL NOT NULL,
+    deleted_at REAL
+);
+CREATE TABLE IF NOT EXISTS environment_components (
+    identifier TEXT NOT NULL REFERENCES environments (identifier),
+    component TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    version TEXT,
+    PRIMARY KEY (identifier, component)
+);
+CREATE INDEX IF NOT EXISTS environment_components_component
+    ON environment_components (component);
+CREATE INDEX IF NOT EXISTS environments_last_used_at
+    ON environments (last_used_at);
+CREATE TABLE IF NOT EXISTS environment_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    identifier TEXT NOT NULL,
+    event TEXT NOT NULL,
+    setup TEXT,
+    at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS environment_history_identifier
+    ON environment_history (identifier, at);
+"""
+# seconds to wait for another pulse8 process holding the write lock
+LOCK_TIMEOUT = 10
+# YAML setups of earlier CLI versions are moved here once imported
+IMPORTED_YAML_DIR = "imported"
+
+EVENT_CREATED = "created"
+EVENT_UPDATED = "updated"
+EVENT_USED = "used"
+EVENT_RESTORED = "restored"
+EVENT_DELETED = "deleted"
+EVENT_IMPORTED = "imported"
+
+
+@dataclass(frozen=True)
+class Component:
+    name: str
+    kind: str
+    version: str | None
+
+
+@dataclass(frozen=True)
+class EnvironmentRecord:
+    identifier: str
+    cluster: str
+    setup: dict
+    created_at: float
+    updated_at: float
+    last_used_at: float
+    components: tuple[Component, ...]
+
+
+@dataclass(frozen=True)
+class HistoryEntry:
+    event: str
+    at: float
+    setup: dict | None
+
+
+def get_setup_components(setup: dict) -> list[Component]:
+    """
+    Selected components of a setup - infra by name, services not suspended with
+    the ref they are pinned to.
+    """
+    components = [
+        Component(name=name, kind=KEY_CHOICES_INFRA, version=None)
+        for name in setup.get(KEY_CHOICES_INFRA) or []
+    ]
+    for name, service in (setup.get(KEY_CHOICES_SERVICES) or {}).items():
+        if service.get("suspend"):
+            continue
+        components.append(
+            Component(
+                name=name,
+                kind=KEY_CHOICES_SERVICES,
+                version=service.get("ref-name") or service.get("branch"),
+            )
+        )
+    return components
+
+
+class EnvironmentRegistry:
+    """
+    Setups, selected components and lifecycle of all environments, kept in a
+    SQLite database in the pulse8 directory.
+    """
+
+    def __init__(self, path: Path):
+        self.connection = sqlite3.connect(path, timeout=LOCK_TIMEOUT)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        if (
+            self.connection.execute("PRAGMA user_version").fetchone()[0]
+            < SCHEMA_VERSION
+        ):
+            with self.connection:
+                self.connection.executescript(SCHEMA)
+                self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _add_history(self, identifier: str, event: str, setup: dict | None, at: float):
+        self.connection.execute(
+            "INSERT INTO environment_history (identifier, event, setup, at) VALUES (?, ?, ?, ?)",
+            (identifier, event, json.dumps(setup) if setup is not None else None, at),
+        )
+
+    def save(
+        self,
+        identifier: str,
+        setup: dict,
+        event: str | None = None,
+        at: float | None = None,
+    ) -> None:
+        """
+        Create or update the setup of an environment. The event recorded in the
+        history defaults to created / updated.
+        """
+        at = at or time.time()
+        with self.connection:
+            existing = self.connection.execute(
+                "SELECT deleted_at FROM environments WHERE identifier = ?",
+                (identifier,),
+            ).fetchone()
+            is_new = existing is None or existing["deleted_at"] is not None
+            self.connection.execute(
+                """
+                INSERT INTO environments
+                    (identifier, cluster, setup, created_at, updated_at, last_used_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (identifier) DO UPDATE SET
+                    cluster = excluded.cluster,
+                    setup = excluded.setup,
+                    created_at = CASE WHEN deleted_at IS NULL
+                        THEN created_at ELSE excluded.created_at END,
+                    updated_at = excluded.updated_at,
+                    last_used_at = excluded.last_used_at,
+                    deleted_at = NULL
+                """,
+                (
+                    identifier,
+                    setup.get("cluster") or identifier,
+                    json.dumps(setup),
+                    at,
+                    at,
+                    at,
+                ),
+            )
+            self.connection.execute(
+                "DELETE FROM environment_components WHERE identifier = ?",
+                (identifier,),
+            )
+            self.connection.executemany(
+                "INSERT INTO environment_components (identifier, component, kind, version) VALUES (?, ?, ?, ?)",
+                [
+                    (identifier, component.name, component.kind, component.version)
+                    for component in get_setup_components(setup)
+                ],
+            )
+            self._add_history(
+                identifier,
+                event or (EVENT_CREATED if is_new else EVENT_UPDATED),
+                setup,
+                at,
+            )
+
+    def touch(self, identifier: str) -> None:
+        at = time.time()
+        with self.connection:
+            updated = self.connection.execute(
+                "UPDATE environments SET last_used_at = ? WHERE identifier = ? AND deleted_at IS NULL",
+                (at, identifier),
+            ).rowcount
+            if updated:
+                self._add_history(identifier, EVENT_USED, None, at)
+
+    def delete(self, identifier: str) -> bool:
+        """
+        Mark an environment deleted - its history is kept.
+        """
+        at = time.time()
+        with self.connection:
+            deleted = self.connection.execute(
+                "UPDATE environments SET deleted_at = ? WHERE identifier = ? AND deleted_at IS NULL",
+                (at, identifier),
+            ).rowcount
+            self.connection.execute(
+                "DELETE FROM environment_components WHERE identifier = ?",
+                (identifier,),
+            )
+            if deleted:
+                self._add_history(identifier, EVENT_DELETED, None, at)
+        return bool(deleted)
+
+    def _get_components(self, identifiers: list[str]) -> dict[str, list[Component]]:
+        components = {identifier: [] for identifier in identifiers}
+        placeholders = ", ".join("?" * len(identifiers))
+        rows = self.connection.execute(
+            f"SELECT identifier, component, kind, version FROM environment_components "
+            f"WHERE identifier IN ({placeholders}) ORDER BY kind, component",
+            identifiers,
+        )
+        for row in rows:
+            components[row["identifier"]].append(
+                Component(
+                    name=row["component"], kind=row["kind"], version=row["version"]
+                )
+            )
+        return components
+
+    def _to_records(self, rows: list[sqlite3.Row]) -> list[EnvironmentRecord]:
+        components = self._get_components([row["identifier"] for row in rows])
+        return [
+            EnvironmentRecord(
+                identifier=row["identifier"],
+                cluster=row["cluster"],
+                setup=json.loads(row["setup"]),
+                created_at=row["created_at"],
+                updated_at=row["updated_at"],
+                last_used_at=row["last_used_at"],
+                components=tuple(components[row["identifier"]]),
+            )
+            for row in rows
+        ]
+
+    def get(self, identifier: str) -> EnvironmentRecord | None:
+        rows = self.connection.execute(
+            "SELECT * FROM environments WHERE identifier = ? AND deleted_at IS NULL",
+            (identifier,),
+        ).fetchall()
+        records = self._to_records(rows)
+        return records[0] if records else None
+
+    def find(
+        self, component: str | None = None, limit: int | None = None
+    ) -> list[EnvironmentRecord]:
+        """
+        Environments, most recently used first - optionally only those with the
+        given component selected.
+        """
+        query = "SELECT * FROM environments WHERE deleted_at IS NULL"
+        params = []
+        if component is not None:
+            query += (
+                " AND identifier IN (SELECT identifier FROM environment_components"
+                " WHERE component = ?)"
+            )
+            params.append(component)
+        query += " ORDER BY last_used_at DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        return self._to_records(self.connection.execute(query, params).fetchall())
+
+    def history(self, identifier: str) -> list[HistoryEntry]:
+        rows = self.connection.execute(
+            "SELECT event, at, setup FROM environment_history WHERE identifier = ? ORDER BY at, id",
+            (identifier,),
+        )
+        return [
+            HistoryEntry(
+                event=row["event"],
+                at=row["at"],
+                setup=json.loads(row["setup"]) if row["setup"] else None,
+            )
+            for row in rows
+        ]
+
+    def import_yaml_setups(self, environments_dir: Path) -> list[str]:
+        """
+        Import the per-identifier YAML setups written by earlier CLI versions and
+        move them aside, so they are imported only once.
+        """
+        imported = []
+        for env_file_path in sorted(environments_dir.glob("*.yaml")):
+            identifier = env_file_path.stem
+            with open(env_file_path, "r") as env_file:
+                setup = yaml.load(env_file.read(), yaml.Loader)
+            if not isinstance(setup, dict):
+                continue
+            if self.get(identifier) is None:
+                self.save(
+                    identifier,
+                    setup,
+                    event=EVENT_IMPORTED,
+                    at=env_file_path.stat().st_mtime,
+                )
+                imported.append(identifier)
+            imported_dir = environments_dir.joinpath(IMPORTED_YAML_DIR)
+            imported_dir.mkdir(exist_ok=True)
+            env_file_path.replace(imported_dir.joinpath(env_file_path.name))
+        return imported
+
+
+@functools.cache
+def get_env_registry() -> EnvironmentRegistry:
+    registry = EnvironmentRegistry(get_environments_db_path())
+    registry.import_yaml_setups(get_environments_dir_path())
+    return registry
@@ -1,43 +1,84 @@
-import base64
-import json
 import os
 import re
 import shutil
-import subprocess
+import sqlite3
+import sys
+import tempfile
+from datetime import datetime
 from pathlib import Path
 
 import inquirer
 import yaml
 from inquirer import Checkbox
 from rich import print
+from rich.table import Table
 
 from pulse8_core_cli.shared.module import execute_shell_command
 from pulse8_core_cli.environment.constants import (
     KEY_CHOICES_INFRA,
     KEY_CHOICES_INFRA_POSTGRESQL,
-    KEY_CHOICES_INFRA_REDIS,
     KEY_CHOICES_INFRA_KAFKA,
-    KEY_CHOICES_INFRA_EXASOL,
-    KEY_CHOICES_INFRA_TEEDY,
     KEY_CHOICES_SERVICES,
-    KEY_CHOICES_SERVICES_NOTIFICATION_ENGINE,
     KEY_CHOICES_SERVICES_IAM,
-    KEY_CHOICES_SERVICES_WORKFLOW_ENGINE,
-    KEY_CHOICES_SERVICES_QUERY_ENGINE,
     SERVICES,
-    SERVICES_DEPENDENCIES_INFRA,
-    SERVICES_DEPENDENCIES_SERVICES,
-    KEY_CHOICES_INFRA_KEYCLOAK,
-    INFRA_DEPENDENCIES_INFRA,
-    KEY_CHOICES_SERVICES_DOCUMENT_MANAGEMENT,
-    KEY_CHOICES_INFRA_SPARK,
-    KEY_CHOICES_INFRA_NIFI,
-    KEY_CHOICES_INFRA_AIRFLOW,
-    KEY_CHOICES_INFRA_SUPERSET,
-    KEY_CHOICES_INFRA_MARIADB,
-    KEY_CHOICES_INFRA_CLOUDSERVER,
-    KEY_CHOICES_INFRA_PINOT,
-    KEY_CHOICES_SERVICES_ACCESS_CONTROL,
+    KEY_PROFILE,
+    DEFAULT_PROFILE,
+)
+from pulse8_core_cli.environment.components import get_component_registry
+from pulse8_core_cli.environment.coredns import configure_coredns
+from pulse8_core_cli.environment.manifests import (
+    apply_manifests,
+    delete_manifests,
+    render_platform_manifests,
+    render_pull_secrets,
+)
+from pulse8_core_cli.environment.pool import (
+    forget_pool_cluster,
+    get_pool_kubeconfig_path,
+    is_pool_cluster_ready,
+    list_k3d_clusters,
+    list_pool_clusters,
+    mark_pool_cluster_ready,
+    new_pool_cluster_name,
+    take_ready_pool_cluster,
+)
+from pulse8_core_cli.environment.env_registry import (
+    EVENT_RESTORED,
+    get_env_registry,
+    get_setup_components,
+)
+from pulse8_core_cli.environment.images import preload_images, record_images
+from pulse8_core_cli.environment.plan import (
+    ACTION_ADD,
+    ACTION_RECONFIGURE,
+    PLATFORM,
+    Plan,
+    create_plan,
+    is_platform_installed,
+    print_plan,
+)
+from pulse8_core_cli.environment.profiles import get_setup_profile, validate_profile
+from pulse8_core_cli.environment.readiness import (
+    get_component_timeouts,
+    print_readiness_report,
+    wait_for_components,
+)
+from pulse8_core_cli.environment.registry_cache import get_registry_cache_cluster_args
+from pulse8_core_cli.environment.residency import make_resident, start_resident
+from pulse8_core_cli.environment.status import (
+    fetch_status,
+    render_status_table,
+    watch_status,
+)
+from pulse8_core_cli.environment.snapshot import (
+    get_snapshot_dir_path,
+    list_cluster_nodes,
+    read_snapshot_metadata,
+    read_snapshot_setup,
+    restore_node_data,
+    save_node_data,
+    write_snapshot_metadata,
+    write_snapshot_setup,
 )
 from pulse8_core_cli.shared.constants import (
     ENV_GITHUB_TOKEN,
@@ -46,12 +87,22 @@ from pulse8_core_cli.shared.constants import (
     ENV_JFROG_USER,
     ENV_GITHUB_GHCR_TOKEN,
 )
+from pulse8_core_cli.shared.kube_client import (
+    KubernetesApiError,
+    get_current_context,
+    get_kube_client,
+    load_kubeconfig,
+)
 from pulse8_core_cli.shared.module import (
     get_certificates_dir_path,
     get_env_variables,
-    get_environments_dir_path,
+    get_github_credentials,
+    get_environments_db_path,
+    get_pool_dir_path,
 )
 from pulse8_core_cli.shared.platform_discovery import is_cpu_arm
+from pulse8_core_cli.shared.profiling import profiled
+from pulse8_core_cli.shared.runner import run_command, start_detached
 
 
 def env_precheck():
@@ -74,1561 +125,681 @@ def env_precheck():
     print("environment precheck done - continue...")
 
 
+@profiled()
 def env_create(
-    identifier: str, from_env: str | None = None, from_file: str | None = None
+    identifier: str,
+    from_env: str | None = None,
+    from_file: str | None = None,
+    wait: bool = False,
+    timeout: str | None = None,
+    component_timeouts: list[str] | None = None,
+    use_pool: bool = True,
+    registry_cache: bool = True,
+    profile: str = DEFAULT_PROFILE,
+    preload: bool = True,
+    concurrency: int | None = None,
 ):
+    validate_profile(profile)
     env_vars = get_env_variables(silent=True)
-    stop_all_env()
-    print(f"preparing environment (id: {identifier})...")
+    cluster = env_claim_pool_cluster(identifier) if use_pool else None
+    if cluster is None:
+        cluster = identifier
+        make_resident(cluster)
+        print(f"preparing environment (id: {identifier})...")
+        env_create_cluster(
+            identifier,
+            ("-p80:80@loadbalancer", "-p443:443@loadbalancer")
+            + (get_registry_cache_cluster_args(env_vars) if registry_cache else ()),
+        )
+        env_bootstrap_cluster(identifier, env_vars)
+
+    if from_env is not None:
+        choices, services = get_choices_from_env(from_env)
+        env_check_and_update_deps(choices)
+    elif from_file is not None:
+        choices, services = get_choices_from_file(from_file)
+        env_check_and_update_deps(choices)
+    else:
+        choices = inquirer.prompt(get_questions())
+        services = SERVICES
+    env_check_and_update_deps(choices)
+    component_keys = choices[KEY_CHOICES_INFRA] + choices[KEY_CHOICES_SERVICES]
+    if preload and concurrency is not None:
+        # the limited install waits for the components - preload up front
+        preload_images(cluster, component_keys)
+    env_install_choices(
+        choices=choices,
+        services=services,
+        profile=profile,
+        timeout=timeout,
+        component_timeouts=component_timeouts,
+        concurrency=concurrency,
+    )
+    if preload and concurrency is None:
+        # flux reconciles meanwhile, pods find the images on their nodes
+        preload_images(cluster, component_keys)
+    store_env_setup(
+        identifier=identifier,
+        choices=choices,
+        services=services,
+        cluster=cluster,
+        profile=profile,
+    )
+    if wait and concurrency is None:
+        env_wait_for_choices(choices, services, timeout, component_timeouts)
+
+
+@profiled()
+def env_create_cluster(identifier: str, extra_args: tuple = ()) -> None:
     print(f"[bold]starting environment (id: {identifier})...[/bold]")
     args = (
         "k3d",
         "cluster",
         "create",
-        "-p80:80@loadbalancer",
-        "-p443:443@loadbalancer",
         "--k3s-arg",
         "--disable=traefik@server:0",
+        *extra_args,
         identifier,
     )
-    pipe = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    res: tuple[bytes, bytes] = pipe.communicate()
-    if pipe.returncode == 1:
+    result = run_command(args, stream=True)
+    if not result.ok:
         print(f"[bold red]failed starting environment (id: {identifier})[/bold red]")
-        print(res[1].decode("utf8"))
         exit(1)
     print(f"[green]started environment (id: {identifier})[/green]")
-    print(res[0].decode("utf8"))
+
+
+@profiled()
+def env_bootstrap_cluster(identifier: str, env_vars: dict) -> None:
     print(
         f"[bold]starting post creation steps for environment (id: {identifier})...[/bold]"
     )
-    execute_shell_command(
-        command_array=[
-            "kubectl",
-            "-n",
-            "kube-system",
-            "rollout",
-            "status",
-            "deployment",
-            "coredns",
-        ],
-        message_failure=f"[bold red]failed to wait for coredns init[/bold red]",
-        message_success=f"[green]coredns init[/green]",
-    )
-    configmap_coredns_source = execute_shell_command(
-        command_array=[
-            "kubectl",
-            "-n",
-            "kube-system",
-            "get",
-            "configmap",
-            "coredns",
-            "-o",
-            "yaml",
-        ],
-        message_failure=f"[bold red]failed read coredns configuration[/bold red]",
-        message_success=f"[green]read coredns configuration[/green]",
-    )
-    configmap_coredns_source_path = "configmap_coredns_source.yaml"
-    with open(configmap_coredns_source_path, "w") as configmap_coredns_source_file:
-        configmap_coredns_source = configmap_coredns_source.replace(
-            "ready\n        kubernetes",
-            "ready\n"
-            "        rewrite stop {\n"
-            "          name regex (.*\.)?local\.synpulse8\.com host.k3d.internal\n"
-            "        }\n"
-            "        kubernetes",
-            1,
-        )
-        configmap_coredns_source_file.write(configmap_coredns_source)
-    execute_shell_command(
-        command_array=[
-            "kubectl",
-            "-n",
-            "kube-system",
-            "apply",
-            "-f",
-            configmap_coredns_source_path,
-        ],
-        message_failure=f"[bold red]failed to apply new coredns configuration[/bold red]",
-        message_success=f"[green]applied new coredns configuration[/green]",
-    )
-    execute_shell_command(
-        command_array=[
-            "kubectl",
-            "-n",
-            "kube-system",
-            "rollout",
-            "restart",
-            "deployment",
-            "coredns",
-        ],
-        message_failure=f"[bold red]failed to restart coredns deployment[/bold red]",
-        message_success=f"[green]restarted coredns deployment[/green]",
-    )
-    os.remove(configmap_coredns_source_path)
+    print("configuring coredns...")
+    configure_coredns()
     print(f"installing flux into environment (id: {identifier})...")
-    args = ("flux", "install")
-    pipe = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    res: tuple[bytes, bytes] = pipe.communicate()
-    if pipe.returncode == 1:
+    result = run_command(("flux", "install"), stream=True)
+    if not result.ok:
         print(
             f"[bold red]failed installing flux into environment (id: {identifier})[/bold red]"
         )
-        print(res[1].decode("utf8"))
         exit(1)
     print(f"[green]installed flux into environment (id: {identifier})[/green]")
-    print(res[0].decode("utf8"))
     print(f"installing pull secrets into environment (id: {identifier})...")
-    # github container registry (ghcr)
-    ghcr_dockerconfigjson = dict()
-    ghcr_dockerconfigjson["auths"] = dict()
-    ghcr_dockerconfigjson["auths"]["ghcr.io"] = dict()
-    ghcr_credentials_encoded = base64.b64encode(
-        bytes(env_vars[ENV_GITHUB_GHCR_TOKEN], "ascii")
-    )
-    ghcr_dockerconfigjson["auths"]["ghcr.io"]["auth"] = ghcr_credentials_encoded.decode(
-        "utf8"
+    apply_manifests(
+        render_pull_secrets(env_vars[ENV_GITHUB_GHCR_TOKEN], env_vars[ENV_JFROG_TOKEN]),
+        message_success=f"installed pull secrets (ghcr.io, synpulse.jfrog.io) into environment (id: {identifier})",
     )
-    ghcr_dockerconfigjson_json = json.dumps(ghcr_dockerconfigjson)
-    ghcr_dockerconfigjson_path = "ghcr_dockerconfig.json"
-    with open(ghcr_dockerconfigjson_path, "w") as ghcr_dockerconfigjson_file:
-        ghcr_dockerconfigjson_file.write(ghcr_dockerconfigjson_json)
-    args = (
-        "kubectl",
-        "create",
-        "secret",
-        "generic",
-        "synpulse-ghcr-docker-credential",
-        f"--from-file=.dockerconfigjson={ghcr_dockerconfigjson_path}",
-        "--type=kubernetes.io/dockerconfigjson",
-    )
-    pipe = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    res: tuple[bytes, bytes] = pipe.communicate()
-    if pipe.returncode == 1:
-        print(
-            f"[bold red]failed installing pull secrets (ghcr.io) into environment (id: {identifier})"
-            f"[/bold red]"
-        )
-        print(res[1].decode("utf8"))
-        exit(1)
-    print(res[0].decode("utf8"))
-    # jfrog container registry
-    jfrog_dockerconfigjson = dict()
-    jfrog_dockerconfigjson["auths"] = dict()
-    jfrog_dockerconfigjson["auths"]["synpulse.jfrog.io"] = dict()
-    jfrog_dockerconfigjson["auths"]["synpulse.jfrog.io"]["auth"] = env_vars[
-        ENV_JFROG_TOKEN
-    ]
-    jfrog_dockerconfigjson_json = json.dumps(jfrog_dockerconfigjson)
-    jfrog_dockerconfigjson_path = "jfrog_dockerconfig.json"
-    with open(jfrog_dockerconfigjson_path, "w") as jfrog_dockerconfigjson_file:
-        jfrog_dockerconfigjson_file.write(jfrog_dockerconfigjson_json)
-    args = (
-        "kubectl",
-        "create",
-        "secret",
-        "generic",
-        "synpulse-jfrog-docker-credential",
-        f"--from-file=.dockerconfigjson={jfrog_dockerconfigjson_path}",
-        "--type=kubernetes.io/dockerconfigjson",
-    )
-    pipe = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    res: tuple[bytes, bytes] = pipe.communicate()
-    if pipe.returncode == 1:
-        print(
-            f"[bold red]failed installing pull secrets (synpulse.jfrog.io) into environment (id: {identifier})[/bold red]"
-        )
-        print(res[1].decode("utf8"))
-        exit(1)
-    print(res[0].decode("utf8"))
-    execute_shell_command(
-        command_array=[
-            "kubectl",
-            "-n",
-            "flux-system",
-            "create",
-            "secret",
-            "generic",
-            "synpulse-jfrog-docker-credential",
-            f"--from-file=.dockerconfigjson={jfrog_dockerconfigjson_path}",
-            "--type=kubernetes.io/dockerconfigjson",
-        ],
-        message_failure=f"[bold red]failed installing pull secrets (synpulse.jfrog.io/flux-system) into environment (id: {identifier})[/bold red]",
-        message_success=f"[green]installed pull secrets (synpulse.jfrog.io/flux-system) into environment (id: {identifier})[/green]",
-    )
-    print(
-        f"[green]installed pull secrets (ghcr.io, synpulse.jfrog.io) into environment (id: {identifier})[/green]"
-    )
-    os.remove(ghcr_dockerconfigjson_path)
-    os.remove(jfrog_dockerconfigjson_path)
-
-    # Pulse8 helm charts repo
-    execute_shell_command(
-        command_array=[
-            "flux",
-            "create",
-            "source",
-            "helm",
-            "pulse8-helm-charts-oci",
-            "--url=oci://synpulse.jfrog.io/pulse8-helm-charts",
-            "--secret-ref=synpulse-jfrog-docker-credential",
-            "--interval=15m",
-        ],
-        message_failure=f"failed installing pulse8-helm-charts-oci repository (synpulse.jfrog.io/pulse8-helm-charts) into environment (id: {identifier})",
-        message_success=f"installed pulse8-helm-charts-oci repository (synpulse.jfrog.io/pulse8-helm-charts) into environment (id: {identifier})",
-    )
-
-    if from_env is not None:
-        choices, services = get_choices_from_env(from_env)
-        env_check_and_update_deps(choices)
-    elif from_file is not None:
-        choices, services = get_choices_from_file(from_file)
-        env_check_and_update_deps(choices)
-    else:
-        choices = inquirer.prompt(get_questions())
-        services = SERVICES
-    env_check_and_update_deps(choices)
-    env_install_choices(choices=choices, services=services)
-    store_env_setup(identifier=identifier, choices=choices, services=services)
 
 
-def env_update():
+@profiled()
+def env_update(
+    wait: bool = False,
+    timeout: str | None = None,
+    component_timeouts: list[str] | None = None,
+    plan_only: bool = False,
+    profile: str | None = None,
+    concurrency: int | None = None,
+):
     print(f"[bold]collecting information about current context...[/bold]")
-    args = ("kubectl", "config", "current-context")
-    pipe = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    res: tuple[bytes, bytes] = pipe.communicate()
-    if pipe.returncode == 1:
+    identifier = get_current_context()
+    if identifier is None:
         print(f"[bold red]failed collecting information - sandbox name[/bold red]")
-        print(res[1].decode("utf8"))
         exit(1)
-    identifier = res[0].decode("utf8")
     identifier = re.sub(r"^k3d-", "", identifier)
     identifier = re.sub(r"\s", "", identifier)
-    (choices_fs, choices_configmap) = read_env_setup(identifier)
+    choices_fs, choices_configmap = read_env_setup(identifier)
+    profile = validate_profile(profile or get_setup_profile(choices_fs))
     print(f"[green]collected information about current context[/green]")
     print(f"[bold]updating environment (id: {identifier})...[/bold]")
-    (preselection_infra, preselection_services) = get_preselection_from_setup(
+    preselection_infra, preselection_services = get_preselection_from_setup(
         choices_configmap
     )
     choices = inquirer.prompt(get_questions(preselection_infra, preselection_services))
     env_check_and_update_deps(choices)
-    env_install_choices(
-        choices=choices, choices_old=choices_fs, services=choices_configmap["services"]
+    plan = env_install_choices(
+        choices=choices,
+        choices_old=choices_fs,
+        services=choices_configmap["services"],
+        profile=profile,
+        plan_only=plan_only,
+        timeout=timeout,
+        component_timeouts=component_timeouts,
+        concurrency=concurrency,
     )
-    store_env_setup(identifier, choices)
+    if plan_only:
+        return
+    store_env_setup(identifier, choices, profile=profile)
+    if wait and concurrency is None:
+        # unchanged components are ready already
+        changed = plan.get_components(ACTION_ADD, ACTION_RECONFIGURE)
+        env_wait_for_choices(
+            {
+                KEY_CHOICES_INFRA: [
+                    key for key in choices[KEY_CHOICES_INFRA] if key in changed
+                ],
+                KEY_CHOICES_SERVICES: [
+                    key for key in choices[KEY_CHOICES_SERVICES] if key in changed
+                ],
+            },
+            choices_configmap["services"],
+            timeout,
+            component_timeouts,
+        )
 
 
-def env_install_ingress_nginx() -> None:
-    do_default_tls_install: bool
-    args = ("kubectl", "get", "secret", "pulse8-localhost", "--namespace=kube-system")
-    pipe = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    res: tuple[bytes, bytes] = pipe.communicate()
-    if pipe.returncode == 1:
-        do_default_tls_install = True
-    else:
-        do_default_tls_install = False
-    if not do_default_tls_install:
-        return
-    print("Installing ingress-nginx using Flux...")
-    key_path = get_certificates_dir_path().joinpath("key.pem")
-    cert_path = get_certificates_dir_path().joinpath("cert.pem")
-    print("Installing default tls certificate...")
-    args = (
-        "kubectl",
-        "create",
-        "secret",
-        "tls",
-        "pulse8-localhost",
-        f"--key={str(key_path)}",
-        f"--cert={str(cert_path)}",
-        "--namespace=kube-system",
+@profiled()
+def env_install_choices(
+    choices: dict,
+    choices_old: dict | None = None,
+    services=SERVICES,
+    profile: str = DEFAULT_PROFILE,
+    plan_only: bool = False,
+    timeout: str | None = None,
+    component_timeouts: list[str] | None = None,
+    concurrency: int | None = None,
+) -> Plan:
+    """
+    Install the chosen components with the resources of the profile. With the
+    previous setup (choices_old) only the components that changed are applied
+    or deleted. With a concurrency limit the components are applied in
+    dependency order and awaited, at most `concurrency` of them at once.
+    """
+    github_credentials = get_github_credentials()
+    platform_manifests = render_platform_manifests(
+        github_credentials.user,
+        github_credentials.token,
+        get_certificates_dir_path(),
     )
-    pipe = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    res: tuple[bytes, bytes] = pipe.communicate()
-    if pipe.returncode == 1:
-        print(f"[bold red]Failed to install default tls certificate[/bold red]")
-        print(res[1].decode("utf8"))
-        exit(1)
-    print(res[0].decode("utf8"))
-    print(f"[green]Installed default tls certificate[/green]")
-    print("Installing default tls certificate into default namespace...")
-    args = (
-        "kubectl",
-        "create",
-        "secret",
-        "tls",
-        "pulse8-localhost",
-        f"--key={str(key_path)}",
-        f"--cert={str(cert_path)}",
-        "--namespace=default",
+    plan = create_plan(
+        choices_old,
+        choices,
+        services,
+        profile,
+        platform_manifests,
+        platform_installed=choices_old is not None
+        and is_platform_installed(platform_manifests),
     )
-    pipe = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    res: tuple[bytes, bytes] = pipe.communicate()
-    if pipe.returncode == 1:
-        print(
-            f"[bold red]Failed to install default tls certificate into default namespace[/bold red]"
+    if choices_old is not None or plan_only:
+        print_plan(plan)
+    if plan_only:
+        return plan
+    if not plan.changed:
+        print("[green]environment is up to date[/green]")
+        return plan
+    if concurrency is not None:
+        env_install_limited(
+            plan, choices, services, timeout, component_timeouts, concurrency
+        )
+        return plan
+    if plan.manifests_to_apply:
+        print("Installing components using Flux...")
+        apply_manifests(
+            plan.manifests_to_apply, message_success="Installed components using Flux"
         )
-        print(res[1].decode("utf8"))
+    if plan.manifests_to_delete:
+        print("Uninstalling deselected components using Flux...")
+        delete_manifests(
+            plan.manifests_to_delete,
+            message_success="Uninstalled deselected components using Flux",
+        )
+    return plan
+
+
+@profiled()
+def env_install_limited(
+    plan: Plan,
+    choices: dict,
+    services: dict,
+    timeout: str | None,
+    component_timeouts: list[str] | None,
+    concurrency: int,
+) -> None:
+    """
+    Apply the changed components in dependency order with at most `concurrency`
+    Kustomizations applied but not ready yet, shown in a single progress view.
+    """
+    if concurrency < 1:
+        print("[bold red]concurrency must be at least 1[/bold red]")
         exit(1)
-    print(res[0].decode("utf8"))
-    print(f"[green]Installed default tls certificate into default namespace[/green]")
-    args = (
-        "flux",
-        "create",
-        "source",
-        "git",
-        "pulse8-core-env-ingress-nginx-repo",
-        "--url=https://github.com/synpulse-group/pulse8-core-env-ingress-nginx.git",
-        "--branch=main",
-        "--secret-ref=github-token",
+    manifests = plan.manifests_to_apply_by_component
+    platform_manifests = manifests.pop(PLATFORM, [])
+    if platform_manifests:
+        apply_manifests(platform_manifests, message_success="Installed platform")
+    if plan.manifests_to_delete:
+        print("Uninstalling deselected components using Flux...")
+        delete_manifests(
+            plan.manifests_to_delete,
+            message_success="Uninstalled deselected components using Flux",
+        )
+    env_wait_for_choices(
+        {
+            key: [
+                component_key
+                for component_key in choices[key]
+                if component_key in manifests
+            ]
+            for key in (KEY_CHOICES_INFRA, KEY_CHOICES_SERVICES)
+        },
+        services,
+        timeout,
+        component_timeouts,
+        manifests=manifests,
+        concurrency=concurrency,
+    )
+
+
+@profiled()
+def env_wait_for_choices(
+    choices: dict,
+    services=SERVICES,
+    timeout: str | None = None,
+    component_timeouts: list[str] | None = None,
+    manifests: dict[str, list[dict]] | None = None,
+    concurrency: int | None = None,
+) -> None:
+    component_keys = choices.get(KEY_CHOICES_INFRA, []) + choices.get(
+        KEY_CHOICES_SERVICES, []
+    )
+    if manifests:
+        print("[bold]installing environment components...[/bold]")
+    else:
+        print("[bold]waiting for environment components to become ready...[/bold]")
+    durations = wait_for_components(
+        component_keys,
+        get_component_timeouts(component_keys, timeout, component_timeouts),
+        services,
+        manifests=manifests,
+        dependencies=get_component_registry().get_graph(component_keys),
+        concurrency=concurrency,
     )
-    pipe = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    res: tuple[bytes, bytes] = pipe.communicate()
-    if pipe.returncode == 1:
+    print_readiness_report(durations)
+    timed_out = [key for key, duration in durations.items() if duration is None]
+    if timed_out:
         print(
-            f"[bold red]Failed to install ingress-nginx git source using Flux[/bold red]"
+            f"[bold red]components did not become ready in time: {', '.join(timed_out)}[/bold red]"
         )
-        print(res[1].decode("utf8"))
         exit(1)
-    print(res[0].decode("utf8"))
-    print(f"[green]Installed ingress-nginx git source using Flux[/green]")
-    args = (
-        "flux",
-        "create",
-        "kustomization",
-        "pulse8-core-env-ingress-nginx",
-        "--source=GitRepository/pulse8-core-env-ingress-nginx-repo",
-        "--interval=1m",
-        "--prune=true",
-        "--target-namespace=kube-system",
-    )
-    pipe = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    res: tuple[bytes, bytes] = pipe.communicate()
-    if pipe.returncode == 1:
-        print(f"[bold red]Failed to install ingress-nginx using Flux[/bold red]")
-        print(res[1].decode("utf8"))
+    print("[green]all environment components are ready[/green]")
+    try:
+        record_images(fetch_status(None), component_keys)
+    except (KubernetesApiError, OSError) as e:
+        print(f"[yellow]failed to record the images of the components: {e}[/yellow]")
+
+
+def format_timestamp(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M")
+
+
+def env_list(component: str | None = None, limit: int | None = None):
+    records = get_env_registry().find(component=component, limit=limit)
+    if not records:
+        print("no environments found")
+        return
+    # a single k3d call for the state of all clusters
+    clusters = {cluster["name"]: cluster for cluster in list_k3d_clusters()}
+    table = Table(title="Environments")
+    table.add_column("Environment")
+    table.add_column("Cluster")
+    table.add_column("State")
+    table.add_column("Nodes", justify="right")
+    table.add_column("Components")
+    table.add_column("Created")
+    table.add_column("Last used")
+    for record in records:
+        cluster = clusters.get(record.cluster)
+        if cluster is None:
+            state, nodes = "[red]missing[/red]", "-"
+        else:
+            running = cluster.get("serversRunning", 0) + cluster.get("agentsRunning", 0)
+            count = cluster.get("serversCount", 0) + cluster.get("agentsCount", 0)
+            state = (
+                "[green]running[/green]"
+                if cluster.get("serversRunning", 0) > 0
+                else "[dim]stopped[/dim]"
+            )
+            nodes = f"{running}/{count}"
+        table.add_row(
+            record.identifier,
+            record.cluster,
+            state,
+            nodes,
+            ", ".join(
+                f"{c.name}@{c.version}" if c.version else c.name
+                for c in record.components
+            ),
+            format_timestamp(record.created_at),
+            format_timestamp(record.last_used_at),
+        )
+    print(table)
+
+
+def env_history(identifier: str):
+    entries = get_env_registry().history(identifier)
+    if not entries:
+        print(f"[bold red]no history of environment {identifier}[/bold red]")
         exit(1)
-    print(res[0].decode("utf8"))
-    print(f"[green]Installed ingress-nginx using Flux[/green]")
+    table = Table(title=f"History of environment {identifier}")
+    table.add_column("Time")
+    table.add_column("Event")
+    table.add_column("Components")
+    for entry in entries:
+        components = (
+            ", ".join(c.name for c in get_setup_components(entry.setup))
+            if entry.setup is not None
+            else ""
+        )
+        table.add_row(format_timestamp(entry.at), entry.event, components)
+    print(table)
 
 
-def env_install_choices(
-    choices: dict, choices_old: dict | None = None, services=SERVICES
-) -> None:
-    env_vars = get_env_variables(silent=True)
-    github_token = env_vars[ENV_GITHUB_TOKEN]
-    github_user = env_vars[ENV_GITHUB_USER]
-    print("Installing GitHub token using Flux...")
-    args = (
-        "flux",
-        "create",
-        "secret",
-        "git",
-        "github-token",
-        "--url=https://github.com/synpulse-group/pulse8-core-env-postgresql.git",
-        f"--username={github_user}",
-        f"--password={github_token}",
-        "--namespace=flux-system",
+def env_graph(component_keys: list[str] | None = None):
+    """
+    Print the resolved components in install order - all of them or the given
+    ones with their transitive dependencies.
+    """
+    registry = get_component_registry()
+    unknown = [key for key in component_keys or [] if registry.get(key) is None]
+    if unknown:
+        print(f"[bold red]unknown components: {', '.join(unknown)}[/bold red]")
+        exit(1)
+    keys = registry.resolve(component_keys) if component_keys else registry.order
+    table = Table(title="Component graph (install order)")
+    table.add_column("Wave", justify="right")
+    table.add_column("Component", no_wrap=True)
+    table.add_column("Kind")
+    table.add_column("Depends on", overflow="fold")
+    table.add_column("All dependencies", overflow="fold")
+    for key in keys:
+        component = registry.get(key)
+        table.add_row(
+            str(registry.levels[key] + 1),
+            key,
+            component.kind,
+            ", ".join(component.dependencies),
+            ", ".join(registry.sort(registry.closures[key])),
+        )
+    print(table)
+
+
+def env_status(identifier: str | None = None, watch: bool = False):
+    kubeconfig = load_kubeconfig()
+    context_name = (
+        f"k3d-{identifier}" if identifier is not None else kubeconfig["current-context"]
     )
-    pipe = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    res: tuple[bytes, bytes] = pipe.communicate()
-    if pipe.returncode == 1:
-        print(f"[bold red]Failed to install GitHub token using Flux[/bold red]")
-        print(res[1].decode("utf8"))
+    if context_name not in kubeconfig["contexts"]:
+        print(f"[bold red]environment {identifier} does not exist[/bold red]")
         exit(1)
-    print(res[0].decode("utf8"))
-    print(f"[green]Installed GitHub token using Flux[/green]")
-    # install ingress-nginx
-    env_install_ingress_nginx()
-    if KEY_CHOICES_INFRA in choices:
-        infra = choices[KEY_CHOICES_INFRA]
-        if KEY_CHOICES_INFRA_POSTGRESQL in infra:
-            print("Installing PostgreSQL using Flux...")
-            args = (
-                "flux",
-                "create",
-                "source",
-                "git",
-                "pulse8-core-env-postgresql-repo",
-                "--url=https://github.com/synpulse-group/pulse8-core-env-postgresql.git",
-                "--branch=main",
-                "--secret-ref=github-token",
-            )
-            pipe = subprocess.Popen(
-                args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-            )
-            res: tuple[bytes, bytes] = pipe.communicate()
-            if pipe.returncode == 1:
-                print(
-                    f"[bold red]Failed to install PostgreSQL git source using Flux[/bold red]"
-                )
-                print(res[1].decode("utf8"))
-                exit(1)
-            print(f"[green]Installed PostgreSQL git source using Flux[/green]")
-            print(res[0].decode("utf8"))
-            args = (
-                "flux",
-                "create",
-                "kustomization",
-                "pulse8-core-env-postgresql",
-                "--source=GitRepository/pulse8-core-env-postgresql-repo",
-                "--interval=1m",
-                "--prune=true",
-                "--target-namespace=default",
-            )
-            pipe = subprocess.Popen(
-                args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-            )
-            res: tuple[bytes, bytes] = pipe.communicate()
-            if pipe.returncode == 1:
-                print(f"[bold red]Failed to install PostgreSQL using Flux[/bold red]")
-                print(res[1].decode("utf8"))
-                exit(1)
-            print(f"[green]Installed PostgreSQL using Flux[/green]")
-            print(res[0].decode("utf8"))
-        if KEY_CHOICES_INFRA_KAFKA in infra:
-            print("Installing Kafka (Confluent for Kubernetes) using Flux...")
-            args = (
-                "flux",
-                "create",
-                "source",
-                "git",
-                "pulse8-core-env-kafka-repo",
-                "--url=https://github.com/synpulse-group/pulse8-core-env-kafka.git",
-                "--branch=main",
-                "--secret-ref=github-token",
-            )
-            pipe = subprocess.Popen(
-                args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-            )
-            res: tuple[bytes, bytes] = pipe.communicate()
-            if pipe.returncode == 1:
-                print(
-                    f"[bold red]Failed to install Kafka git source using Flux[/bold red]"
-                )
-                print(res[1].decode("utf8"))
-                exit(1)
-            print(f"[green]Installed Kafka git source using Flux[/green]")
-            print(res[0].decode("utf8"))
-            args = (
-                "flux",
-                "create",
-                "kustomization",
-                "pulse8-core-env-kafka",
-                "--source=GitRepository/pulse8-core-env-kafka-repo",
-                "--interval=1m",
-                "--prune=true",
-                "--target-namespace=default",
-            )
-            pipe = subprocess.Popen(
-                args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-            )
-            res: tuple[bytes, bytes] = pipe.communicate()
-            if pipe.returncode == 1:
-                print(
-                    f"[bold red]Failed to install Kafka (Confluent for Kubernetes) using Flux[/bold red]"
-                )
-                print(res[1].decode("utf8"))
-                exit(1)
-            print(
-                f"[green]Installed Kafka (Confluent for Kubernetes) using Flux[/green]"
-            )
-            print(res[0].decode("utf8"))
-        if KEY_CHOICES_INFRA_REDIS in infra:
-            print("Installing Redis using Flux...")
-            args = (
-                "flux",
-                "create",
-                "source",
-                "git",
-                "pulse8-core-env-redis-repo",
-                "--url=https://github.com/synpulse-group/pulse8-core-env-redis.git",
-                "--branch=main",
-                "--secret-ref=github-token",
-            )
-            pipe = subprocess.Popen(
-                args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-            )
-            res: tuple[bytes, bytes] = pipe.communicate()
-            if pipe.returncode == 1:
-                print(
-                    f"[bold red]Failed to install Redis git source using Flux[/bold red]"
-                )
-                print(res[1].decode("utf8"))
-                exit(1)
-            print(f"[green]Installed Redis git source using Flux[/green]")
-            print(res[0].decode("utf8"))
-            args = (
-                "flux",
-                "create",
-                "kustomization",
-                "pulse8-core-env-redis",
-                "--source=GitRepository/pulse8-core-env-redis-repo",
-                "--interval=1m",
-                "--prune=true",
-                "--target-namespace=default",
-            )
-            pipe = subprocess.Popen(
-                args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-            )
-            res: tuple[bytes, bytes] = pipe.communicate()
-            if pipe.returncode == 1:
-                print(f"[bold red]Failed to install Redis using Flux[/bold red]")
-                print(res[1].decode("utf8"))
-                exit(1)
-            print(f"[green]Installed Redis using Flux[/green]")
-            print(res[0].decode("utf8"))
-        if KEY_CHOICES_INFRA_EXASOL in infra:
-            print("Installing Exasol using Flux...")
-            args = (
-                "flux",
-                "create",
-                "source",
-                "git",
-                "pulse8-core-env-exasol-repo",
-                "--url=https://github.com/synpulse-group/pulse8-core-env-exasol.git",
-                "--branch=main",
-                "--secret-ref=github-token",
-            )
-            pipe = subprocess.Popen(
-                args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-            )
-            res: tuple[bytes, bytes] = pipe.communicate()
-            if pipe.returncode == 1:
-                print(
-                    f"[bold red]Failed to install Exasol git source using Flux[/bold red]"
-                )
-                print(res[1].decode("utf8"))
-                exit(1)
-            print(f"[green]Installed Exasol git source using Flux[/green]")
-            print(res[0].decode("utf8"))
-            args = (
-                "flux",
-                "create",
-                "kustomization",
-                "pulse8-core-env-exasol",
-                "--source=GitRepository/pulse8-core-env-exasol-repo",
-                "--interval=1m",
-                "--prune=true",
-                "--target-namespace=default",
-            )
-            pipe = subprocess.Popen(
-                args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-            )
-            res: tuple[bytes, bytes] = pipe.communicate()
-            if pipe.returncode == 1:
-                print(f"[bold red]Failed to install Exasol using Flux[/bold red]")
-                print(res[1].decode("utf8"))
-                exit(1)
-            print(f"[green]Installed Exasol using Flux[/green]")
-            print(res[0].decode("utf8"))
-        if KEY_CHOICES_INFRA_MARIADB in infra:
-            print("Installing MariaDB using Flux...")
-            args = (
-                "flux",
-                "create",
-                "source",
-                "git",
-                "pulse8-core-env-mariadb-repo",
-                "--url=https://github.com/synpulse-group/pulse8-core-env-mariadb.git",
-                "--branch=main",
-                "--secret-ref=github-token",
-            )
-            pipe = subprocess.Popen(
-                args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-            )
-            res: tuple[bytes, bytes] = pipe.communicate()
-            if pipe.returncode == 1:
-                print(
-                    f"[bold red]Failed to install MariaDB git source using Flux[/bold red]"
-                )
-                print(res[1].decode("utf8"))
-                exit(1)
-            print(f"[green]Installed MariaDB git source using Flux[/green]")
-            print(res[0].decode("utf8"))
-            args = (
-                "flux",
-                "create",
-                "kustomization",
-                "pulse8-core-env-mariadb",
-                "--source=GitRepository/pulse8-core-env-mariadb-repo",
-                "--interval=1m",
-                "--prune=true",
-                "--target-namespace=default",
-            )
-            pipe = subprocess.Popen(
-                args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-            )
-            res: tuple[bytes, bytes] = pipe.communicate()
-            if pipe.returncode == 1:
-                print(f"[bold red]Failed to install MariaDB using Flux[/bold red]")
-                print(res[1].decode("utf8"))
-                exit(1)
-            print(f"[green]Installed MariaDB using Flux[/green]")
-            print(res[0].decode("utf8"))
-        if KEY_CHOICES_INFRA_PINOT in infra:
-            print("Installing Pinot using Flux...")
-            args = (
-                "flux",
-                "create",
-                "source",
-                "git",
-                "pulse8-core-env-pinot-repo",
-                "--url=https://github.com/synpulse-group/pulse8-core-env-pinot.git",
-                "--branch=main",
-                "--secret-ref=github-token",
-            )
-            pipe = subprocess.Popen(
-                args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-            )
-            res: tuple[bytes, bytes] = pipe.communicate()
-            if pipe.returncode == 1:
-                print(
-                    f"[bold red]Failed to install Pinot git source using Flux[/bold red]"
-                )
-                print(res[1].decode("utf8"))
-                exit(1)
-            print(f"[green]Installed Pinot git source using Flux[/green]")
-            print(res[0].decode("utf8"))
-            args = (
-                "flux",
-                "create",
-                "kustomization",
-                "pulse8-core-env-pinot",
-                "--source=GitRepository/pulse8-core-env-pinot-repo",
-                "--interval=1m",
-                "--prune=true",
-                "--target-namespace=default",
-            )
-            pipe = subprocess.Popen(
-                args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-            )
-            res: tuple[bytes, bytes] = pipe.communicate()
-            if pipe.returncode == 1:
-                print(f"[bold red]Failed to install Pinot using Flux[/bold red]")
-                print(res[1].decode("utf8"))
-                exit(1)
-            print(f"[green]Installed Pinot using Flux[/green]")
-            print(res[0].decode("utf8"))
-        if KEY_CHOICES_INFRA_TEEDY in infra:
-            print("Installing Teedy using Flux...")
-            args = (
-                "flux",
-                "create",
-                "source",
-                "git",
-                "pulse8-core-env-teedy-repo",
-                "--url=https://github.com/synpulse-group/pulse8-core-env-teedy.git",
-                "--branch=main",
-                "--secret-ref=github-token",
-            )
-            pipe = subprocess.Popen(
-                args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-            )
-            res: tuple[bytes, bytes] = pipe.communicate()
-            if pipe.returncode == 1:
-                print(
-                    f"[bold red]Failed to install Teedy git source using Flux[/bold red]"
-                )
-                print(res[1].decode("utf8"))
-                exit(1)
-            print(f"[green]Installed Teedy git source using Flux[/green]")
-            print(res[0].decode("utf8"))
-            args = (
-                "flux",
-                "create",
-                "kustomization",
-                "pulse8-core-env-teedy",
-                "--source=GitRepository/pulse8-core-env-teedy-repo",
-                "--interval=1m",
-                "--prune=true",
-                "--target-namespace=default",
-            )
-            pipe = subprocess.Popen(
-                args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-            )
-            res: tuple[bytes, bytes] = pipe.communicate()
-            if pipe.returncode == 1:
-                print(f"[bold red]Failed to install Teedy using Flux[/bold red]")
-                print(res[1].decode("utf8"))
-                exit(1)
-            print(f"[green]Installed Teedy using Flux[/green]")
-            print(res[0].decode("utf8"))
-        if KEY_CHOICES_INFRA_KEYCLOAK in infra:
-            print("Installing Keycloak using Flux...")
-            args = (
-                "flux",
-                "create",
-                "source",
-                "git",
-                "pulse8-core-env-keycloak-repo",
-                "--url=https://github.com/synpulse-group/pulse8-core-env-keycloak.git",
-                "--branch=main",
-                "--secret-ref=github-token",
-            )
-            pipe = subprocess.Popen(
-                args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-            )
-            res: tuple[bytes, bytes] = pipe.communicate()
-            if pipe.returncode == 1:
-                print(
-                    f"[bold red]Failed to install Keycloak git source using Flux[/bold red]"
-                )
-                print(res[1].decode("utf8"))
-                exit(1)
-            print(f"[green]Installed Keycloak git source using Flux[/green]")
-            print(res[0].decode("utf8"))
-            args = (
-                "flux",
-                "create",
-                "kustomization",
-                "pulse8-core-env-keycloak",
-                "--source=GitRepository/pulse8-core-env-keycloak-repo",
-                "--interval=1m",
-                "--prune=true",
-                "--target-namespace=default",
-            )
-            pipe = subprocess.Popen(
-                args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-            )
-            res: tuple[bytes, bytes] = pipe.communicate()
-            if pipe.returncode == 1:
-                print(f"[bold red]Failed to install Keycloak using Flux[/bold red]")
-                print(res[1].decode("utf8"))
-                exit(1)
-            print(f"[green]Installed Keycloak using Flux[/green]")
-            print(res[0].decode("utf8"))
-        if KEY_CHOICES_INFRA_SPARK in infra:
-            print("Installing Apache Spark using Flux...")
-            args = (
-                "flux",
-                "create",
-                "source",
-                "git",
-                "pulse8-core-env-spark-repo",
-                "--url=https://github.com/synpulse-group/pulse8-core-env-spark.git",
-                "--branch=main",
-                "--secret-ref=github-token",
-            )
-            pipe = subprocess.Popen(
-                args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-            )
-            res: tuple[bytes, bytes] = pipe.communicate()
-            if pipe.returncode == 1:
-                print(
-                    f"[bold red]Failed to install Apache Spark git source using Flux[/bold red]"
-                )
-                print(res[1].decode("utf8"))
-                exit(1)
-            print(f"[green]Installed Apache Spark git source using Flux[/green]")
-            print(res[0].decode("utf8"))
-            args = (
-                "flux",
-                "create",
-                "kustomization",
-                "pulse8-core-env-spark",
-                "--source=GitRepository/pulse8-core-env-spark-repo",
-                "--interval=1m",
-                "--prune=true",
-                "--target-namespace=default",
-            )
-            pipe = subprocess.Popen(
-                args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-            )
-            res: tuple[bytes, bytes] = pipe.communicate()
-            if pipe.returncode == 1:
-                print(f"[bold red]Failed to install Apache Spark using Flux[/bold red]")
-                print(res[1].decode("utf8"))
-                exit(1)
-            print(f"[green]Installed Apache Spark using Flux[/green]")
-            print(res[0].decode("utf8"))
-        if KEY_CHOICES_INFRA_NIFI in infra:
-            print("Installing Apache NiFi using Flux...")
-            args = (
-                "flux",
-                "create",
-                "source",
-                "git",
-                "pulse8-core-env-nifi-repo",
-                "--url=https://github.com/synpulse-group/pulse8-core-env-nifi.git",
-                "--branch=main",
-                "--secret-ref=github-token",
-            )
-            pipe = subprocess.Popen(
-                args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-            )
-            res: tuple[bytes, bytes] = pipe.communicate()
-            if pipe.returncode == 1:
-                print(
-                    f"[bold red]Failed to install Apache NiFi git source using Flux[/bold red]"
-                )
-                print(res[1].decode("utf8"))
-                exit(1)
-            print(f"[green]Installed Apache NiFi git source using Flux[/green]")
-            print(res[0].decode("utf8"))
-            args = (
-                "flux",
-                "create",
-                "kustomization",
-                "pulse8-core-env-nifi",
-                "--source=GitRepository/pulse8-core-env-nifi-repo",
-                "--interval=1m",
-                "--prune=true",
-                "--target-namespace=default",
-            )
-            pipe = subprocess.Popen(
-                args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-            )
-            res: tuple[bytes, bytes] = pipe.communicate()
-            if pipe.returncode == 1:
-                print(f"[bold red]Failed to install Apache NiFi using Flux[/bold red]")
-                print(res[1].decode("utf8"))
-                exit(1)
-            print(f"[green]Installed Apache NiFi using Flux[/green]")
-            print(res[0].decode("utf8"))
-        if KEY_CHOICES_INFRA_AIRFLOW in infra:
-            print("Installing Apache Airflow using Flux...")
-            args = (
-                "flux",
-                "create",
-                "source",
-                "git",
-                "pulse8-core-env-airflow-repo",
-                "--url=https://github.com/synpulse-group/pulse8-core-env-airflow.git",
-                "--branch=main",
-                "--secret-ref=github-token",
-            )
-            pipe = subprocess.Popen(
-                args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-            )
-            res: tuple[bytes, bytes] = pipe.communicate()
-            if pipe.returncode == 1:
-                print(
-                    f"[bold red]Failed to install Apache Airflow git source using Flux[/bold red]"
-                )
-                print(res[1].decode("utf8"))
-                exit(1)
-            print(f"[green]Installed Apache Airflow git source using Flux[/green]")
-            print(res[0].decode("utf8"))
-            args = (
-                "flux",
-                "create",
-                "kustomization",
-                "pulse8-core-env-airflow",
-                "--source=GitRepository/pulse8-core-env-airflow-repo",
-                "--interval=1m",
-                "--prune=true",
-                "--target-namespace=default",
-            )
-            pipe = subprocess.Popen(
-                args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-            )
-            res: tuple[bytes, bytes] = pipe.communicate()
-            if pipe.returncode == 1:
-                print(
-                    f"[bold red]Failed to install Apache Airflow using Flux[/bold red]"
-                )
-                print(res[1].decode("utf8"))
-                exit(1)
-            print(f"[green]Installed Apache Airflow using Flux[/green]")
-            print(res[0].decode("utf8"))
-        if KEY_CHOICES_INFRA_SUPERSET in infra:
-            print("Installing Apache Superset using Flux...")
-            args = (
-                "flux",
-                "create",
-                "source",
-                "git",
-                "pulse8-core-env-superset-repo",
-                "--url=https://github.com/synpulse-group/pulse8-core-env-superset.git",
-                "--branch=main",
-                "--secret-ref=github-token",
-            )
-            pipe = subprocess.Popen(
-                args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-            )
-            res: tuple[bytes, bytes] = pipe.communicate()
-            if pipe.returncode == 1:
-                print(
-                    f"[bold red]Failed to install Apache Superset git source using Flux[/bold red]"
-                )
-                print(res[1].decode("utf8"))
-                exit(1)
-            print(f"[green]Installed Apache Superset git source using Flux[/green]")
-            print(res[0].decode("utf8"))
-            args = (
-                "flux",
-                "create",
-                "kustomization",
-                "pulse8-core-env-superset",
-                "--source=GitRepository/pulse8-core-env-superset-repo",
-                "--interval=1m",
-                "--prune=true",
-                "--target-namespace=default",
-            )
-            pipe = subprocess.Popen(
-                args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-            )
-            res: tuple[bytes, bytes] = pipe.communicate()
-            if pipe.returncode == 1:
-                print(
-                    f"[bold red]Failed to install Apache Superset using Flux[/bold red]"
-                )
-                print(res[1].decode("utf8"))
-                exit(1)
-            print(f"[green]Installed Apache Superset using Flux[/green]")
-            print(res[0].decode("utf8"))
-        if KEY_CHOICES_INFRA_CLOUDSERVER in infra:
-            print("Installing Zenko Cloudserver (S3) using Flux...")
-            args = (
-                "flux",
-                "create",
-                "source",
-                "git",
-                "pulse8-core-env-cloudserver-repo",
-                "--url=https://github.com/synpulse-group/pulse8-core-env-cloudserver.git",
-                "--branch=main",
-                "--secret-ref=github-token",
-            )
-            pipe = subprocess.Popen(
-                args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-            )
-            res: tuple[bytes, bytes] = pipe.communicate()
-            if pipe.returncode == 1:
-                print(
-                    f"[bold red]Failed to install Zenko Cloudserver (S3) git source using Flux[/bold red]"
-                )
-                print(res[1].decode("utf8"))
-                exit(1)
-            print(
-                f"[green]Installed Zenko Cloudserver (S3) git source using Flux[/green]"
-            )
-            print(res[0].decode("utf8"))
-            args = (
-                "flux",
-                "create",
-                "kustomization",
-                "pulse8-core-env-cloudserver",
-                "--source=GitRepository/pulse8-core-env-cloudserver-repo",
-                "--interval=1m",
-                "--prune=true",
-                "--target-namespace=default",
-            )
-            pipe = subprocess.Popen(
-                args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-            )
-            res: tuple[bytes, bytes] = pipe.communicate()
-            if pipe.returncode == 1:
-                print(
-                    f"[bold red]Failed to install Zenko Cloudserver (S3) using Flux[/bold red]"
-                )
-                print(res[1].decode("utf8"))
-                exit(1)
-            print(f"[green]Installed Zenko Cloudserver (S3) using Flux[/green]")
-            print(res[0].decode("utf8"))
-    if KEY_CHOICES_SERVICES in choices:
-        services_core = choices[KEY_CHOICES_SERVICES]
-        for service_core_key in services_core:
-            install_service(service_core_key)
-    if choices_old is not None:
-        if KEY_CHOICES_INFRA in choices_old:
-            choices_infra = choices[KEY_CHOICES_INFRA]
-            choices_infra_old = choices_old[KEY_CHOICES_INFRA]
-            if (
-                KEY_CHOICES_INFRA_POSTGRESQL not in choices_infra
-                and KEY_CHOICES_INFRA_POSTGRESQL in choices_infra_old
-            ):
-                print("Uninstalling PostgreSQL using Flux...")
-                args = (
-                    "flux",
-                    "delete",
-                    "source",
-                    "git",
-                    "pulse8-core-env-postgresql-repo",
-                    "-s",
-                )
-                pipe = subprocess.Popen(
-                    args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-                )
-                res: tuple[bytes, bytes] = pipe.communicate()
-                if pipe.returncode == 1:
-                    print(
-                        f"[bold red]Failed to uninstall PostgreSQL git source using Flux[/bold red]"
-                    )
-                    print(res[1].decode("utf8"))
-                    exit(1)
-                print(res[0].decode("utf8"))
-                args = (
-                    "flux",
-                    "delete",
-                    "kustomization",
-                    "pulse8-core-env-postgresql",
-                    "-s",
-                )
-                pipe = subprocess.Popen(
-                    args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-                )
-                res: tuple[bytes, bytes] = pipe.communicate()
-                if pipe.returncode == 1:
-                    print(
-                        f"[bold red]Failed to uninstall PostgreSQL using Flux[/bold red]"
-                    )
-                    print(res[1].decode("utf8"))
-                    exit(1)
-                print(f"[green]Uninstalled PostgreSQL using Flux[/green]")
-                print(res[0].decode("utf8"))
-            if (
-                KEY_CHOICES_INFRA_KAFKA not in choices_infra
-                and KEY_CHOICES_INFRA_KAFKA in choices_infra_old
-            ):
-                print("Uninstalling Kafka (Confluent for Kubernetes) using Flux...")
-                args = (
-                    "flux",
-                    "delete",
-                    "source",
-                    "git",
-                    "pulse8-core-env-kafka-repo",
-                    "-s",
-                )
-                pipe = subprocess.Popen(
-                    args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-                )
-                res: tuple[bytes, bytes] = pipe.communicate()
-                if pipe.returncode == 1:
-                    print(
-                        f"[bold red]Failed to uninstall Kafka (Confluent for Kubernetes) git source using Flux[/bold red]"
-                    )
-                    print(res[1].decode("utf8"))
-                    exit(1)
-                print(res[0].decode("utf8"))
-                args = (
-                    "flux",
-                    "delete",
-                    "kustomization",
-                    "pulse8-core-env-kafka",
-                    "-s",
-                )
-                pipe = subprocess.Popen(
-                    args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-                )
-                res: tuple[bytes, bytes] = pipe.communicate()
-                if pipe.returncode == 1:
-                    print(
-                        f"[bold red]Failed to uninstall Kafka (Confluent for Kubernetes) using Flux[/bold red]"
-                    )
-                    print(res[1].decode("utf8"))
-                    exit(1)
-                print(
-                    f"[green]Uninstalled Kafka (Confluent for Kubernetes) using Flux[/green]"
-                )
-                print(res[0].decode("utf8"))
-            if (
-                KEY_CHOICES_INFRA_REDIS not in choices_infra
-                and KEY_CHOICES_INFRA_REDIS in choices_infra_old
-            ):
-                print("Uninstalling Redis using Flux...")
-                args = (
-                    "flux",
-                    "delete",
-                    "source",
-                    "git",
-                    "pulse8-core-env-redis-repo",
-                    "-s",
-                )
-                pipe = subprocess.Popen(
-                    args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-                )
-                res: tuple[bytes, bytes] = pipe.communicate()
-                if pipe.returncode == 1:
-                    print(
-                        f"[bold red]Failed to uninstall Redis git source using Flux[/bold red]"
-                    )
-                    print(res[1].decode("utf8"))
-                    exit(1)
-                print(res[0].decode("utf8"))
-                args = (
-                    "flux",
-                    "delete",
-                    "kustomization",
-                    "pulse8-core-env-redis",
-                    "-s",
-                )
-                pipe = subprocess.Popen(
-                    args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-                )
-                res: tuple[bytes, bytes] = pipe.communicate()
-                if pipe.returncode == 1:
-                    print(f"[bold red]Failed to uninstall Redis using Flux[/bold red]")
-                    print(res[1].decode("utf8"))
-                    exit(1)
-                print(f"[green]Uninstalled Redis using Flux[/green]")
-                print(res[0].decode("utf8"))
-            if (
-                KEY_CHOICES_INFRA_EXASOL not in choices_infra
-                and KEY_CHOICES_INFRA_EXASOL in choices_infra_old
-            ):
-                print("Uninstalling Exasol using Flux...")
-                args = (
-                    "flux",
-                    "delete",
-                    "source",
-                    "git",
-                    "pulse8-core-env-exasol-repo",
-                    "-s",
-                )
-                pipe = subprocess.Popen(
-                    args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-                )
-                res: tuple[bytes, bytes] = pipe.communicate()
-                if pipe.returncode == 1:
-                    print(
-                        f"[bold red]Failed to uninstall Exasol git source using Flux[/bold red]"
-                    )
-                    print(res[1].decode("utf8"))
-                    exit(1)
-                print(res[0].decode("utf8"))
-                args = (
-                    "flux",
-                    "delete",
-                    "kustomization",
-                    "pulse8-core-env-exasol",
-                    "-s",
-                )
-                pipe = subprocess.Popen(
-                    args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-                )
-                res: tuple[bytes, bytes] = pipe.communicate()
-                if pipe.returncode == 1:
-                    print(f"[bold red]Failed to uninstall Exasol using Flux[/bold red]")
-                    print(res[1].decode("utf8"))
-                    exit(1)
-                print(f"[green]Uninstalled Exasol using Flux[/green]")
-                print(res[0].decode("utf8"))
-            if (
-                KEY_CHOICES_INFRA_MARIADB not in choices_infra
-                and KEY_CHOICES_INFRA_MARIADB in choices_infra_old
-            ):
-                print("Uninstalling MariaDB using Flux...")
-                args = (
-                    "flux",
-                    "delete",
-                    "source",
-                    "git",
-                    "pulse8-core-env-mariadb-repo",
-                    "-s",
-                )
-                pipe = subprocess.Popen(
-                    args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-                )
-                res: tuple[bytes, bytes] = pipe.communicate()
-                if pipe.returncode == 1:
-                    print(
-                        f"[bold red]Failed to uninstall MariaDB git source using Flux[/bold red]"
-                    )
-                    print(res[1].decode("utf8"))
-                    exit(1)
-                print(res[0].decode("utf8"))
-                args = (
-                    "flux",
-                    "delete",
-                    "kustomization",
-                    "pulse8-core-env-mariadb",
-                    "-s",
-                )
-                pipe = subprocess.Popen(
-                    args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-                )
-                res: tuple[bytes, bytes] = pipe.communicate()
-                if pipe.returncode == 1:
-                    print(
-                        f"[bold red]Failed to uninstall MariaDB using Flux[/bold red]"
-                    )
-                    print(res[1].decode("utf8"))
-                    exit(1)
-                print(f"[green]Uninstalled MariaDB using Flux[/green]")
-                print(res[0].decode("utf8"))
-            if (
-                KEY_CHOICES_INFRA_PINOT not in choices_infra
-                and KEY_CHOICES_INFRA_PINOT in choices_infra_old
-            ):
-                print("Uninstalling Pinot using Flux...")
-                args = (
-                    "flux",
-                    "delete",
-                    "source",
-                    "git",
-                    "pulse8-core-env-pinot-repo",
-                    "-s",
-                )
-                pipe = subprocess.Popen(
-                    args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-                )
-                res: tuple[bytes, bytes] = pipe.communicate()
-                if pipe.returncode == 1:
-                    print(
-                        f"[bold red]Failed to uninstall Pinot git source using Flux[/bold red]"
-                    )
-                    print(res[1].decode("utf8"))
-                    exit(1)
-                print(res[0].decode("utf8"))
-                args = (
-                    "flux",
-                    "delete",
-                    "kustomization",
-                    "pulse8-core-env-pinot",
-                    "-s",
-                )
-                pipe = subprocess.Popen(
-                    args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-                )
-                res: tuple[bytes, bytes] = pipe.communicate()
-                if pipe.returncode == 1:
-                    print(f"[bold red]Failed to uninstall Pinot using Flux[/bold red]")
-                    print(res[1].decode("utf8"))
-                    exit(1)
-                print(f"[green]Uninstalled Pinot using Flux[/green]")
-                print(res[0].decode("utf8"))
-            if (
-                KEY_CHOICES_INFRA_TEEDY not in choices_infra
-                and KEY_CHOICES_INFRA_TEEDY in choices_infra_old
-            ):
-                print("Uninstalling Teedy using Flux...")
-                args = (
-                    "flux",
-                    "delete",
-                    "source",
-                    "git",
-                    "pulse8-core-env-teedy-repo",
-                    "-s",
-                )
-                pipe = subprocess.Popen(
-                    args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-                )
-                res: tuple[bytes, bytes] = pipe.communicate()
-                if pipe.returncode == 1:
-                    print(
-                        f"[bold red]Failed to uninstall Teedy git source using Flux[/bold red]"
-                    )
-                    print(res[1].decode("utf8"))
-                    exit(1)
-                print(res[0].decode("utf8"))
-                args = (
-                    "flux",
-                    "delete",
-                    "kustomization",
-                    "pulse8-core-env-teedy",
-                    "-s",
-                )
-                pipe = subprocess.Popen(
-                    args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-                )
-                res: tuple[bytes, bytes] = pipe.communicate()
-                if pipe.returncode == 1:
-                    print(f"[bold red]Failed to uninstall Teedy using Flux[/bold red]")
-                    print(res[1].decode("utf8"))
-                    exit(1)
-                print(f"[green]Uninstalled Teedy using Flux[/green]")
-                print(res[0].decode("utf8"))
-            if (
-                KEY_CHOICES_INFRA_KEYCLOAK not in choices_infra
-                and KEY_CHOICES_INFRA_KEYCLOAK in choices_infra_old
-            ):
-                print("Uninstalling Keycloak using Flux...")
-                args = (
-                    "flux",
-                    "delete",
-                    "source",
-                    "git",
-                    "pulse8-core-env-keycloak-repo",
-                    "-s",
-                )
-                pipe = subprocess.Popen(
-                    args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-                )
-                res: tuple[bytes, bytes] = pipe.communicate()
-                if pipe.returncode == 1:
-                    print(
-                        f"[bold red]Failed to uninstall Keycloak git source using Flux[/bold red]"
-                    )
-                    print(res[1].decode("utf8"))
-                    exit(1)
-                print(res[0].decode("utf8"))
-                args = (
-                    "flux",
-                    "delete",
-                    "kustomization",
-                    "pulse8-core-env-keycloak",
-                    "-s",
-                )
-                pipe = subprocess.Popen(
-                    args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-                )
-                res: tuple[bytes, bytes] = pipe.communicate()
-                if pipe.returncode == 1:
-                    print(
-                        f"[bold red]Failed to uninstall Keycloak using Flux[/bold red]"
-                    )
-                    print(res[1].decode("utf8"))
-                    exit(1)
-                print(f"[green]Uninstalled Keycloak using Flux[/green]")
-                print(res[0].decode("utf8"))
-            if (
-                KEY_CHOICES_INFRA_SPARK not in choices_infra
-                and KEY_CHOICES_INFRA_SPARK in choices_infra_old
-            ):
-                print("Uninstalling Apache Spark using Flux...")
-                args = (
-                    "flux",
-                    "delete",
-                    "source",
-                    "git",
-                    "pulse8-core-env-spark-repo",
-                    "-s",
-                )
-                pipe = subprocess.Popen(
-                    args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-                )
-                res: tuple[bytes, bytes] = pipe.communicate()
-                if pipe.returncode == 1:
-                    print(
-                        f"[bold red]Failed to uninstall Apache Spark git source using Flux[/bold red]"
-                    )
-                    print(res[1].decode("utf8"))
-                    exit(1)
-                print(res[0].decode("utf8"))
-                args = (
-                    "flux",
-                    "delete",
-                    "kustomization",
-                    "pulse8-core-env-spark",
-                    "-s",
-                )
-                pipe = subprocess.Popen(
-                    args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-                )
-                res: tuple[bytes, bytes] = pipe.communicate()
-                if pipe.returncode == 1:
-                    print(
-                        f"[bold red]Failed to uninstall Apache Spark using Flux[/bold red]"
-                    )
-                    print(res[1].decode("utf8"))
-                    exit(1)
-                print(f"[green]Uninstalled Apache Spark using Flux[/green]")
-                print(res[0].decode("utf8"))
-            if (
-                KEY_CHOICES_INFRA_NIFI not in choices_infra
-                and KEY_CHOICES_INFRA_NIFI in choices_infra_old
-            ):
-                print("Uninstalling Apache NiFi using Flux...")
-                args = (
-                    "flux",
-                    "delete",
-                    "source",
-                    "git",
-                    "pulse8-core-env-nifi-repo",
-                    "-s",
-                )
-                pipe = subprocess.Popen(
-                    args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-                )
-                res: tuple[bytes, bytes] = pipe.communicate()
-                if pipe.returncode == 1:
-                    print(
-                        f"[bold red]Failed to uninstall Apache NiFi git source using Flux[/bold red]"
-                    )
-                    print(res[1].decode("utf8"))
-                    exit(1)
-                print(res[0].decode("utf8"))
-                args = ("flux", "delete", "kustomization", "pulse8-core-env-nifi", "-s")
-                pipe = subprocess.Popen(
-                    args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-                )
-                res: tuple[bytes, bytes] = pipe.communicate()
-                if pipe.returncode == 1:
-                    print(
-                        f"[bold red]Failed to uninstall Apache NiFi using Flux[/bold red]"
-                    )
-                    print(res[1].decode("utf8"))
-                    exit(1)
-                print(f"[green]Uninstalled Apache NiFi using Flux[/green]")
-                print(res[0].decode("utf8"))
-            if (
-                KEY_CHOICES_INFRA_AIRFLOW not in choices_infra
-                and KEY_CHOICES_INFRA_AIRFLOW in choices_infra_old
-            ):
-                print("Uninstalling Apache Airflow using Flux...")
-                args = (
-                    "flux",
-                    "delete",
-                    "source",
-                    "git",
-                    "pulse8-core-env-airflow-repo",
-                    "-s",
-                )
-                pipe = subprocess.Popen(
-                    args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-                )
-                res: tuple[bytes, bytes] = pipe.communicate()
-                if pipe.returncode == 1:
-                    print(
-                        f"[bold red]Failed to uninstall Apache Airflow git source using Flux[/bold red]"
-                    )
-                    print(res[1].decode("utf8"))
-                    exit(1)
-                print(res[0].decode("utf8"))
-                args = (
-                    "flux",
-                    "delete",
-                    "kustomization",
-                    "pulse8-core-env-airflow",
-                    "-s",
-                )
-                pipe = subprocess.Popen(
-                    args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-                )
-                res: tuple[bytes, bytes] = pipe.communicate()
-                if pipe.returncode == 1:
-                    print(
-                        f"[bold red]Failed to uninstall Apache Airflow using Flux[/bold red]"
-                    )
-                    print(res[1].decode("utf8"))
-                    exit(1)
-                print(f"[green]Uninstalled Apache Airflow using Flux[/green]")
-                print(res[0].decode("utf8"))
-            if (
-                KEY_CHOICES_INFRA_SUPERSET not in choices_infra
-                and KEY_CHOICES_INFRA_SUPERSET in choices_infra_old
-            ):
-                print("Uninstalling Apache Superset using Flux...")
-                args = (
-                    "flux",
-                    "delete",
-                    "source",
-                    "git",
-                    "pulse8-core-env-superset-repo",
-                    "-s",
-                )
-                pipe = subprocess.Popen(
-                    args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-                )
-                res: tuple[bytes, bytes] = pipe.communicate()
-                if pipe.returncode == 1:
-                    print(
-                        f"[bold red]Failed to uninstall Apache Superset git source using Flux[/bold red]"
-                    )
-                    print(res[1].decode("utf8"))
-                    exit(1)
-                print(res[0].decode("utf8"))
-                args = (
-                    "flux",
-                    "delete",
-                    "kustomization",
-                    "pulse8-core-env-superset",
-                    "-s",
-                )
-                pipe = subprocess.Popen(
-                    args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-                )
-                res: tuple[bytes, bytes] = pipe.communicate()
-                if pipe.returncode == 1:
-                    print(
-                        f"[bold red]Failed to uninstall Apache Superset using Flux[/bold red]"
-                    )
-                    print(res[1].decode("utf8"))
-                    exit(1)
-                print(f"[green]Uninstalled Apache Superset using Flux[/green]")
-                print(res[0].decode("utf8"))
-            if (
-                KEY_CHOICES_INFRA_CLOUDSERVER not in choices_infra
-                and KEY_CHOICES_INFRA_CLOUDSERVER in choices_infra_old
-            ):
-                print("Uninstalling Zenko Cloudserver (S3) using Flux...")
-                args = (
-                    "flux",
-                    "delete",
-                    "source",
-                    "git",
-                    "pulse8-core-env-cloudserver-repo",
-                    "-s",
-                )
-                pipe = subprocess.Popen(
-                    args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-                )
-                res: tuple[bytes, bytes] = pipe.communicate()
-                if pipe.returncode == 1:
-                    print(
-                        f"[bold red]Failed to uninstall Zenko Cloudserver (S3) git source using Flux[/bold red]"
-                    )
-                    print(res[1].decode("utf8"))
-                    exit(1)
-                print(res[0].decode("utf8"))
-                args = (
-                    "flux",
-                    "delete",
-                    "kustomization",
-                    "pulse8-core-env-cloudserver",
-                    "-s",
-                )
-                pipe = subprocess.Popen(
-                    args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-                )
-                res: tuple[bytes, bytes] = pipe.communicate()
-                if pipe.returncode == 1:
-                    print(
-                        f"[bold red]Failed to uninstall Zenko Cloudserver (S3) using Flux[/bold red]"
-                    )
-                    print(res[1].decode("utf8"))
-                    exit(1)
-                print(f"[green]Uninstalled Zenko Cloudserver (S3) using Flux[/green]")
-                print(res[0].decode("utf8"))
-        if KEY_CHOICES_SERVICES in choices_old:
-            choices_services_core = choices[KEY_CHOICES_SERVICES]
-            choices_services_core_old = choices_old[KEY_CHOICES_SERVICES]
-            for service_core_old_key in choices_services_core_old:
-                if (
-                    service_core_old_key not in choices_services_core
-                    and not choices_services_core_old[service_core_old_key]["suspend"]
-                ):
-                    uninstall_service(service_core_old_key)
-
-
-def env_list():
-    args = ("k3d", "cluster", "list")
-    popen = subprocess.Popen(args, stdout=subprocess.PIPE)
-    popen.wait()
-    output = popen.stdout.read()
-    print(output.decode("utf8"))
+    title = f"Status of environment {re.sub(r'^k3d-', '', context_name)}"
+    if watch:
+        watch_status(context_name, title)
+        return
+    try:
+        cache = fetch_status(context_name)
+    except (KubernetesApiError, OSError) as e:
+        print(
+            f"[bold red]failed to read the status - is the environment running?[/bold red]"
+        )
+        print(str(e))
+        exit(1)
+    print(render_status_table(cache, title))
 
 
 def env_switch(identifier: str):
-    stop_all_env()
     print(f"[bold]starting target environment (id: {identifier})...[/bold]")
-    args = ("k3d", "cluster", "start", f"{identifier}")
-    popen = subprocess.Popen(args, stdout=subprocess.PIPE)
-    popen.wait()
-    output = popen.stdout.read()
-    print(output.decode("utf8"))
+    start_resident(get_env_cluster_name(identifier))
     print(
         f"[green]switching to target environment context in kubeconfig (id: {identifier})...[/green]"
     )
-    args = ("kubectl", "config", "use-context", f"k3d-{identifier}")
-    popen = subprocess.Popen(args, stdout=subprocess.PIPE)
-    popen.wait()
-    output = popen.stdout.read()
-    print(output.decode("utf8"))
+    run_command(("kubectl", "config", "use-context", f"k3d-{identifier}"), stream=True)
+    get_env_registry().touch(identifier)
 
 
 def env_delete(identifier: str):
     print(f"[bold red]deleting the environment (id: {identifier})...[/bold red]")
-    args = ("k3d", "cluster", "delete", f"{identifier}")
-    popen = subprocess.Popen(args, stdout=subprocess.PIPE)
-    popen.wait()
-    output = popen.stdout.read()
-    print(output.decode("utf8"))
+    cluster = get_env_cluster_name(identifier)
+    run_command(("k3d", "cluster", "delete", cluster), stream=True)
+    if cluster != identifier:
+        # the context of a claimed pool cluster was renamed - k3d does not know it
+        run_command(("kubectl", "config", "delete-context", f"k3d-{identifier}"))
+        forget_pool_cluster(cluster)
     delete_env_setup(identifier)
 
 
+@profiled()
+def env_snapshot(identifier: str, name: str) -> None:
+    cluster = get_env_cluster_name(identifier)
+    nodes = list_cluster_nodes(cluster)
+    if not nodes:
+        print(f"[bold red]environment {identifier} does not exist[/bold red]")
+        exit(1)
+    snapshot_dir = get_snapshot_dir_path(identifier, name)
+    if snapshot_dir.exists():
+        print(
+            f"[bold red]snapshot {name} of environment {identifier} already exists[/bold red]"
+        )
+        exit(1)
+    running = any(
+        c["name"] == cluster and c.get("serversRunning", 0) > 0
+        for c in list_k3d_clusters()
+    )
+    print(f"[bold]creating snapshot {name} of environment (id: {identifier})...[/bold]")
+    # the datastore is only consistent while k3s is stopped
+    execute_shell_command(
+        command_array=["k3d", "cluster", "stop", cluster],
+        message_failure=f"failed to stop environment (id: {identifier})",
+        print_output=False,
+    )
+    snapshot_dir.parent.mkdir(parents=True, exist_ok=True)
+    # written aside and renamed once complete - a failed snapshot does not block a retry
+    partial_dir = Path(tempfile.mkdtemp(prefix=f".{name}-", dir=snapshot_dir.parent))
+    try:
+        for node in nodes:
+            print(f"saving data of node {node}...")
+            save_node_data(node, partial_dir)
+        record = get_env_registry().get(identifier)
+        if record is not None:
+            write_snapshot_setup(partial_dir, record.setup)
+        write_snapshot_metadata(partial_dir, identifier, name, cluster, nodes)
+        partial_dir.rename(snapshot_dir)
+    finally:
+        shutil.rmtree(partial_dir, ignore_errors=True)
+        if running:
+            execute_shell_command(
+                command_array=["k3d", "cluster", "start", cluster],
+                message_failure=f"failed to start environment (id: {identifier})",
+                print_output=False,
+            )
+    print(f"[green]created snapshot {name} of environment (id: {identifier})[/green]")
+
+
+@profiled()
+def env_restore(identifier: str, name: str) -> None:
+    snapshot_dir = get_snapshot_dir_path(identifier, name)
+    if not snapshot_dir.exists():
+        print(
+            f"[bold red]snapshot {name} of environment {identifier} does not exist[/bold red]"
+        )
+        exit(1)
+    metadata = read_snapshot_metadata(snapshot_dir)
+    cluster = metadata["cluster"]
+    nodes = list_cluster_nodes(cluster)
+    if nodes != metadata["nodes"]:
+        print(
+            f"[bold red]the nodes of environment {identifier} do not match the snapshot - "
+            f"snapshots can only be restored into the cluster they were taken from[/bold red]"
+        )
+        exit(1)
+    print(
+        f"[bold]restoring snapshot {name} of environment (id: {identifier})...[/bold]"
+    )
+    # the datastore may only be replaced while k3s is stopped
+    execute_shell_command(
+        command_array=["k3d", "cluster", "stop", cluster],
+        message_failure=f"failed to stop environment (id: {identifier})",
+        print_output=False,
+    )
+    for node in nodes:
+        print(f"restoring data of node {node}...")
+        restore_node_data(node, snapshot_dir)
+    setup = read_snapshot_setup(snapshot_dir)
+    if setup is not None:
+        get_env_registry().save(identifier, setup, event=EVENT_RESTORED)
+    print(f"[green]restored snapshot {name} of environment (id: {identifier})[/green]")
+    env_switch(identifier)
+
+
+@profiled()
+def env_claim_pool_cluster(identifier: str) -> str | None:
+    cluster = take_ready_pool_cluster()
+    if cluster is None:
+        print("no prepared cluster in the pool - creating a new cluster...")
+        print(
+            "[italic]Hint: Prepare clusters upfront using [bold]pulse8 environment pool fill[/bold][/italic]"
+        )
+        return None
+    print(f"[bold]claiming prepared cluster {cluster} (id: {identifier})...[/bold]")
+    make_resident(cluster)
+    execute_shell_command(
+        command_array=[
+            "k3d",
+            "cluster",
+            "edit",
+            cluster,
+            "--port-add",
+            "80:80@loadbalancer",
+            "--port-add",
+            "443:443@loadbalancer",
+        ],
+        message_failure=f"failed to expose ports of cluster {cluster}",
+        print_output=False,
+    )
+    execute_shell_command(
+        command_array=["k3d", "cluster", "start", cluster],
+        message_failure=f"failed to start cluster {cluster}",
+        print_output=False,
+    )
+    execute_shell_command(
+        command_array=[
+            "k3d",
+            "kubeconfig",
+            "merge",
+            cluster,
+            "--kubeconfig-merge-default",
+            "--kubeconfig-switch-context",
+        ],
+        message_failure=f"failed to add cluster {cluster} to kubeconfig",
+        print_output=False,
+    )
+    execute_shell_command(
+        command_array=[
+            "kubectl",
+            "config",
+            "rename-context",
+            f"k3d-{cluster}",
+            f"k3d-{identifier}",
+        ],
+        message_failure=f"failed to rename context of cluster {cluster}",
+        print_output=False,
+    )
+    print(f"[green]claimed prepared cluster {cluster} (id: {identifier})[/green]")
+    return cluster
+
+
+def env_pool_fill(
+    size: int, background: bool = False, registry_cache: bool = True
+) -> None:
+    if background:
+        log_path = get_pool_dir_path().joinpath("fill.log")
+        print(f"filling the environment pool in the background (log: {log_path})...")
+        start_detached(
+            (
+                sys.executable,
+                "-m",
+                "pulse8_core_cli.main",
+                "environment",
+                "pool",
+                "fill",
+                f"--size={size}",
+                "--registry-cache" if registry_cache else "--no-registry-cache",
+            ),
+            log_path,
+            cwd=get_pool_dir_path(),
+        )
+        return
+    env_vars = get_env_variables(silent=True)
+    missing = size - len(list_pool_clusters())
+    if missing <= 0:
+        print(f"[green]environment pool already holds {size} clusters[/green]")
+        return
+    registry_cache_args = (
+        get_registry_cache_cluster_args(env_vars) if registry_cache else ()
+    )
+    kubeconfig_original = os.environ.get("KUBECONFIG")
+    for _ in range(missing):
+        cluster = new_pool_cluster_name()
+        print(f"[bold]preparing pool cluster {cluster}...[/bold]")
+        # pool clusters stay out of the default kubeconfig and expose no ports,
+        # so they do not disturb the currently running environment
+        env_create_cluster(
+            cluster,
+            (
+                "--kubeconfig-update-default=false",
+                "--kubeconfig-switch-context=false",
+                *registry_cache_args,
+            ),
+        )
+        kubeconfig_path = get_pool_kubeconfig_path(cluster)
+        execute_shell_command(
+            command_array=[
+                "k3d",
+                "kubeconfig",
+                "write",
+                cluster,
+                f"--output={kubeconfig_path}",
+            ],
+            message_failure=f"failed to write kubeconfig of pool cluster {cluster}",
+            print_output=False,
+        )
+        os.environ["KUBECONFIG"] = str(kubeconfig_path)
+        try:
+            env_bootstrap_cluster(cluster, env_vars)
+        finally:
+            if kubeconfig_original is None:
+                os.environ.pop("KUBECONFIG", None)
+            else:
+                os.environ["KUBECONFIG"] = kubeconfig_original
+        execute_shell_command(
+            command_array=["k3d", "cluster", "stop", cluster],
+            message_failure=f"failed to stop pool cluster {cluster}",
+            print_output=False,
+        )
+        mark_pool_cluster_ready(cluster)
+        print(f"[green]prepared pool cluster {cluster}[/green]")
+
+
+def env_pool_list() -> None:
+    clusters = list_pool_clusters()
+    if not clusters:
+        print("the environment pool is empty")
+        return
+    for cluster in clusters:
+        state = "ready" if is_pool_cluster_ready(cluster) else "preparing"
+        print(f"{cluster} ({state})")
+
+
+def env_pool_drain() -> None:
+    for cluster in list_pool_clusters():
+        if not is_pool_cluster_ready(cluster):
+            continue
+        print(f"[bold red]deleting pool cluster {cluster}...[/bold red]")
+        execute_shell_command(
+            command_array=["k3d", "cluster", "delete", cluster],
+            message_failure=f"failed to delete pool cluster {cluster}",
+            print_output=False,
+        )
+        forget_pool_cluster(cluster)
+    print("[green]drained the environment pool[/green]")
+
+
 def get_questions(
     preselection_infra: list[str] = None, preselection_services_core: list[str] = None
 ) -> list[Checkbox]:
@@ -1636,39 +807,12 @@ def get_questions(
         preselection_infra = [KEY_CHOICES_INFRA_POSTGRESQL, KEY_CHOICES_INFRA_KAFKA]
     if preselection_services_core is None:
         preselection_services_core = [KEY_CHOICES_SERVICES_IAM]
-    if is_cpu_arm():
-        choices_infra = [
-            ("PostgreSQL", KEY_CHOICES_INFRA_POSTGRESQL),
-            ("Kafka (Confluent for Kubernetes)", KEY_CHOICES_INFRA_KAFKA),
-            ("Redis", KEY_CHOICES_INFRA_REDIS),
-            # not supported on arm64 - maybe bring proxy solution in place
-            # ("Exasol", KEY_CHOICES_INFRA_EXASOL),
-            ("MariaDB", KEY_CHOICES_INFRA_MARIADB),
-            ("Pinot", KEY_CHOICES_INFRA_PINOT),
-            ("Teedy", KEY_CHOICES_INFRA_TEEDY),
-            ("Keycloak", KEY_CHOICES_INFRA_KEYCLOAK),
-            ("Apache Spark", KEY_CHOICES_INFRA_SPARK),
-            ("Apache NiFi", KEY_CHOICES_INFRA_NIFI),
-            ("Apache Airflow", KEY_CHOICES_INFRA_AIRFLOW),
-            ("Apache Superset", KEY_CHOICES_INFRA_SUPERSET),
-            ("Zenko Cloudserver (S3)", KEY_CHOICES_INFRA_CLOUDSERVER),
-        ]
-    else:
-        choices_infra = [
-            ("PostgreSQL", KEY_CHOICES_INFRA_POSTGRESQL),
-            ("Kafka (Confluent for Kubernetes)", KEY_CHOICES_INFRA_KAFKA),
-            ("Redis", KEY_CHOICES_INFRA_REDIS),
-            ("Exasol", KEY_CHOICES_INFRA_EXASOL),
-            ("MariaDB", KEY_CHOICES_INFRA_MARIADB),
-            ("Pinot", KEY_CHOICES_INFRA_PINOT),
-            ("Teedy", KEY_CHOICES_INFRA_TEEDY),
-            ("Keycloak", KEY_CHOICES_INFRA_KEYCLOAK),
-            ("Apache Spark", KEY_CHOICES_INFRA_SPARK),
-            ("Apache NiFi", KEY_CHOICES_INFRA_NIFI),
-            ("Apache Airflow", KEY_CHOICES_INFRA_AIRFLOW),
-            ("Apache Superset", KEY_CHOICES_INFRA_SUPERSET),
-            ("Zenko Cloudserver (S3)", KEY_CHOICES_INFRA_CLOUDSERVER),
-        ]
+    registry = get_component_registry()
+    choices_infra = [
+        (component.name, component.key)
+        for component in registry.get_kind(KEY_CHOICES_INFRA)
+        if component.supports_arm or not is_cpu_arm()
+    ]
     questions = [
         inquirer.Checkbox(
             name=KEY_CHOICES_INFRA,
@@ -1680,12 +824,7 @@ def get_questions(
             name=KEY_CHOICES_SERVICES,
             message="Which Pulse8 Core services do you need?",
             choices=[
-                KEY_CHOICES_SERVICES_IAM,
-                KEY_CHOICES_SERVICES_NOTIFICATION_ENGINE,
-                KEY_CHOICES_SERVICES_QUERY_ENGINE,
-                KEY_CHOICES_SERVICES_WORKFLOW_ENGINE,
-                KEY_CHOICES_SERVICES_DOCUMENT_MANAGEMENT,
-                KEY_CHOICES_SERVICES_ACCESS_CONTROL,
+                component.key for component in registry.get_kind(KEY_CHOICES_SERVICES)
             ],
             default=preselection_services_core,
         ),
@@ -1694,10 +833,8 @@ def get_questions(
 
 
 def get_choices_from_env(identifier: str) -> (dict, dict):
-    (choices_fs, choices_configmap) = read_env_setup(identifier, file_only=True)
-    (preselection_infra, preselection_services) = get_preselection_from_setup(
-        choices_fs
-    )
+    choices_fs, choices_configmap = read_env_setup(identifier, file_only=True)
+    preselection_infra, preselection_services = get_preselection_from_setup(choices_fs)
     choices = dict()
     choices[KEY_CHOICES_INFRA] = preselection_infra
     choices[KEY_CHOICES_SERVICES] = preselection_services
@@ -1709,7 +846,7 @@ def get_choices_from_file(path: str) -> (dict, dict):
     path_obj = Path(path)
     if path_obj.exists():
         choices_fs = read_env_setup_from_path(path_obj)
-        (preselection_infra, preselection_services) = get_preselection_from_setup(
+        preselection_infra, preselection_services = get_preselection_from_setup(
             choices_fs
         )
         choices = dict()
@@ -1722,191 +859,29 @@ def get_choices_from_file(path: str) -> (dict, dict):
 
 
 def get_preselection_from_setup(setup: dict) -> (list, list):
-    preselection_infra = []
-    preselection_services = []
-    if setup is not None:
-        if KEY_CHOICES_INFRA in setup:
-            choices_infra = setup[KEY_CHOICES_INFRA]
-            if KEY_CHOICES_INFRA_POSTGRESQL in choices_infra:
-                preselection_infra.append(KEY_CHOICES_INFRA_POSTGRESQL)
-            if KEY_CHOICES_INFRA_REDIS in choices_infra:
-                preselection_infra.append(KEY_CHOICES_INFRA_REDIS)
-            if KEY_CHOICES_INFRA_KAFKA in choices_infra:
-                preselection_infra.append(KEY_CHOICES_INFRA_KAFKA)
-            if KEY_CHOICES_INFRA_EXASOL in choices_infra:
-                preselection_infra.append(KEY_CHOICES_INFRA_EXASOL)
-            if KEY_CHOICES_INFRA_MARIADB in choices_infra:
-                preselection_infra.append(KEY_CHOICES_INFRA_MARIADB)
-            if KEY_CHOICES_INFRA_PINOT in choices_infra:
-                preselection_infra.append(KEY_CHOICES_INFRA_PINOT)
-            if KEY_CHOICES_INFRA_TEEDY in choices_infra:
-                preselection_infra.append(KEY_CHOICES_INFRA_TEEDY)
-            if KEY_CHOICES_INFRA_KEYCLOAK in choices_infra:
-                preselection_infra.append(KEY_CHOICES_INFRA_KEYCLOAK)
-            if KEY_CHOICES_INFRA_SPARK in choices_infra:
-                preselection_infra.append(KEY_CHOICES_INFRA_SPARK)
-            if KEY_CHOICES_INFRA_NIFI in choices_infra:
-                preselection_infra.append(KEY_CHOICES_INFRA_NIFI)
-            if KEY_CHOICES_INFRA_AIRFLOW in choices_infra:
-                preselection_infra.append(KEY_CHOICES_INFRA_AIRFLOW)
-            if KEY_CHOICES_INFRA_SUPERSET in choices_infra:
-                preselection_infra.append(KEY_CHOICES_INFRA_SUPERSET)
-            if KEY_CHOICES_INFRA_CLOUDSERVER in choices_infra:
-                preselection_infra.append(KEY_CHOICES_INFRA_CLOUDSERVER)
-        if KEY_CHOICES_SERVICES in setup:
-            choices_services = setup[KEY_CHOICES_SERVICES]
-            if (
-                KEY_CHOICES_SERVICES_NOTIFICATION_ENGINE in choices_services
-                and not choices_services[KEY_CHOICES_SERVICES_NOTIFICATION_ENGINE][
-                    "suspend"
-                ]
-            ):
-                preselection_services.append(KEY_CHOICES_SERVICES_NOTIFICATION_ENGINE)
-            if (
-                KEY_CHOICES_SERVICES_IAM in choices_services
-                and not choices_services[KEY_CHOICES_SERVICES_IAM]["suspend"]
-            ):
-                preselection_services.append(KEY_CHOICES_SERVICES_IAM)
-            if (
-                KEY_CHOICES_SERVICES_WORKFLOW_ENGINE in choices_services
-                and not choices_services[KEY_CHOICES_SERVICES_WORKFLOW_ENGINE][
-                    "suspend"
-                ]
-            ):
-                preselection_services.append(KEY_CHOICES_SERVICES_WORKFLOW_ENGINE)
-            if (
-                KEY_CHOICES_SERVICES_QUERY_ENGINE in choices_services
-                and not choices_services[KEY_CHOICES_SERVICES_QUERY_ENGINE]["suspend"]
-            ):
-                preselection_services.append(KEY_CHOICES_SERVICES_QUERY_ENGINE)
+    """
+    The infra and the services (not suspended) selected in a setup.
+    """
+    registry = get_component_registry()
+    if setup is None:
+        return [], []
+    choices_infra = setup.get(KEY_CHOICES_INFRA) or []
+    choices_services = setup.get(KEY_CHOICES_SERVICES) or {}
+    preselection_infra = [
+        component.key
+        for component in registry.get_kind(KEY_CHOICES_INFRA)
+        if component.key in choices_infra
+    ]
+    preselection_services = [
+        component.key
+        for component in registry.get_kind(KEY_CHOICES_SERVICES)
+        if component.key in choices_services
+        and not choices_services[component.key].get("suspend")
+    ]
     return preselection_infra, preselection_services
 
 
-def update_infra_choices_with_deps(choices: dict) -> None:
-    needed_infrastructure = choices[KEY_CHOICES_INFRA]
-    for infra in choices[KEY_CHOICES_INFRA]:
-        if infra in INFRA_DEPENDENCIES_INFRA:
-            needed_infrastructure_for_infra = INFRA_DEPENDENCIES_INFRA[infra]
-            needed_infrastructure = (
-                needed_infrastructure + needed_infrastructure_for_infra
-            )
-    for service in choices[KEY_CHOICES_SERVICES]:
-        if service in SERVICES_DEPENDENCIES_INFRA:
-            needed_infrastructure_for_service = SERVICES_DEPENDENCIES_INFRA[service]
-            needed_infrastructure = (
-                needed_infrastructure + needed_infrastructure_for_service
-            )
-    needed_infrastructure = list(set(needed_infrastructure))
-    choices[KEY_CHOICES_INFRA] = needed_infrastructure
-
-
-def update_service_choices_with_deps(choices: dict) -> None:
-    needed_services = choices[KEY_CHOICES_SERVICES]
-    for service in choices[KEY_CHOICES_SERVICES]:
-        if service in SERVICES_DEPENDENCIES_SERVICES:
-            needed_services_core_for_service = SERVICES_DEPENDENCIES_SERVICES[service]
-            needed_services = needed_services + needed_services_core_for_service
-    needed_services = list(set(needed_services))
-    choices[KEY_CHOICES_SERVICES] = needed_services
-    update_infra_choices_with_deps(choices)
-
-
-def install_service(service_key: str, services=SERVICES) -> None:
-    print(f"Installing {services[service_key]['name']} ({service_key}) using Flux...")
-    args = (
-        "flux",
-        "create",
-        "source",
-        "git",
-        f"{service_key}-repo",
-        f"--url={services[service_key]['repository']}",
-        "--secret-ref=github-token",
-    )
-    if services[service_key]["branch"] is not None:
-        args = args + (f"--branch={services[service_key]['branch']}",)
-    if services[service_key]["ref-name"] is not None:
-        args = args + (f"--ref-name={services[service_key]['ref-name']}",)
-    pipe = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    res: tuple[bytes, bytes] = pipe.communicate()
-    if pipe.returncode == 1:
-        print(
-            f"[bold red]Failed to install {services[service_key]['name']} ({service_key}) git source using Flux"
-            f"[/bold red]"
-        )
-        print(res[1].decode("utf8"))
-        exit(1)
-    print(res[0].decode("utf8"))
-    print(
-        f"[green]Installed {services[service_key]['name']} ({service_key}) git source using Flux[/green]"
-    )
-    args = (
-        "flux",
-        "create",
-        "kustomization",
-        f"{service_key}",
-        f"--source=GitRepository/{service_key}-repo",
-        "--interval=1m",
-        "--prune=true",
-        "--path=k8s",
-        "--target-namespace=default",
-        "--wait=false",
-        "--health-check-timeout=30s",
-    )
-    pipe = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    res: tuple[bytes, bytes] = pipe.communicate()
-    if pipe.returncode == 1:
-        print(
-            f"[bold red]Failed to install {services[service_key]['name']} ({service_key}) using Flux"
-            f"[/bold red]"
-        )
-        print(res[1].decode("utf8"))
-        exit(1)
-    print(res[0].decode("utf8"))
-    print(
-        f"[green]Installed {services[service_key]['name']} ({service_key}) using Flux[/green]"
-    )
-
-
-def uninstall_service(service_key: str, services=SERVICES) -> None:
-    print(f"Uninstalling {services[service_key]['name']} ({service_key}) using Flux...")
-    args = ("flux", "delete", "source", "git", f"{service_key}-repo", "-s")
-    pipe = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    res: tuple[bytes, bytes] = pipe.communicate()
-    if pipe.returncode == 1:
-        print(
-            f"[bold red]Failed to uninstall {services[service_key]['name']} ({service_key}) git source using Flux"
-            f"[/bold red]"
-        )
-        print(res[1].decode("utf8"))
-        exit(1)
-    print(res[0].decode("utf8"))
-    print(
-        f"[green]Uninstalled {services[service_key]['name']} ({service_key}) git source using Flux[/green]"
-    )
-    args = ("flux", "delete", "kustomization", f"{service_key}", "-s")
-    pipe = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    res: tuple[bytes, bytes] = pipe.communicate()
-    if pipe.returncode == 1:
-        print(
-            f"[bold red]Failed to uninstall {services[service_key]['name']} ({service_key}) using Flux[/bold red]"
-        )
-        print(res[1].decode("utf8"))
-        exit(1)
-    print(res[0].decode("utf8"))
-    print(
-        f"[green]Uninstalled {services[service_key]['name']} ({service_key}) using Flux[/green]"
-    )
-
-
-def stop_all_env() -> None:
-    print(f"[bold]stopping all running environments...[/bold]")
-    args = ("k3d", "cluster", "stop", "--all")
-    popen = subprocess.Popen(args, stdout=subprocess.PIPE)
-    popen.wait()
-    output = popen.stdout.read()
-    print(output.decode("utf8"))
-
-
+@profiled()
 def create_certificates() -> None:
     print("creating certificates...")
     key_path = get_certificates_dir_path().joinpath("key.pem")
@@ -1914,13 +889,8 @@ def create_certificates() -> None:
     if cert_path.exists() and key_path.exists():
         print("[green]certificates already exist[/green]")
     else:
-        args = ("mkcert", "--install")
-        pipe = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        res: tuple[bytes, bytes] = pipe.communicate()
-        if pipe.returncode == 1:
-            print(res[1].decode("utf8"))
+        if not run_command(("mkcert", "--install"), interactive=True).ok:
             exit(1)
-        print(res[0].decode("utf8"))
         args = (
             "mkcert",
             "-key-file",
@@ -1935,20 +905,25 @@ def create_certificates() -> None:
             "127.0.0.1",
             "::1",
         )
-        pipe = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        res: tuple[bytes, bytes] = pipe.communicate()
-        if pipe.returncode == 1:
-            print(res[1].decode("utf8"))
+        if not run_command(args, stream=True).ok:
             exit(1)
-        print(res[0].decode("utf8"))
         print("[green]certificates created[/green]")
 
 
-def store_env_setup(identifier: str, choices: dict, services=SERVICES) -> bool:
+@profiled()
+def store_env_setup(
+    identifier: str,
+    choices: dict,
+    services=SERVICES,
+    cluster: str | None = None,
+    profile: str = DEFAULT_PROFILE,
+) -> bool:
     print(f"Storing environment setup ({identifier})")
     env_setup = dict()
     env_setup["name"] = identifier
+    env_setup["cluster"] = cluster or get_env_cluster_name(identifier)
     env_setup["infra"] = choices["infra"]
+    env_setup[KEY_PROFILE] = profile
     env_setup["services"] = dict()
     for service_key in services:
         env_setup["services"][service_key] = services[service_key]
@@ -1957,72 +932,57 @@ def store_env_setup(identifier: str, choices: dict, services=SERVICES) -> bool:
         else:
             env_setup["services"][service_key]["suspend"] = True
     try:
-        env_file_path = get_environments_dir_path().joinpath(f"{identifier}.yaml")
-        with open(env_file_path, "w") as env_file:
-            env_file.write(yaml.dump(env_setup))
+        get_env_registry().save(identifier, env_setup)
         print(f"saving choices into configmap pulse8-core-cli-config...")
-        os.system(
-            "kubectl delete configmap pulse8-core-cli-config --ignore-not-found=true"
-        )
-        args = (
-            "kubectl",
-            "create",
-            "configmap",
-            "pulse8-core-cli-config",
-            f"--from-file={env_file_path}",
+        apply_manifests(
+            [
+                {
+                    "apiVersion": "v1",
+                    "kind": "ConfigMap",
+                    "metadata": {
+                        "name": "pulse8-core-cli-config",
+                        "namespace": "default",
+                    },
+                    "data": {f"{identifier}.yaml": yaml.dump(env_setup)},
+                }
+            ],
+            message_success="saved choices into configmap pulse8-core-cli-config",
         )
-        pipe = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        res: tuple[bytes, bytes] = pipe.communicate()
-        if pipe.returncode == 1:
-            print(
-                f"[bold red]failed to save into configmap pulse8-core-cli-config[/bold red]"
-            )
-            print(res[1].decode("utf8"))
-            exit(1)
-        print(f"[green]saved choices into configmap pulse8-core-cli-config[/green]")
-        print(res[0].decode("utf8"))
         print(
             f"[italic]Hint: You can edit your environment setup using the configmap pulse8-core-cli-config.[/italic]"
         )
         print(
-            f"[italic]Hint: You must not edit the environment setup stored under {env_file_path}![/italic]"
+            f"[italic]Hint: You must not edit the environment registry {get_environments_db_path()}![/italic]"
         )
         return True
-    except OSError:
+    except (OSError, sqlite3.Error):
         return False
 
 
 def read_env_setup(identifier: str, file_only: bool = False) -> (dict, dict | None):
     print(f"Reading environment setup ({identifier})")
     try:
-        env_file_path = get_environments_dir_path().joinpath(f"{identifier}.yaml")
-        env_setup_fs: dict
-        with open(env_file_path, "r") as env_file:
-            env_setup_raw = env_file.read()
-            env_setup_fs = yaml.load(env_setup_raw, yaml.Loader)
+        record = get_env_registry().get(identifier)
+        if record is None:
+            print(f"[bold red]environment {identifier} does not exist[/bold red]")
+            exit(1)
+        env_setup_fs = record.setup
         if not file_only:
-            args = (
-                "kubectl",
-                "--namespace",
-                "default",
-                "get",
-                "configmap",
-                "pulse8-core-cli-config",
-                "-o",
-                "yaml",
-            )
-            pipe = subprocess.Popen(
-                args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-            )
-            res: tuple[bytes, bytes] = pipe.communicate()
-            if pipe.returncode == 1:
+            try:
+                configmap = get_kube_client().get(
+                    "v1", "ConfigMap", "pulse8-core-cli-config", namespace="default"
+                )
+            except (KubernetesApiError, OSError) as e:
+                print(
+                    f"[bold red]failed collecting information - previous configuration from configmap[/bold red]"
+                )
+                print(str(e))
+                exit(1)
+            if configmap is None:
                 print(
                     f"[bold red]failed collecting information - previous configuration from configmap[/bold red]"
                 )
-                print(res[1].decode("utf8"))
                 exit(1)
-            configmap_raw = res[0].decode("utf8")
-            configmap = yaml.load(configmap_raw, yaml.Loader)
             env_setup_configmap = yaml.load(
                 configmap["data"][f"{identifier}.yaml"], yaml.Loader
             )
@@ -2045,22 +1005,34 @@ def read_env_setup_from_path(path: Path) -> dict:
         raise OSError
 
 
+def get_env_cluster_name(identifier: str) -> str:
+    """
+    Environments created from the pool keep the name of the prepared k3d cluster.
+    """
+    record = get_env_registry().get(identifier)
+    return record.cluster if record is not None else identifier
+
+
 def delete_env_setup(identifier: str) -> bool:
     print(f"Removing environment setup ({identifier})")
     try:
-        env_file_path = get_environments_dir_path().joinpath(f"{identifier}.yaml")
-        os.remove(env_file_path)
+        if not get_env_registry().delete(identifier):
+            print(f"[red]No environment setup stored ({identifier})[/red]")
+            return False
         print(f"Removed environment setup ({identifier})")
         return True
-    except (OSError, FileNotFoundError) as e:
+    except sqlite3.Error as e:
         print(e)
         print(f"[red]Failed to remove environment setup ({identifier})[/red]")
         return False
 
 
 def env_check_and_update_deps(choices: dict):
-    # update choices using dependencies
-    print(f"Making sure infrastructure dependencies are selected...")
-    update_infra_choices_with_deps(choices)
-    print(f"Making sure service dependencies are selected...")
-    update_service_choices_with_deps(choices)
+    # update choices using the transitive dependencies
+    print(f"Making sure all dependencies are selected...")
+    registry = get_component_registry()
+    choices.update(
+        registry.to_choices(
+            registry.resolve(choices[KEY_CHOICES_INFRA] + choices[KEY_CHOICES_SERVICES])
+        )
+    )
@@ -0,0 +1,139 @@
+import json
+
+from rich import print
+
+from pulse8_core_cli.environment.constants import COMPONENT_IMAGES, FLUX_NAMESPACE
+from pulse8_core_cli.environment.manifests import get_kustomization_name
+from pulse8_core_cli.environment.readiness import get_inventory_workloads
+from pulse8_core_cli.environment.status import StatusCache
+from pulse8_core_cli.shared.module import get_images_file_path
+from pulse8_core_cli.shared.profiling import profiled
+from pulse8_core_cli.shared.runner import run_command, run_commands
+
+# labels helm-controller puts on everything installed by a HelmRelease
+HELM_RELEASE_NAME_LABEL = "helm.toolkit.fluxcd.io/name"
+HELM_RELEASE_NAMESPACE_LABEL = "helm.toolkit.fluxcd.io/namespace"
+PULL_CONCURRENCY = 4
+
+
+def get_workload_images(workload: dict) -> set[str]:
+    pod_spec = workload.get("spec", {}).get("template", {}).get("spec", {})
+    return {
+        container["image"]
+        for container in [
+            *pod_spec.get("initContainers", []),
+            *pod_spec.get("containers", []),
+        ]
+        if container.get("image")
+    }
+
+
+def get_helm_release_workloads(
+    cache: StatusCache, namespace: str, name: str
+) -> list[dict]:
+    return [
+        workload
+        for kind in ("Deployment", "StatefulSet")
+        for workload in cache.objects[kind].values()
+        if workload["metadata"].get("labels", {}).get(HELM_RELEASE_NAME_LABEL) == name
+        and workload["metadata"]["labels"].get(HELM_RELEASE_NAMESPACE_LABEL)
+        == namespace
+    ]
+
+
+def get_component_images(cache: StatusCache, component_key: str) -> set[str]:
+    """
+    Images of the workloads a component runs - applied by its Kustomization
+    directly or by the HelmReleases it applied.
+    """
+    kustomization = cache.get(
+        "Kustomization", FLUX_NAMESPACE, get_kustomization_name(component_key)
+    )
+    if kustomization is None:
+        return set()
+    images = set()
+    for kind, namespace, name in get_inventory_workloads(kustomization):
+        if kind == "HelmRelease":
+            workloads = get_helm_release_workloads(cache, namespace, name)
+        else:
+            workload = cache.get(kind, namespace, name)
+            workloads = [workload] if workload is not None else []
+        for workload in workloads:
+            images |= get_workload_images(workload)
+    return images
+
+
+def read_images() -> dict[str, list[str]]:
+    path = get_images_file_path()
+    if not path.exists():
+        return dict()
+    with open(path, "r") as images_file:
+        return json.load(images_file)
+
+
+def record_images(cache: StatusCache, component_keys: list[str]) -> None:
+    """
+    Remember the images of the components for preloading them into the next
+    environments.
+    """
+    images = read_images()
+    for component_key in component_keys:
+        component_images = get_component_images(cache, component_key)
+        if component_images:
+            images[component_key] = sorted(component_images)
+    with open(get_images_file_path(), "w") as images_file:
+        json.dump(images, images_file, indent=2)
+
+
+def get_known_images(component_keys: list[str]) -> list[str]:
+    """
+    The images of the components: the static list of the infra components
+    and the images recorded from earlier environments.
+    """
+    recorded = read_images()
+    return sorted(
+        {
+            image
+            for key in component_keys
+            for image in [*COMPONENT_IMAGES.get(key, []), *recorded.get(key, [])]
+        }
+    )
+
+
+@profiled()
+def preload_images(cluster: str, component_keys: list[str]) -> None:
+    """
+    Load the known images of the components into the nodes of the cluster,
+    so pods start without pulling. Images already on the host are reused, the
+    others are pulled in parallel first. Failures only cost the preloading.
+    """
+    images = get_known_images(component_keys)
+    if not images:
+        return
+    print(f"preloading {len(images)} images into environment cluster {cluster}...")
+    inspect_results = run_commands(
+        [
+            ("docker", "image", "inspect", "--format", "{{.Id}}", image)
+            for image in images
+        ],
+        concurrency=PULL_CONCURRENCY,
+    )
+    missing = [image for image, r in zip(images, inspect_results) if not r.ok]
+    pull_results = run_commands(
+        [("docker", "pull", "--quiet", image) for image in missing],
+        concurrency=PULL_CONCURRENCY,
+    )
+    failed = {image for image, r in zip(missing, pull_results) if not r.ok}
+    if failed:
+        print(f"[yellow]failed to pull {', '.join(sorted(failed))}[/yellow]")
+    available = [image for image in images if image not in failed]
+    if not available:
+        return
+    result = run_command(("k3d", "image", "import", "--cluster", cluster, *available))
+    if not result.ok:
+        print(f"[yellow]failed to preload images into cluster {cluster}[/yellow]")
+        print(result.stderr)
+        return
+    print(
+        f"[green]preloaded {len(available)} images ({len(images) - len(missing)} from the host cache)[/green]"
+    )
@@ -0,0 +1,287 @@
+import base64
+import hashlib
+import json
+from pathlib import Path
+
+from rich import print
+
+from pulse8_core_cli.environment.components import get_component_registry
+from pulse8_core_cli.environment.constants import (
+    KEY_CHOICES_INFRA,
+    SERVICES,
+    FLUX_NAMESPACE,
+    KUBERNETES_FIELD_MANAGER,
+    PROFILE_FULL,
+)
+from pulse8_core_cli.environment.profiles import render_profile_patches
+from pulse8_core_cli.shared.kube_client import KubernetesApiError, get_kube_client
+
+API_VERSION_GIT_REPOSITORY = "source.toolkit.fluxcd.io/v1"
+API_VERSION_HELM_REPOSITORY = "source.toolkit.fluxcd.io/v1"
+API_VERSION_KUSTOMIZATION = "kustomize.toolkit.fluxcd.io/v1"
+
+GITHUB_TOKEN_SECRET_NAME = "github-token"
+# hash of the rendered platform manifests, kept on the GitHub token secret
+PLATFORM_HASH_ANNOTATION = "pulse8.synpulse.com/platform-hash"
+INGRESS_NGINX_KUSTOMIZATION_NAME = "pulse8-core-env-ingress-nginx"
+INGRESS_NGINX_REPOSITORY = (
+    "https://github.com/synpulse-group/pulse8-core-env-ingress-nginx.git"
+)
+TLS_SECRET_NAME = "pulse8-localhost"
+
+
+def get_kustomization_name(component_key: str) -> str:
+    component = get_component_registry().get(component_key)
+    return component.kustomization_name if component is not None else component_key
+
+
+def get_source_name(component_key: str) -> str:
+    return f"{get_kustomization_name(component_key)}-repo"
+
+
+def render_secret(
+    name: str,
+    namespace: str,
+    string_data: dict[str, str] | None = None,
+    data: dict[str, str] | None = None,
+    secret_type: str = "Opaque",
+) -> dict:
+    secret = {
+        "apiVersion": "v1",
+        "kind": "Secret",
+        "metadata": {"name": name, "namespace": namespace},
+        "type": secret_type,
+    }
+    if string_data is not None:
+        secret["stringData"] = string_data
+    if data is not None:
+        secret["data"] = data
+    return secret
+
+
+def render_git_repository(
+    name: str,
+    url: str,
+    branch: str | None = None,
+    ref_name: str | None = None,
+    interval: str = "1m",
+) -> dict:
+    ref = dict()
+    if branch is not None:
+        ref["branch"] = branch
+    if ref_name is not None:
+        ref["name"] = ref_name
+    return {
+        "apiVersion": API_VERSION_GIT_REPOSITORY,
+        "kind": "GitRepository",
+        "metadata": {"name": name, "namespace": FLUX_NAMESPACE},
+        "spec": {
+            "interval": interval,
+            "url": url,
+            "ref": ref,
+            "secretRef": {"name": GITHUB_TOKEN_SECRET_NAME},
+        },
+    }
+
+
+def render_kustomization(
+    name: str,
+    source_name: str,
+    target_namespace: str = "default",
+    path: str = "./",
+    depends_on: list[str] | None = None,
+    wait: bool = False,
+    timeout: str | None = None,
+    patches: list[dict] | None = None,
+) -> dict:
+    spec = {
+        "interval": "1m",
+        "path": path,
+        "prune": True,
+        "sourceRef": {"kind": "GitRepository", "name": source_name},
+        "targetNamespace": target_namespace,
+        "wait": wait,
+    }
+    if timeout is not None:
+        spec["timeout"] = timeout
+    if depends_on:
+        spec["dependsOn"] = [{"name": dependency} for dependency in depends_on]
+    if patches:
+        spec["patches"] = patches
+    return {
+        "apiVersion": API_VERSION_KUSTOMIZATION,
+        "kind": "Kustomization",
+        "metadata": {"name": name, "namespace": FLUX_NAMESPACE},
+        "spec": spec,
+    }
+
+
+def render_component_manifests(
+    component_key: str,
+    depends_on: list[str],
+    services=SERVICES,
+    profile: str = PROFILE_FULL,
+) -> list[dict]:
+    depends_on_names = [get_kustomization_name(dep) for dep in depends_on]
+    patches = render_profile_patches(component_key, profile)
+    component = get_component_registry().get(component_key)
+    if component is not None and component.kind == KEY_CHOICES_INFRA:
+        return [
+            render_git_repository(
+                component.source_name,
+                component.repository,
+                branch=component.branch,
+            ),
+            render_kustomization(
+                get_kustomization_name(component_key),
+                get_source_name(component_key),
+                depends_on=depends_on_names,
+                patches=patches,
+            ),
+        ]
+    if component_key not in services:
+        print(
+            f"[bold red]unknown component {component_key} - it is neither infra nor a service of the environment[/bold red]"
+        )
+        exit(1)
+    service = services[component_key]
+    return [
+        render_git_repository(
+            get_source_name(component_key),
+            service["repository"],
+            branch=service["branch"],
+            ref_name=service["ref-name"],
+        ),
+        render_kustomization(
+            get_kustomization_name(component_key),
+            get_source_name(component_key),
+            path="k8s",
+            depends_on=depends_on_names,
+            timeout="30s",
+            patches=patches,
+        ),
+    ]
+
+
+def render_docker_config_secret(name: str, namespace: str, registry: str, auth: str):
+    docker_config = {"auths": {registry: {"auth": auth}}}
+    return render_secret(
+        name,
+        namespace,
+        string_data={".dockerconfigjson": json.dumps(docker_config)},
+        secret_type="kubernetes.io/dockerconfigjson",
+    )
+
+
+def render_pull_secrets(ghcr_token: str, jfrog_token: str) -> list[dict]:
+    """
+    Render the image pull secrets of ghcr.io and synpulse.jfrog.io. The jfrog
+    secret is also needed by flux to pull the helm charts.
+    """
+    ghcr_auth = base64.b64encode(bytes(ghcr_token, "ascii")).decode("utf8")
+    return [
+        render_docker_config_secret(
+            "synpulse-ghcr-docker-credential", "default", "ghcr.io", ghcr_auth
+        ),
+        render_docker_config_secret(
+            "synpulse-jfrog-docker-credential",
+            "default",
+            "synpulse.jfrog.io",
+            jfrog_token,
+        ),
+        render_docker_config_secret(
+            "synpulse-jfrog-docker-credential",
+            FLUX_NAMESPACE,
+            "synpulse.jfrog.io",
+            jfrog_token,
+        ),
+    ]
+
+
+def render_platform_manifests(
+    github_user: str, github_token: str, certificates_dir: Path
+) -> list[dict]:
+    """
+    Render everything shared by all components: GitHub token, default tls
+    certificates, ingress-nginx and the Pulse8 helm charts repository. The
+    GitHub token secret is annotated with the hash of all of them.
+    """
+    with open(certificates_dir.joinpath("cert.pem"), "rb") as cert_file:
+        tls_cert = base64.b64encode(cert_file.read()).decode("utf8")
+    with open(certificates_dir.joinpath("key.pem"), "rb") as key_file:
+        tls_key = base64.b64encode(key_file.read()).decode("utf8")
+    manifests = [
+        render_secret(
+            GITHUB_TOKEN_SECRET_NAME,
+            FLUX_NAMESPACE,
+            string_data={"username": github_user, "password": github_token},
+        ),
+        render_secret(
+            TLS_SECRET_NAME,
+            "kube-system",
+            data={"tls.crt": tls_cert, "tls.key": tls_key},
+            secret_type="kubernetes.io/tls",
+        ),
+        render_secret(
+            TLS_SECRET_NAME,
+            "default",
+            data={"tls.crt": tls_cert, "tls.key": tls_key},
+            secret_type="kubernetes.io/tls",
+        ),
+        {
+            "apiVersion": API_VERSION_HELM_REPOSITORY,
+            "kind": "HelmRepository",
+            "metadata": {"name": "pulse8-helm-charts-oci", "namespace": FLUX_NAMESPACE},
+            "spec": {
+                "type": "oci",
+                "interval": "15m",
+                "url": "oci://synpulse.jfrog.io/pulse8-helm-charts",
+                "secretRef": {"name": "synpulse-jfrog-docker-credential"},
+            },
+        },
+        render_git_repository(
+            f"{INGRESS_NGINX_KUSTOMIZATION_NAME}-repo",
+            INGRESS_NGINX_REPOSITORY,
+            branch="main",
+        ),
+        render_kustomization(
+            INGRESS_NGINX_KUSTOMIZATION_NAME,
+            f"{INGRESS_NGINX_KUSTOMIZATION_NAME}-repo",
+            target_namespace="kube-system",
+        ),
+    ]
+    platform_hash = hashlib.sha256(
+        json.dumps(manifests, sort_keys=True).encode("utf8")
+    ).hexdigest()
+    manifests[0]["metadata"]["annotations"] = {PLATFORM_HASH_ANNOTATION: platform_hash}
+    return manifests
+
+
+def apply_manifests(manifests: list[dict], message_success: str = "") -> None:
+    """
+    Server-side apply all manifests over a single api server connection.
+    """
+    if not manifests:
+        return
+    try:
+        get_kube_client().apply(manifests, field_manager=KUBERNETES_FIELD_MANAGER)
+    except (KubernetesApiError, OSError) as e:
+        print(f"[bold red]failed to apply manifests: {e}[/bold red]")
+        exit(1)
+    if message_success:
+        print(f"[green]{message_success}[/green]")
+
+
+def delete_manifests(manifests: list[dict], message_success: str = "") -> None:
+    """
+    Delete all manifests, dependents first.
+    """
+    if not manifests:
+        return
+    try:
+        get_kube_client().delete(list(reversed(manifests)))
+    except (KubernetesApiError, OSError) as e:
+        print(f"[bold red]failed to delete manifests: {e}[/bold red]")
+        exit(1)
+    if message_success:
+        print(f"[green]{message_success}[/green]")
@@ -1,18 +1,34 @@
-from typing import Annotated
+from typing import Annotated, List
 
 import typer
 from rich import print
 
+from pulse8_core_cli.environment.constants import DEFAULT_PROFILE
 from pulse8_core_cli.environment.functions import (
     env_create,
     env_list,
+    env_history,
+    env_graph,
     env_switch,
+    env_status,
     env_delete,
     env_update,
     env_precheck,
+    env_pool_fill,
+    env_pool_list,
+    env_pool_drain,
+    env_snapshot,
+    env_restore,
 )
 
 app = typer.Typer()
+pool_app = typer.Typer()
+app.add_typer(
+    pool_app,
+    name="pool",
+    help="Manage prepared clusters for instant environment creation",
+    no_args_is_help=True,
+)
 
 
 @app.command()
@@ -26,21 +42,119 @@ def create(
     from_file: Annotated[
         str, typer.Option(help="Create from existing environment config file.")
     ] = None,
+    wait: Annotated[
+        bool, typer.Option(help="Wait until all components are ready.")
+    ] = False,
+    timeout: Annotated[
+        str, typer.Option(help="Timeout per component when waiting (e.g. 15m).")
+    ] = None,
+    component_timeout: Annotated[
+        List[str],
+        typer.Option(help="Timeout of a single component, e.g. kafka=30m."),
+    ] = None,
+    use_pool: Annotated[
+        bool, typer.Option(help="Use a prepared cluster from the pool if available.")
+    ] = True,
+    registry_cache: Annotated[
+        bool,
+        typer.Option(
+            help="Pull images through the local registry caches shared by all environments."
+        ),
+    ] = True,
+    profile: Annotated[
+        str,
+        typer.Option(
+            help="Resources of the components: lite, standard or full (upstream defaults)."
+        ),
+    ] = DEFAULT_PROFILE,
+    preload_images: Annotated[
+        bool,
+        typer.Option(
+            help="Load the images known from earlier environments into the cluster nodes."
+        ),
+    ] = True,
+    concurrency: Annotated[
+        int,
+        typer.Option(
+            help="Apply and await at most this many components at once (implies --wait)."
+        ),
+    ] = None,
 ):
     """
     Creates a new environment
     """
     env_precheck()
-    env_create(identifier=identifier, from_env=from_env, from_file=from_file)
+    env_create(
+        identifier=identifier,
+        from_env=from_env,
+        from_file=from_file,
+        wait=wait,
+        timeout=timeout,
+        component_timeouts=component_timeout,
+        use_pool=use_pool,
+        registry_cache=registry_cache,
+        profile=profile,
+        preload=preload_images,
+        concurrency=concurrency,
+    )
 
 
 @app.command()
-def list():
+def list(
+    component: Annotated[
+        str, typer.Option(help="Only environments with this component, e.g. kafka.")
+    ] = None,
+    recent: Annotated[
+        int, typer.Option(help="Only the given number of most recently used.")
+    ] = None,
+):
     """
     List all environments
     """
-    env_precheck()
-    env_list()
+    env_list(component=component, limit=recent)
+
+
+@app.command()
+def history(
+    identifier: Annotated[
+        str, typer.Argument(help="The identifier of the environment.")
+    ],
+):
+    """
+    Show the changes of an environment over time
+    """
+    env_history(identifier=identifier)
+
+
+@app.command()
+def graph(
+    component: Annotated[
+        List[str],
+        typer.Option(help="Only this component and its dependencies, e.g. kafka."),
+    ] = None,
+):
+    """
+    Show the components with their resolved dependencies
+    """
+    env_graph(component_keys=component)
+
+
+@app.command()
+def status(
+    identifier: Annotated[
+        str,
+        typer.Argument(
+            help="The identifier of the environment, the current by default."
+        ),
+    ] = None,
+    watch: Annotated[
+        bool, typer.Option(help="Keep the status up to date until interrupted.")
+    ] = False,
+):
+    """
+    Show the state of all components of an environment
+    """
+    env_status(identifier=identifier, watch=watch)
 
 
 @app.command()
@@ -53,12 +167,46 @@ def switch(identifier: str):
 
 
 @app.command()
-def update():
+def update(
+    wait: Annotated[
+        bool, typer.Option(help="Wait until all components are ready.")
+    ] = False,
+    timeout: Annotated[
+        str, typer.Option(help="Timeout per component when waiting (e.g. 15m).")
+    ] = None,
+    component_timeout: Annotated[
+        List[str],
+        typer.Option(help="Timeout of a single component, e.g. kafka=30m."),
+    ] = None,
+    plan: Annotated[
+        bool,
+        typer.Option(help="Only print which components would change, apply nothing."),
+    ] = False,
+    profile: Annotated[
+        str,
+        typer.Option(
+            help="Change the resources of the components: lite, standard or full."
+        ),
+    ] = None,
+    concurrency: Annotated[
+        int,
+        typer.Option(
+            help="Apply and await at most this many components at once (implies --wait)."
+        ),
+    ] = None,
+):
     """
     Update settings of current environment
     """
     env_precheck()
-    env_update()
+    env_update(
+        wait=wait,
+        timeout=timeout,
+        component_timeouts=component_timeout,
+        plan_only=plan,
+        profile=profile,
+        concurrency=concurrency,
+    )
 
 
 @app.command()
@@ -68,3 +216,69 @@ def delete(identifier: str):
     """
     env_precheck()
     env_delete(identifier=identifier)
+
+
+@app.command()
+def snapshot(
+    identifier: Annotated[
+        str, typer.Argument(help="The identifier of the environment.")
+    ],
+    name: Annotated[str, typer.Argument(help="The name of the snapshot.")],
+):
+    """
+    Save the datastore, persistent volumes and setup of an environment
+    """
+    env_precheck()
+    env_snapshot(identifier=identifier, name=name)
+
+
+@app.command()
+def restore(
+    identifier: Annotated[
+        str, typer.Argument(help="The identifier of the environment.")
+    ],
+    name: Annotated[str, typer.Argument(help="The name of the snapshot.")],
+):
+    """
+    Reset an environment to a previously taken snapshot
+    """
+    env_precheck()
+    env_restore(identifier=identifier, name=name)
+
+
+@pool_app.command()
+def fill(
+    size: Annotated[
+        int, typer.Option(help="Number of prepared clusters to keep in the pool.")
+    ] = 1,
+    background: Annotated[
+        bool, typer.Option(help="Prepare the clusters in a background process.")
+    ] = False,
+    registry_cache: Annotated[
+        bool,
+        typer.Option(
+            help="Pull images through the local registry caches shared by all environments."
+        ),
+    ] = True,
+):
+    """
+    Prepare stopped, fully bootstrapped clusters for new environments
+    """
+    env_precheck()
+    env_pool_fill(size=size, background=background, registry_cache=registry_cache)
+
+
+@pool_app.command(name="list")
+def pool_list():
+    """
+    List prepared clusters
+    """
+    env_pool_list()
+
+
+@pool_app.command()
+def drain():
+    """
+    Delete all prepared clusters
+    """
+    env_pool_drain()
@@ -0,0 +1,191 @@
+from dataclasses import dataclass
+
+from rich import print
+from rich.table import Table
+
+from pulse8_core_cli.environment.constants import (
+    FLUX_NAMESPACE,
+    KEY_CHOICES_INFRA,
+    KEY_CHOICES_SERVICES,
+)
+from pulse8_core_cli.environment.components import get_component_registry
+from pulse8_core_cli.environment.manifests import (
+    GITHUB_TOKEN_SECRET_NAME,
+    PLATFORM_HASH_ANNOTATION,
+    render_component_manifests,
+)
+from pulse8_core_cli.environment.profiles import get_setup_profile
+from pulse8_core_cli.shared.kube_client import KubernetesApiError, get_kube_client
+
+ACTION_ADD = "add"
+ACTION_REMOVE = "remove"
+ACTION_RECONFIGURE = "reconfigure"
+ACTION_UNCHANGED = "unchanged"
+ACTION_STYLES = {
+    ACTION_ADD: "green",
+    ACTION_REMOVE: "red",
+    ACTION_RECONFIGURE: "yellow",
+    ACTION_UNCHANGED: "dim",
+}
+# GitHub token, tls certificates, ingress-nginx and helm repository
+PLATFORM = "platform"
+
+
+@dataclass(frozen=True)
+class PlannedAction:
+    component: str
+    action: str
+    # manifests to apply (add / reconfigure) or to delete (remove)
+    manifests: tuple[dict, ...] = ()
+
+
+@dataclass(frozen=True)
+class Plan:
+    actions: tuple[PlannedAction, ...]
+
+    def get_components(self, *actions: str) -> list[str]:
+        return [a.component for a in self.actions if a.action in actions]
+
+    @property
+    def changed(self) -> bool:
+        return any(a.action != ACTION_UNCHANGED for a in self.actions)
+
+    @property
+    def manifests_to_apply(self) -> list[dict]:
+        return [
+            manifest
+            for a in self.actions
+            if a.action in (ACTION_ADD, ACTION_RECONFIGURE)
+            for manifest in a.manifests
+        ]
+
+    @property
+    def manifests_to_apply_by_component(self) -> dict[str, list[dict]]:
+        return {
+            a.component: list(a.manifests)
+            for a in self.actions
+            if a.action in (ACTION_ADD, ACTION_RECONFIGURE)
+        }
+
+    @property
+    def manifests_to_delete(self) -> list[dict]:
+        return [
+            manifest
+            for a in self.actions
+            if a.action == ACTION_REMOVE
+            for manifest in a.manifests
+        ]
+
+
+def get_setup_choices(setup: dict | None) -> dict:
+    """
+    The choices a stored environment setup was created with.
+    """
+    if setup is None:
+        return {KEY_CHOICES_INFRA: [], KEY_CHOICES_SERVICES: []}
+    return {
+        KEY_CHOICES_INFRA: list(setup.get(KEY_CHOICES_INFRA) or []),
+        KEY_CHOICES_SERVICES: [
+            key
+            for key, service in (setup.get(KEY_CHOICES_SERVICES) or {}).items()
+            if not service.get("suspend")
+        ],
+    }
+
+
+def render_manifests_by_component(
+    choices: dict, services: dict, profile: str
+) -> dict[str, list]:
+    """
+    Manifests of every selected component, in install order.
+    """
+    registry = get_component_registry()
+    keys = choices.get(KEY_CHOICES_INFRA, []) + choices.get(KEY_CHOICES_SERVICES, [])
+    graph = registry.get_graph(keys)
+    return {
+        component_key: render_component_manifests(
+            component_key, graph[component_key], services, profile
+        )
+        for wave in registry.get_waves(keys)
+        for component_key in wave
+    }
+
+
+def is_platform_installed(platform_manifests: list[dict]) -> bool:
+    """
+    The platform manifests are unchanged as long as the GitHub token secret
+    carries the hash of the rendered ones - new credentials or certificates
+    change it.
+    """
+    try:
+        secret = get_kube_client().get(
+            "v1", "Secret", GITHUB_TOKEN_SECRET_NAME, namespace=FLUX_NAMESPACE
+        )
+    except (KubernetesApiError, OSError):
+        return False
+    if secret is None:
+        return False
+    annotations = secret["metadata"].get("annotations") or {}
+    return (
+        annotations.get(PLATFORM_HASH_ANNOTATION)
+        == platform_manifests[0]["metadata"]["annotations"][PLATFORM_HASH_ANNOTATION]
+    )
+
+
+def create_plan(
+    setup_old: dict | None,
+    choices: dict,
+    services: dict,
+    profile: str,
+    platform_manifests: list[dict],
+    platform_installed: bool,
+) -> Plan:
+    """
+    Compare the stored setup with the new choices. Components whose rendered
+    manifests differ (e.g. other ref, dependencies or profile) are reconfigured.
+    """
+    manifests_old = render_manifests_by_component(
+        get_setup_choices(setup_old),
+        (setup_old or {}).get(KEY_CHOICES_SERVICES) or services,
+        get_setup_profile(setup_old),
+    )
+    manifests_new = render_manifests_by_component(choices, services, profile)
+    actions = [
+        PlannedAction(
+            PLATFORM,
+            ACTION_UNCHANGED if platform_installed else ACTION_RECONFIGURE,
+            tuple(platform_manifests),
+        )
+    ]
+    for component_key, manifests in manifests_new.items():
+        if component_key not in manifests_old:
+            action = ACTION_ADD
+        elif manifests_old[component_key] != manifests:
+            action = ACTION_RECONFIGURE
+        else:
+            action = ACTION_UNCHANGED
+        actions.append(PlannedAction(component_key, action, tuple(manifests)))
+    for component_key, manifests in manifests_old.items():
+        if component_key not in manifests_new:
+            actions.append(
+                PlannedAction(component_key, ACTION_REMOVE, tuple(manifests))
+            )
+    return Plan(tuple(actions))
+
+
+def print_plan(plan: Plan) -> None:
+    table = Table(title="Environment plan")
+    table.add_column("Component")
+    table.add_column("Action")
+    for a in plan.actions:
+        style = ACTION_STYLES[a.action]
+        table.add_row(a.component, f"[{style}]{a.action}[/{style}]")
+    print(table)
+    counts = {
+        action: len(plan.get_components(action))
+        for action in (ACTION_ADD, ACTION_RECONFIGURE, ACTION_REMOVE)
+    }
+    print(
+        f"{counts[ACTION_ADD]} to add, {counts[ACTION_RECONFIGURE]} to reconfigure, "
+        f"{counts[ACTION_REMOVE]} to remove"
+    )
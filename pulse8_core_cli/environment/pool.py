@@ -0,0 +1,73 @@
+import json
+import os
+from pathlib import Path
+from uuid import uuid4
+
+from pulse8_core_cli.shared.module import get_pool_dir_path
+from pulse8_core_cli.shared.runner import run_command
+
+POOL_CLUSTER_PREFIX = "p8pool-"
+POOL_MARKER_READY = ".ready"
+POOL_MARKER_CLAIMED = ".claimed"
+
+
+def new_pool_cluster_name() -> str:
+    return f"{POOL_CLUSTER_PREFIX}{uuid4().hex[:8]}"
+
+
+def list_k3d_clusters() -> list[dict]:
+    result = run_command(("k3d", "cluster", "list", "-o", "json"))
+    if not result.ok:
+        return []
+    return json.loads(result.stdout or "[]")
+
+
+def list_pool_clusters() -> list[str]:
+    return sorted(
+        cluster["name"]
+        for cluster in list_k3d_clusters()
+        if cluster["name"].startswith(POOL_CLUSTER_PREFIX)
+    )
+
+
+def get_pool_kubeconfig_path(cluster_name: str) -> Path:
+    return get_pool_dir_path().joinpath(f"{cluster_name}.kubeconfig")
+
+
+def get_pool_marker_path(cluster_name: str, marker: str) -> Path:
+    return get_pool_dir_path().joinpath(f"{cluster_name}{marker}")
+
+
+def is_pool_cluster_ready(cluster_name: str) -> bool:
+    return get_pool_marker_path(cluster_name, POOL_MARKER_READY).exists()
+
+
+def mark_pool_cluster_ready(cluster_name: str) -> None:
+    get_pool_marker_path(cluster_name, POOL_MARKER_READY).touch()
+
+
+def take_ready_pool_cluster() -> str | None:
+    """
+    Claim a bootstrapped pool cluster. The ready marker is renamed atomically,
+    so concurrent CLI invocations never claim the same cluster.
+    """
+    clusters = list_pool_clusters()
+    for cluster_name in clusters:
+        try:
+            os.rename(
+                get_pool_marker_path(cluster_name, POOL_MARKER_READY),
+                get_pool_marker_path(cluster_name, POOL_MARKER_CLAIMED),
+            )
+        except FileNotFoundError:
+            continue
+        return cluster_name
+    return None
+
+
+def forget_pool_cluster(cluster_name: str) -> None:
+    for path in (
+        get_pool_kubeconfig_path(cluster_name),
+        get_pool_marker_path(cluster_name, POOL_MARKER_READY),
+        get_pool_marker_path(cluster_name, POOL_MARKER_CLAIMED),
+    ):
+        path.unlink(missing_ok=True)
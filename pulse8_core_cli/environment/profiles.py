@@ -0,0 +1,177 @@
+import json
+from dataclasses import dataclass
+
+from rich import print
+
+from pulse8_core_cli.environment.constants import (
+    KEY_CHOICES_INFRA_AIRFLOW,
+    KEY_CHOICES_INFRA_CLOUDSERVER,
+    KEY_CHOICES_INFRA_KAFKA,
+    KEY_CHOICES_INFRA_MARIADB,
+    KEY_CHOICES_INFRA_NIFI,
+    KEY_CHOICES_INFRA_PINOT,
+    KEY_CHOICES_INFRA_POSTGRESQL,
+    KEY_CHOICES_INFRA_REDIS,
+    KEY_CHOICES_INFRA_SPARK,
+    KEY_CHOICES_INFRA_SUPERSET,
+    KEY_PROFILE,
+    PROFILE_FULL,
+    PROFILE_LITE,
+    PROFILE_STANDARD,
+    PROFILES,
+)
+
+# Confluent for Kubernetes resources of the kafka component
+CONFLUENT_API_VERSION = "platform.confluent.io/v1beta1"
+CONFLUENT_KINDS = ["Kafka", "Zookeeper", "KRaftController", "SchemaRegistry", "Connect"]
+WORKLOAD_KINDS = ["Deployment", "StatefulSet"]
+
+
+@dataclass(frozen=True, slots=True)
+class ResourceSettings:
+    replicas: int
+    cpu_request: str
+    memory_request: str
+    memory_limit: str
+    # explicit heap of Confluent resources - other JVMs size their heap from
+    # the memory limit
+    jvm_heap: str | None = None
+
+
+# components not listed keep their upstream defaults in every profile, e.g.
+# the JVM based services and keycloak which need more than a generic limit
+PROFILE_SETTINGS: dict[str, dict[str, ResourceSettings]] = {
+    PROFILE_LITE: {
+        KEY_CHOICES_INFRA_POSTGRESQL: ResourceSettings(1, "25m", "128Mi", "512Mi"),
+        KEY_CHOICES_INFRA_REDIS: ResourceSettings(1, "25m", "64Mi", "256Mi"),
+        KEY_CHOICES_INFRA_MARIADB: ResourceSettings(1, "25m", "128Mi", "512Mi"),
+        KEY_CHOICES_INFRA_CLOUDSERVER: ResourceSettings(1, "25m", "128Mi", "512Mi"),
+        KEY_CHOICES_INFRA_SUPERSET: ResourceSettings(1, "25m", "256Mi", "768Mi"),
+        KEY_CHOICES_INFRA_KAFKA: ResourceSettings(1, "100m", "768Mi", "1Gi", "512m"),
+        KEY_CHOICES_INFRA_PINOT: ResourceSettings(1, "50m", "512Mi", "1Gi"),
+        KEY_CHOICES_INFRA_SPARK: ResourceSettings(1, "50m", "512Mi", "1Gi"),
+        KEY_CHOICES_INFRA_NIFI: ResourceSettings(1, "50m", "768Mi", "1536Mi"),
+        KEY_CHOICES_INFRA_AIRFLOW: ResourceSettings(1, "50m", "256Mi", "768Mi"),
+    },
+    PROFILE_STANDARD: {
+        KEY_CHOICES_INFRA_POSTGRESQL: ResourceSettings(1, "100m", "256Mi", "1Gi"),
+        KEY_CHOICES_INFRA_REDIS: ResourceSettings(1, "50m", "128Mi", "512Mi"),
+        KEY_CHOICES_INFRA_MARIADB: ResourceSettings(1, "100m", "256Mi", "1Gi"),
+        KEY_CHOICES_INFRA_CLOUDSERVER: ResourceSettings(1, "100m", "256Mi", "1Gi"),
+        KEY_CHOICES_INFRA_SUPERSET: ResourceSettings(1, "100m", "512Mi", "1536Mi"),
+        KEY_CHOICES_INFRA_KAFKA: ResourceSettings(1, "250m", "1536Mi", "2Gi", "1g"),
+        KEY_CHOICES_INFRA_PINOT: ResourceSettings(1, "250m", "1Gi", "2Gi"),
+        KEY_CHOICES_INFRA_SPARK: ResourceSettings(1, "250m", "1Gi", "2Gi"),
+        KEY_CHOICES_INFRA_NIFI: ResourceSettings(1, "250m", "1536Mi", "2Gi"),
+        KEY_CHOICES_INFRA_AIRFLOW: ResourceSettings(1, "100m", "512Mi", "1536Mi"),
+    },
+    # upstream defaults
+    PROFILE_FULL: {},
+}
+
+
+def validate_profile(profile: str) -> str:
+    if profile not in PROFILES:
+        print(
+            f"[bold red]invalid profile {profile} - use one of {', '.join(PROFILES)}[/bold red]"
+        )
+        exit(1)
+    return profile
+
+
+def get_setup_profile(setup: dict | None) -> str:
+    """
+    The profile of a stored setup - setups of earlier CLI versions used the
+    upstream defaults.
+    """
+    return (setup or {}).get(KEY_PROFILE) or PROFILE_FULL
+
+
+def get_resource_settings(component_key: str, profile: str) -> ResourceSettings | None:
+    return PROFILE_SETTINGS[profile].get(component_key)
+
+
+def render_workload_patches(settings: ResourceSettings) -> list[dict]:
+    """
+    JSON patches of the replicas and the resources of the first container of
+    every deployment and stateful set.
+    """
+    operations = [
+        {"op": "add", "path": "/spec/replicas", "value": settings.replicas},
+        {
+            "op": "add",
+            "path": "/spec/template/spec/containers/0/resources",
+            "value": {
+                "requests": {
+                    "cpu": settings.cpu_request,
+                    "memory": settings.memory_request,
+                },
+                "limits": {"memory": settings.memory_limit},
+            },
+        },
+    ]
+    return [
+        {"patch": json.dumps(operations), "target": {"kind": kind}}
+        for kind in WORKLOAD_KINDS
+    ]
+
+
+def render_confluent_patches(settings: ResourceSettings) -> list[dict]:
+    heap = [f"-Xms{settings.jvm_heap}", f"-Xmx{settings.jvm_heap}"]
+    return [
+        {
+            "patch": json.dumps(
+                {
+                    "apiVersion": CONFLUENT_API_VERSION,
+                    "kind": kind,
+                    "metadata": {"name": "all"},
+                    "spec": {
+                        "replicas": settings.replicas,
+                        "podTemplate": {
+                            "resources": {
+                                "requests": {
+                                    "cpu": settings.cpu_request,
+                                    "memory": settings.memory_request,
+                                },
+                                "limits": {"memory": settings.memory_limit},
+                            }
+                        },
+                        "configOverrides": {"jvm": heap},
+                    },
+                }
+            ),
+            "target": {"kind": kind},
+        }
+        for kind in CONFLUENT_KINDS
+    ]
+
+
+def render_profile_patches(component_key: str, profile: str) -> list[dict]:
+    """
+    Flux Kustomization patches applying the profile to a component. Charts
+    installed by a HelmRelease of the component get the workload patches as
+    an additional post renderer - kustomize creates the list if the release
+    has none. Patches without a matching resource are ignored.
+    """
+    settings = get_resource_settings(component_key, profile)
+    if settings is None:
+        return []
+    workload_patches = render_workload_patches(settings)
+    patches = [
+        *workload_patches,
+        {
+            "patch": json.dumps(
+                [
+                    {
+                        "op": "add",
+                        "path": "/spec/postRenderers/-",
+                        "value": {"kustomize": {"patches": workload_patches}},
+                    }
+                ]
+            ),
+            "target": {"kind": "HelmRelease"},
+        },
+    ]
+    if settings.jvm_heap is not None:
+        patches += render_confluent_patches(settings)
+    return patches
@@ -0,0 +1,413 @@
+import http.client
+import queue
+import re
+import threading
+import time
+
+from rich import print
+from rich.live import Live
+from rich.table import Table
+
+from pulse8_core_cli.environment.constants import (
+    FLUX_NAMESPACE,
+    KEY_CHOICES_INFRA,
+    SERVICES,
+    COMPONENT_READY_TIMEOUTS,
+    DEFAULT_READY_TIMEOUT,
+)
+from pulse8_core_cli.environment.components import get_component_registry
+from pulse8_core_cli.environment.manifests import (
+    apply_manifests,
+    get_kustomization_name,
+)
+from pulse8_core_cli.shared.kube_client import (
+    KubernetesApiError,
+    WatchStream,
+    get_kube_client,
+)
+
+STATE_QUEUED = "queued"
+STATE_PENDING = "pending"
+STATE_RECONCILING = "reconciling"
+STATE_WAITING_WORKLOADS = "waiting for workloads"
+STATE_READY = "ready"
+STATE_TIMED_OUT = "timed out"
+STATE_SKIPPED = "skipped"
+
+STATE_STYLES = {
+    STATE_QUEUED: "dim",
+    STATE_PENDING: "dim",
+    STATE_RECONCILING: "yellow",
+    STATE_WAITING_WORKLOADS: "yellow",
+    STATE_READY: "green",
+    STATE_TIMED_OUT: "bold red",
+    STATE_SKIPPED: "bold red",
+}
+
+# resources watched while waiting - (kind, api versions by preference, namespace or None for all)
+WATCHED_RESOURCES = [
+    ("Kustomization", ("kustomize.toolkit.fluxcd.io/v1",), FLUX_NAMESPACE),
+    (
+        "HelmRelease",
+        ("helm.toolkit.fluxcd.io/v2", "helm.toolkit.fluxcd.io/v2beta2"),
+        None,
+    ),
+    ("Deployment", ("apps/v1",), None),
+    ("StatefulSet", ("apps/v1",), None),
+]
+WORKLOAD_KINDS = {"HelmRelease", "Deployment", "StatefulSet"}
+
+
+def parse_duration(duration: str) -> float:
+    """
+    Parse durations like 90, 90s, 15m or 1h30m into seconds.
+    """
+    duration = duration.strip()
+    if re.fullmatch(r"\d+(\.\d+)?", duration):
+        return float(duration)
+    parts = re.findall(r"(\d+(?:\.\d+)?)([hms])", duration)
+    if not parts or "".join(f"{v}{u}" for v, u in parts) != duration:
+        print(f"[bold red]invalid duration: {duration}[/bold red]")
+        exit(1)
+    factors = {"h": 3600, "m": 60, "s": 1}
+    return sum(float(value) * factors[unit] for value, unit in parts)
+
+
+def format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"{minutes}m{seconds:02d}s" if minutes else f"{seconds}s"
+
+
+def get_component_timeouts(
+    component_keys: list[str],
+    timeout: str | None = None,
+    component_timeouts: list[str] | None = None,
+) -> dict[str, float]:
+    """
+    Resolve the timeout of every component: explicit `key=duration` overrides win
+    over the general timeout, which wins over the defaults from the constants.
+    """
+    overrides = dict()
+    for component_timeout in component_timeouts or []:
+        if "=" not in component_timeout:
+            print(
+                f"[bold red]invalid component timeout {component_timeout} - use <component>=<duration>[/bold red]"
+            )
+            exit(1)
+        key, duration = component_timeout.split("=", 1)
+        overrides[key.strip()] = parse_duration(duration)
+    timeouts = dict()
+    for component_key in component_keys:
+        if component_key in overrides:
+            timeouts[component_key] = overrides[component_key]
+        elif timeout is not None:
+            timeouts[component_key] = parse_duration(timeout)
+        else:
+            timeouts[component_key] = parse_duration(
+                COMPONENT_READY_TIMEOUTS.get(component_key, DEFAULT_READY_TIMEOUT)
+            )
+    return timeouts
+
+
+def get_condition(obj: dict, condition_type: str) -> dict | None:
+    for condition in obj.get("status", {}).get("conditions", []):
+        if condition.get("type") == condition_type:
+            return condition
+    return None
+
+
+def is_workload_ready(kind: str, obj: dict) -> bool:
+    status = obj.get("status", {})
+    if kind == "HelmRelease":
+        condition = get_condition(obj, "Ready")
+        return condition is not None and condition.get("status") == "True"
+    replicas = obj.get("spec", {}).get("replicas", 1)
+    if status.get("observedGeneration", 0) < obj["metadata"].get("generation", 0):
+        return False
+    if kind == "Deployment":
+        return (
+            status.get("updatedReplicas", 0) >= replicas
+            and status.get("availableReplicas", 0) >= replicas
+        )
+    return status.get("readyReplicas", 0) >= replicas
+
+
+def get_inventory_workloads(kustomization: dict) -> set[tuple[str, str, str]]:
+    """
+    Read the workloads applied by a Kustomization from its inventory.
+    Inventory ids have the format <namespace>_<name>_<group>_<kind>.
+    """
+    workloads = set()
+    inventory = kustomization.get("status", {}).get("inventory") or {}
+    for entry in inventory.get("entries", []):
+        namespace, name, _, kind = entry["id"].split("_")
+        if kind in WORKLOAD_KINDS:
+            workloads.add((kind, namespace, name))
+    return workloads
+
+
+class ReadinessWatch:
+    """
+    Watches the given resources through the api client and queues every
+    watch event as (kind, event type, object).
+    """
+
+    def __init__(self, resources=WATCHED_RESOURCES, context_name: str | None = None):
+        self.resources = resources
+        self.context_name = context_name
+        self.events: queue.Queue = queue.Queue()
+        self.stopped = threading.Event()
+        self.streams: list[WatchStream] = []
+        self.threads: list[threading.Thread] = []
+
+    def start(self) -> None:
+        for kind, api_versions, namespace in self.resources:
+            thread = threading.Thread(
+                target=self._watch, args=(kind, api_versions, namespace), daemon=True
+            )
+            thread.start()
+            self.threads.append(thread)
+
+    def stop(self) -> None:
+        self.stopped.set()
+        for stream in self.streams:
+            stream.close()
+
+    def _watch(
+        self, kind: str, api_versions: tuple[str, ...], namespace: str | None
+    ) -> None:
+        """
+        Keep watching until stopped. Reconnects resume from the last seen
+        resource version, or list all objects again once it expired (410 Gone).
+        """
+        client = get_kube_client(self.context_name)
+        attempt = 0
+        resource_version = None
+        while not self.stopped.is_set():
+            api_version = api_versions[attempt % len(api_versions)]
+            try:
+                stream = client.watch(
+                    api_version,
+                    kind,
+                    namespace=namespace,
+                    resource_version=resource_version,
+                )
+            except KubernetesApiError as e:
+                if e.status == 410:
+                    resource_version = None
+                else:
+                    # older flux versions serve another api version
+                    attempt += 1
+                time.sleep(1)
+                continue
+            except (http.client.HTTPException, OSError):
+                time.sleep(1)
+                continue
+            self.streams.append(stream)
+            try:
+                for event_type, obj in stream:
+                    if event_type == "ERROR":
+                        if obj.get("code") == 410:
+                            resource_version = None
+                        break
+                    resource_version = obj["metadata"].get(
+                        "resourceVersion", resource_version
+                    )
+                    if event_type != "BOOKMARK":
+                        self.events.put((kind, event_type, obj))
+            except (http.client.HTTPException, OSError, ValueError):
+                pass
+            finally:
+                stream.close()
+                self.streams.remove(stream)
+            if not self.stopped.is_set():
+                # the api server closes watches after a while - reconnect
+                time.sleep(1)
+
+
+def wait_for_components(
+    component_keys: list[str],
+    timeouts: dict[str, float],
+    services=SERVICES,
+    manifests: dict[str, list[dict]] | None = None,
+    dependencies: dict[str, list[str]] | None = None,
+    concurrency: int | None = None,
+) -> dict[str, float | None]:
+    """
+    Wait until the Kustomization of every component is ready and all HelmReleases,
+    Deployments and StatefulSets it applied are ready.
+    Components with manifests are queued and applied once their dependencies
+    are ready, with at most `concurrency` of them applied but not ready yet.
+    Returns the seconds every component needed to become ready (None if timed out).
+    """
+    manifests = manifests or dict()
+    dependencies = dependencies or dict()
+    start = time.monotonic()
+    kustomizations: dict[str, dict] = dict()
+    workloads: dict[tuple[str, str, str], bool] = dict()
+    states = {
+        component_key: STATE_QUEUED if component_key in manifests else STATE_PENDING
+        for component_key in component_keys
+    }
+    messages = {component_key: "" for component_key in component_keys}
+    durations: dict[str, float | None] = dict()
+    # the timeout of a queued component starts once it is applied
+    started = {
+        component_key: start
+        for component_key in component_keys
+        if component_key not in manifests
+    }
+
+    def get_display_name(component_key: str) -> str:
+        component = get_component_registry().get(component_key)
+        if component is not None and component.kind == KEY_CHOICES_INFRA:
+            return component.name
+        if component_key in services:
+            return services[component_key]["name"]
+        return component_key
+
+    def render_table() -> Table:
+        now = time.monotonic()
+        table = Table(
+            title=(
+                "Installing environment components"
+                if manifests
+                else "Waiting for environment components"
+            )
+        )
+        table.add_column("Component")
+        table.add_column("State")
+        table.add_column("Time", justify="right")
+        table.add_column("Details", overflow="fold")
+        for component_key in component_keys:
+            state = states[component_key]
+            elapsed = durations.get(component_key) or now - start
+            table.add_row(
+                get_display_name(component_key),
+                f"[{STATE_STYLES[state]}]{state}[/{STATE_STYLES[state]}]",
+                format_duration(elapsed),
+                messages[component_key],
+            )
+        return table
+
+    def apply_queued() -> None:
+        in_flight = len([key for key in started if key not in durations])
+        for component_key in component_keys:
+            if states[component_key] != STATE_QUEUED:
+                continue
+            required = [
+                key for key in dependencies.get(component_key, []) if key in states
+            ]
+            failed = [
+                key for key in required if key in durations and durations[key] is None
+            ]
+            if failed:
+                states[component_key] = STATE_SKIPPED
+                messages[component_key] = "dependency not ready: " + ", ".join(failed)
+                durations[component_key] = None
+                continue
+            if any(durations.get(key) is None for key in required):
+                messages[component_key] = "waiting for " + ", ".join(
+                    key for key in required if key not in durations
+                )
+                continue
+            if concurrency is not None and in_flight >= concurrency:
+                messages[component_key] = "waiting for a free slot"
+                continue
+            apply_manifests(manifests[component_key])
+            states[component_key] = STATE_PENDING
+            messages[component_key] = ""
+            started[component_key] = time.monotonic()
+            in_flight += 1
+
+    def update_state(component_key: str) -> None:
+        if states[component_key] in (
+            STATE_QUEUED,
+            STATE_READY,
+            STATE_TIMED_OUT,
+            STATE_SKIPPED,
+        ):
+            return
+        kustomization = kustomizations.get(get_kustomization_name(component_key))
+        if kustomization is None:
+            return
+        condition = get_condition(kustomization, "Ready")
+        if (
+            condition is None
+            or condition.get("status") != "True"
+            or kustomization.get("status", {}).get("observedGeneration", 0)
+            < kustomization["metadata"].get("generation", 0)
+        ):
+            states[component_key] = STATE_RECONCILING
+            messages[component_key] = (condition or {}).get("message", "")
+            return
+        expected = get_inventory_workloads(kustomization)
+        pending = [w for w in expected if not workloads.get(w, False)]
+        if pending:
+            states[component_key] = STATE_WAITING_WORKLOADS
+            messages[component_key] = (
+                f"{len(expected) - len(pending)}/{len(expected)} ready - waiting for "
+                + ", ".join(f"{kind}/{name}" for kind, _, name in sorted(pending))
+            )
+            return
+        states[component_key] = STATE_READY
+        messages[component_key] = ""
+        durations[component_key] = time.monotonic() - start
+
+    watch = ReadinessWatch()
+    watch.start()
+    try:
+        with Live(render_table(), refresh_per_second=2) as live:
+            apply_queued()
+            while len(durations) < len(component_keys):
+                try:
+                    events = [watch.events.get(timeout=0.5)]
+                    while not watch.events.empty():
+                        events.append(watch.events.get_nowait())
+                except queue.Empty:
+                    events = []
+                for kind, event_type, obj in events:
+                    if kind == "Kustomization":
+                        name = obj["metadata"]["name"]
+                        if event_type == "DELETED":
+                            kustomizations.pop(name, None)
+                        else:
+                            kustomizations[name] = obj
+                    else:
+                        workload = (
+                            kind,
+                            obj["metadata"]["namespace"],
+                            obj["metadata"]["name"],
+                        )
+                        workloads[workload] = event_type != "DELETED" and (
+                            is_workload_ready(kind, obj)
+                        )
+                now = time.monotonic()
+                for component_key in component_keys:
+                    update_state(component_key)
+                    if (
+                        component_key in started
+                        and component_key not in durations
+                        and now - started[component_key] > timeouts[component_key]
+                    ):
+                        states[component_key] = STATE_TIMED_OUT
+                        durations[component_key] = None
+                apply_queued()
+                live.update(render_table())
+    finally:
+        watch.stop()
+    return durations
+
+
+def print_readiness_report(durations: dict[str, float | None]) -> None:
+    table = Table(title="Environment readiness")
+    table.add_column("Component")
+    table.add_column("Ready after", justify="right")
+    for component_key, duration in sorted(
+        durations.items(), key=lambda item: (item[1] is None, item[1] or 0)
+    ):
+        if duration is None:
+            table.add_row(component_key, "[bold red]timed out[/bold red]")
+        else:
+            table.add_row(component_key, f"[green]{format_duration(duration)}[/green]")
+    print(table)
@@ -0,0 +1,97 @@
+import base64
+import json
+from pathlib import Path
+
+import yaml
+from rich import print
+
+from pulse8_core_cli.environment.constants import REGISTRY_MIRRORS
+from pulse8_core_cli.shared.constants import ENV_GITHUB_GHCR_TOKEN, ENV_JFROG_TOKEN
+from pulse8_core_cli.shared.module import get_registry_cache_dir_path
+from pulse8_core_cli.shared.profiling import profiled
+from pulse8_core_cli.shared.runner import run_command
+
+
+def get_registry_credentials(registry: str, env_vars: dict) -> tuple[str, str]:
+    if registry == "ghcr.io":
+        credentials = env_vars[ENV_GITHUB_GHCR_TOKEN].strip()
+    else:
+        credentials = base64.b64decode(env_vars[ENV_JFROG_TOKEN]).decode("utf8")
+    username, password = credentials.split(":", 1)
+    return username, password
+
+
+def list_k3d_registries() -> dict[str, dict]:
+    result = run_command(("k3d", "registry", "list", "-o", "json"))
+    if not result.ok:
+        return dict()
+    return {
+        registry["name"]: registry for registry in json.loads(result.stdout or "[]")
+    }
+
+
+def ensure_registry_cache(registry: str, env_vars: dict, existing: dict) -> bool:
+    mirror = REGISTRY_MIRRORS[registry]
+    container_name = f"k3d-{mirror['name']}"
+    if container_name in existing:
+        # registries survive environment deletion but may have been stopped
+        args = ("docker", "start", container_name)
+    else:
+        cache_dir = get_registry_cache_dir_path().joinpath(mirror["name"])
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        username, password = get_registry_credentials(registry, env_vars)
+        args = (
+            "k3d",
+            "registry",
+            "create",
+            mirror["name"],
+            f"--port={mirror['port']}",
+            f"--proxy-remote-url=https://{registry}",
+            f"--proxy-username={username}",
+            f"--proxy-password={password}",
+            f"--volume={cache_dir}:/var/lib/registry",
+        )
+    result = run_command(args)
+    if not result.ok:
+        print(f"[yellow]failed to start registry cache for {registry}[/yellow]")
+        print(result.stderr)
+        return False
+    return True
+
+
+def write_registries_config(registries: list[str]) -> Path:
+    config = {"mirrors": dict()}
+    for registry in registries:
+        mirror = REGISTRY_MIRRORS[registry]
+        config["mirrors"][registry] = {
+            "endpoint": [f"http://k3d-{mirror['name']}:5000"]
+        }
+    config_path = get_registry_cache_dir_path().joinpath("registries.yaml")
+    with open(config_path, "w") as config_file:
+        config_file.write(yaml.dump(config))
+    return config_path
+
+
+@profiled()
+def get_registry_cache_cluster_args(env_vars: dict) -> tuple:
+    """
+    Start (or reuse) a pull-through cache for every mirrored registry and return the
+    k3d cluster create arguments wiring them into the cluster.
+    If a cache cannot be started, images of that registry are pulled directly.
+    """
+    print("starting registry caches...")
+    existing = list_k3d_registries()
+    registries = [
+        registry
+        for registry in REGISTRY_MIRRORS
+        if ensure_registry_cache(registry, env_vars, existing)
+    ]
+    if not registries:
+        return ()
+    args = ()
+    for registry in registries:
+        mirror = REGISTRY_MIRRORS[registry]
+        args += ("--registry-use", f"k3d-{mirror['name']}:{mirror['port']}")
+    args += ("--registry-config", str(write_registries_config(registries)))
+    print(f"[green]registry caches ready ({', '.join(registries)})[/green]")
+    return args
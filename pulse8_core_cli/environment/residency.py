@@ -0,0 +1,192 @@
+import json
+import os
+import re
+from collections import defaultdict
+
+from rich import print
+
+from pulse8_core_cli.environment.env_registry import get_env_registry
+from pulse8_core_cli.shared.constants import ENV_MEMORY_BUDGET
+from pulse8_core_cli.shared.module import get_residency_file_path
+from pulse8_core_cli.shared.profiling import profiled
+from pulse8_core_cli.shared.runner import run_command, run_commands
+
+# memory assumed for a cluster that was never measured
+DEFAULT_CLUSTER_MEMORY = 3 * 1024**3
+# share of the docker host memory used if no budget is configured
+DEFAULT_MEMORY_BUDGET_SHARE = 0.75
+MEMORY_UNITS = {
+    "b": 1,
+    "kb": 1000,
+    "mb": 1000**2,
+    "gb": 1000**3,
+    "kib": 1024,
+    "mib": 1024**2,
+    "gib": 1024**3,
+    "k": 1024,
+    "m": 1024**2,
+    "g": 1024**3,
+}
+
+
+def parse_memory(value: str) -> int:
+    """
+    Parse sizes like 512MiB, 1.5GB or 12g into bytes.
+    """
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([a-zA-Z]*)\s*", value)
+    if match is None or match.group(2).lower() not in MEMORY_UNITS | {"": 1}:
+        raise ValueError(f"invalid memory size: {value}")
+    return int(float(match.group(1)) * MEMORY_UNITS.get(match.group(2).lower(), 1))
+
+
+def format_memory(value: int) -> str:
+    return f"{value / 1024**3:.1f}GiB"
+
+
+def get_load_balancer_name(cluster: str) -> str:
+    return f"k3d-{cluster}-serverlb"
+
+
+def get_memory_budget() -> int:
+    """
+    The configured budget (PULSE8_MEMORY_BUDGET, e.g. 12g or 60%) - by default
+    75% of the memory available to docker.
+    """
+    configured = os.environ.get(ENV_MEMORY_BUDGET, "").strip()
+    share = DEFAULT_MEMORY_BUDGET_SHARE
+    try:
+        if configured.endswith("%"):
+            share = float(configured[:-1]) / 100
+        elif configured:
+            return parse_memory(configured)
+    except ValueError:
+        print(
+            f"[bold red]invalid memory budget {configured} ({ENV_MEMORY_BUDGET})[/bold red]"
+        )
+        exit(1)
+    result = run_command(("docker", "info", "--format", "{{.MemTotal}}"))
+    if not result.ok or not result.stdout.strip().isdigit():
+        print("[bold red]failed reading the memory available to docker[/bold red]")
+        print(result.stderr)
+        exit(1)
+    return int(int(result.stdout.strip()) * share)
+
+
+def get_running_clusters() -> dict[str, dict[str, int]]:
+    """
+    Memory usage of the running containers of every running k3d cluster, by
+    cluster and container name.
+    """
+    containers_result, stats_result = run_commands(
+        [
+            (
+                "docker",
+                "ps",
+                "--filter",
+                "label=k3d.cluster",
+                "--format",
+                '{{.Names}} {{.Label "k3d.cluster"}}',
+            ),
+            ("docker", "stats", "--no-stream", "--format", "{{.Name}} {{.MemUsage}}"),
+        ]
+    )
+    if not containers_result.ok or not stats_result.ok:
+        print("[bold red]failed reading the running environments[/bold red]")
+        print(containers_result.stderr or stats_result.stderr)
+        exit(1)
+    usage = dict()
+    for line in stats_result.stdout.splitlines():
+        name, _, mem_usage = line.partition(" ")
+        try:
+            usage[name] = parse_memory(mem_usage.split("/")[0])
+        except ValueError:
+            usage[name] = 0
+    clusters = defaultdict(dict)
+    for line in containers_result.stdout.splitlines():
+        name, _, cluster = line.partition(" ")
+        if cluster:
+            clusters[cluster][name] = usage.get(name, 0)
+    return clusters
+
+
+def read_memory_usage() -> dict[str, int]:
+    path = get_residency_file_path()
+    if not path.exists():
+        return dict()
+    with open(path, "r") as residency_file:
+        return json.load(residency_file)
+
+
+def write_memory_usage(memory_usage: dict[str, int]) -> None:
+    with open(get_residency_file_path(), "w") as residency_file:
+        json.dump(memory_usage, residency_file)
+
+
+@profiled()
+def make_resident(cluster: str) -> bool:
+    """
+    Make room for a cluster to run and serve the ports 80 / 443: stop the least
+    recently used environments while the memory budget would be exceeded and
+    stop the load balancers of the environments kept running, so they release
+    the ports. Returns whether the cluster itself is running already.
+    """
+    running = get_running_clusters()
+    memory_usage = read_memory_usage()
+    memory_usage.update(
+        {name: sum(containers.values()) for name, containers in running.items()}
+    )
+    budget = get_memory_budget()
+    required = sum(
+        memory_usage[name] for name in running if name != cluster
+    ) + memory_usage.get(cluster, DEFAULT_CLUSTER_MEMORY)
+    # only environments are stopped, never pool or foreign clusters
+    last_used = {
+        record.cluster: record.last_used_at for record in get_env_registry().find()
+    }
+    candidates = sorted(
+        (name for name in running if name != cluster and name in last_used),
+        key=lambda name: last_used[name],
+    )
+    for name in candidates:
+        if required <= budget:
+            break
+        print(
+            f"stopping least recently used environment cluster {name} "
+            f"({format_memory(memory_usage[name])}) to stay within {format_memory(budget)}..."
+        )
+        if not run_command(("k3d", "cluster", "stop", name), stream=True).ok:
+            print(f"[bold red]failed to stop cluster {name}[/bold red]")
+            exit(1)
+        required -= memory_usage[name]
+        running.pop(name)
+    if required > budget:
+        print(
+            f"[yellow]environments need {format_memory(required)}, more than the budget "
+            f"of {format_memory(budget)}[/yellow]"
+        )
+    load_balancers = [
+        get_load_balancer_name(name)
+        for name, containers in running.items()
+        if name != cluster
+        and name in last_used
+        and get_load_balancer_name(name) in containers
+    ]
+    if load_balancers:
+        # only one load balancer can publish the ports 80 / 443
+        run_command(("docker", "stop", *load_balancers))
+    write_memory_usage(memory_usage)
+    return cluster in running
+
+
+def start_resident(cluster: str) -> None:
+    """
+    Start a cluster after make_resident - a running cluster only needs its
+    load balancer back, which is nearly instant.
+    """
+    if make_resident(cluster):
+        args = ("docker", "start", get_load_balancer_name(cluster))
+    else:
+        args = ("k3d", "cluster", "start", cluster)
+    if not run_command(args, stream=True).ok:
+        print(f"[bold red]failed to start cluster {cluster}[/bold red]")
+        exit(1)
@@ -0,0 +1,127 @@
+from datetime import datetime, timezone
+from pathlib import Path
+
+import yaml
+from rich import print
+
+from pulse8_core_cli.shared.module import get_snapshots_dir_path
+from pulse8_core_cli.shared.runner import run_command
+
+# k3s keeps its datastore (kine / sqlite) and the local-path volumes below this directory
+K3S_DATA_DIR = "/var/lib/rancher/k3s"
+K3S_SNAPSHOT_PATHS = ("server/db", "storage")
+SNAPSHOT_METADATA_FILE = "snapshot.yaml"
+SNAPSHOT_SETUP_FILE = "setup.yaml"
+
+
+def get_snapshot_dir_path(identifier: str, name: str) -> Path:
+    return get_snapshots_dir_path().joinpath(identifier, name)
+
+
+def list_cluster_nodes(cluster: str) -> list[str]:
+    """
+    List the server and agent node containers of a k3d cluster.
+    """
+    args = (
+        "docker",
+        "ps",
+        "--all",
+        "--filter",
+        f"label=k3d.cluster={cluster}",
+        "--format",
+        '{{.Names}} {{.Label "k3d.role"}}',
+    )
+    result = run_command(args)
+    if not result.ok:
+        print(f"[bold red]failed listing nodes of cluster {cluster}[/bold red]")
+        print(result.stderr)
+        exit(1)
+    nodes = []
+    for line in result.stdout.splitlines():
+        node_name, _, role = line.partition(" ")
+        if role in ("server", "agent"):
+            nodes.append(node_name)
+    return sorted(nodes)
+
+
+def get_node_image(node_name: str) -> str:
+    args = ("docker", "inspect", "--format", "{{.Config.Image}}", node_name)
+    result = run_command(args)
+    if not result.ok:
+        print(f"[bold red]failed inspecting node {node_name}[/bold red]")
+        print(result.stderr)
+        exit(1)
+    return result.stdout.strip()
+
+
+def run_in_node_volumes(node_name: str, snapshot_dir: Path, script: str) -> None:
+    """
+    Run a shell script in a throwaway container sharing the volumes of the
+    (stopped) node. The node image is reused, so no additional image is pulled.
+    """
+    args = (
+        "docker",
+        "run",
+        "--rm",
+        f"--volumes-from={node_name}",
+        f"--volume={snapshot_dir}:/snapshot",
+        "--entrypoint=/bin/sh",
+        get_node_image(node_name),
+        "-c",
+        script,
+    )
+    result = run_command(args)
+    if not result.ok:
+        print(f"[bold red]failed accessing the volumes of node {node_name}[/bold red]")
+        print(result.stderr)
+        exit(1)
+
+
+def save_node_data(node_name: str, snapshot_dir: Path) -> None:
+    paths = " ".join(K3S_SNAPSHOT_PATHS)
+    run_in_node_volumes(
+        node_name,
+        snapshot_dir,
+        f"cd {K3S_DATA_DIR} && mkdir -p {paths} && tar -czf /snapshot/{node_name}.tar.gz {paths}",
+    )
+
+
+def restore_node_data(node_name: str, snapshot_dir: Path) -> None:
+    paths = " ".join(K3S_SNAPSHOT_PATHS)
+    run_in_node_volumes(
+        node_name,
+        snapshot_dir,
+        f"cd {K3S_DATA_DIR} && rm -rf {paths} && tar -xzf /snapshot/{node_name}.tar.gz",
+    )
+
+
+def write_snapshot_metadata(
+    snapshot_dir: Path, identifier: str, name: str, cluster: str, nodes: list[str]
+) -> None:
+    metadata = {
+        "name": name,
+        "environment": identifier,
+        "cluster": cluster,
+        "nodes": nodes,
+        "created": datetime.now(timezone.utc).isoformat(),
+    }
+    with open(snapshot_dir.joinpath(SNAPSHOT_METADATA_FILE), "w") as metadata_file:
+        metadata_file.write(yaml.dump(metadata))
+
+
+def read_snapshot_metadata(snapshot_dir: Path) -> dict:
+    with open(snapshot_dir.joinpath(SNAPSHOT_METADATA_FILE), "r") as metadata_file:
+        return yaml.load(metadata_file.read(), yaml.Loader)
+
+
+def write_snapshot_setup(snapshot_dir: Path, setup: dict) -> None:
+    with open(snapshot_dir.joinpath(SNAPSHOT_SETUP_FILE), "w") as setup_file:
+        setup_file.write(yaml.dump(setup))
+
+
+def read_snapshot_setup(snapshot_dir: Path) -> dict | None:
+    setup_path = snapshot_dir.joinpath(SNAPSHOT_SETUP_FILE)
+    if not setup_path.exists():
+        return None
+    with open(setup_path, "r") as setup_file:
+        return yaml.load(setup_file.read(), yaml.Loader)
@@ -0,0 +1,219 @@
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from rich.live import Live
+from rich.table import Table
+
+from pulse8_core_cli.environment.components import get_component_registry
+from pulse8_core_cli.environment.constants import FLUX_NAMESPACE
+from pulse8_core_cli.environment.manifests import (
+    INGRESS_NGINX_KUSTOMIZATION_NAME,
+    get_kustomization_name,
+    get_source_name,
+)
+from pulse8_core_cli.environment.readiness import (
+    WATCHED_RESOURCES,
+    ReadinessWatch,
+    get_condition,
+    get_inventory_workloads,
+    is_workload_ready,
+)
+from pulse8_core_cli.shared.kube_client import KubernetesApiError, get_kube_client
+
+# resources of the status - (kind, api versions by preference, namespace or None for all)
+STATUS_RESOURCES = [
+    ("GitRepository", ("source.toolkit.fluxcd.io/v1",), FLUX_NAMESPACE),
+    *WATCHED_RESOURCES,
+]
+PLATFORM_COMPONENTS = {"ingress-nginx": INGRESS_NGINX_KUSTOMIZATION_NAME}
+
+STATUS_READY = "ready"
+STATUS_RECONCILING = "reconciling"
+STATUS_NOT_READY = "not ready"
+STATUS_SUSPENDED = "suspended"
+STATUS_STYLES = {
+    STATUS_READY: "green",
+    STATUS_RECONCILING: "yellow",
+    STATUS_NOT_READY: "bold red",
+    STATUS_SUSPENDED: "dim",
+}
+
+
+@dataclass(frozen=True)
+class ComponentStatus:
+    name: str
+    status: str
+    revision: str
+    workloads: str
+    message: str
+
+
+class StatusCache:
+    """
+    Latest state of all status resources, by kind and (namespace, name). Filled by
+    list calls or watch events.
+    """
+
+    def __init__(self):
+        self.objects: dict[str, dict[tuple[str, str], dict]] = {
+            kind: dict() for kind, _, _ in STATUS_RESOURCES
+        }
+
+    def update(self, kind: str, event_type: str, obj: dict) -> None:
+        metadata = obj["metadata"]
+        key = (metadata.get("namespace", ""), metadata["name"])
+        if event_type == "DELETED":
+            self.objects[kind].pop(key, None)
+        else:
+            self.objects[kind][key] = obj
+
+    def get(self, kind: str, namespace: str, name: str) -> dict | None:
+        return self.objects[kind].get((namespace, name))
+
+
+def list_resource(
+    context_name: str | None, kind: str, api_versions: tuple[str, ...], namespace
+) -> list[dict]:
+    client = get_kube_client(context_name)
+    for api_version in api_versions:
+        try:
+            return client.get(
+                api_version, kind, namespace=namespace, all_namespaces=namespace is None
+            )
+        except KubernetesApiError as e:
+            # older flux versions serve another api version - or flux is missing
+            if e.status != 404:
+                raise
+    return []
+
+
+def fetch_status(context_name: str | None) -> StatusCache:
+    """
+    List every status resource once, all list calls run concurrently.
+    """
+    cache = StatusCache()
+    with ThreadPoolExecutor(max_workers=len(STATUS_RESOURCES)) as executor:
+        results = executor.map(
+            lambda resource: (resource[0], list_resource(context_name, *resource)),
+            STATUS_RESOURCES,
+        )
+        for kind, objects in results:
+            for obj in objects:
+                cache.update(kind, "ADDED", obj)
+    return cache
+
+
+def format_revision(source: dict | None) -> str:
+    """
+    Shorten revisions like main@sha1:0123456789abcdef to main@0123456.
+    """
+    if source is None:
+        return ""
+    revision = (source.get("status", {}).get("artifact") or {}).get("revision", "")
+    ref, _, digest = revision.rpartition(":")
+    if not digest:
+        return revision
+    return f"{ref.split('@')[0]}@{digest[:7]}"
+
+
+def get_component_status(
+    cache: StatusCache, name: str, kustomization_name: str, source_name: str
+) -> ComponentStatus | None:
+    kustomization = cache.get("Kustomization", FLUX_NAMESPACE, kustomization_name)
+    if kustomization is None:
+        return None
+    source = cache.get("GitRepository", FLUX_NAMESPACE, source_name)
+    workloads = sorted(get_inventory_workloads(kustomization))
+    workloads_ready = [
+        (kind, namespace, workload_name)
+        for kind, namespace, workload_name in workloads
+        if (obj := cache.get(kind, namespace, workload_name)) is not None
+        and is_workload_ready(kind, obj)
+    ]
+    condition = get_condition(kustomization, "Ready") or {}
+    if kustomization.get("spec", {}).get("suspend"):
+        status = STATUS_SUSPENDED
+    elif condition.get("status") == "True" and len(workloads_ready) == len(workloads):
+        status = STATUS_READY
+    elif condition.get("status") == "False":
+        status = STATUS_NOT_READY
+    else:
+        status = STATUS_RECONCILING
+    message = condition.get("message", "") if status != STATUS_READY else ""
+    if status == STATUS_READY or condition.get("status") == "True":
+        pending = [w for w in workloads if w not in workloads_ready]
+        if pending:
+            message = "waiting for " + ", ".join(
+                f"{kind}/{workload_name}" for kind, _, workload_name in pending
+            )
+    return ComponentStatus(
+        name=name,
+        status=status,
+        revision=format_revision(source),
+        workloads=f"{len(workloads_ready)}/{len(workloads)}" if workloads else "",
+        message=message,
+    )
+
+
+def get_component_statuses(cache: StatusCache) -> list[ComponentStatus]:
+    """
+    Merge the resources per Pulse8 component - only installed components are listed.
+    """
+    components = [
+        (name, kustomization_name, f"{kustomization_name}-repo")
+        for name, kustomization_name in PLATFORM_COMPONENTS.items()
+    ]
+    components += [
+        (key, get_kustomization_name(key), get_source_name(key))
+        for key in get_component_registry().order
+    ]
+    statuses = [
+        get_component_status(cache, name, kustomization_name, source_name)
+        for name, kustomization_name, source_name in components
+    ]
+    return [status for status in statuses if status is not None]
+
+
+def render_status_table(cache: StatusCache, title: str) -> Table:
+    table = Table(title=title)
+    table.add_column("Component")
+    table.add_column("Status")
+    table.add_column("Revision")
+    table.add_column("Workloads", justify="right")
+    table.add_column("Details", overflow="fold")
+    for status in get_component_statuses(cache):
+        style = STATUS_STYLES[status.status]
+        table.add_row(
+            status.name,
+            f"[{style}]{status.status}[/{style}]",
+            status.revision,
+            status.workloads,
+            status.message,
+        )
+    return table
+
+
+def watch_status(context_name: str | None, title: str) -> None:
+    """
+    Keep the status table up to date from watch events until interrupted.
+    """
+    cache = StatusCache()
+    watch = ReadinessWatch(STATUS_RESOURCES, context_name)
+    watch.start()
+    try:
+        with Live(render_status_table(cache, title), refresh_per_second=2) as live:
+            while True:
+                try:
+                    events = [watch.events.get(timeout=0.5)]
+                    while not watch.events.empty():
+                        events.append(watch.events.get_nowait())
+                except queue.Empty:
+                    continue
+                for kind, event_type, obj in events:
+                    cache.update(kind, event_type, obj)
+                live.update(render_status_table(cache, title))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watch.stop()
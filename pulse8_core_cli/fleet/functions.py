@@ -0,0 +1,389 @@
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+import yaml
+from rich import print
+from rich.table import Table
+
+from pulse8_core_cli.backend.functions import (
+    backend_callback_after_git_init,
+    backend_callback_after_update,
+)
+from pulse8_core_cli.backend_fastapi.functions import (
+    backend_fastapi_callback_after_git_init,
+    backend_fastapi_callback_after_update,
+)
+from pulse8_core_cli.backend_shared_lib.functions import (
+    backend_shared_lib_callback_after_git_init,
+    backend_shared_lib_callback_after_update,
+)
+from pulse8_core_cli.frontend_angular.functions import (
+    frontend_angular_callback_after_git_init,
+    frontend_angular_callback_after_update,
+)
+from pulse8_core_cli.frontend_shared_lib.functions import (
+    frontend_shared_lib_callback_after_git_init,
+    frontend_shared_lib_callback_after_update,
+)
+from pulse8_core_cli.shared.constants import (
+    TEMPLATE_REPO_BACKEND_FASTAPI,
+    TEMPLATE_REPO_BACKEND_SHARED_LIB_JAVA,
+    TEMPLATE_REPO_BACKEND_SPRING,
+    TEMPLATE_REPO_FRONTEND_ANGULAR,
+    TEMPLATE_REPO_FRONTEND_NEXTJS,
+    TEMPLATE_REPO_FRONTEND_SHARED_LIB_REACT,
+)
+from pulse8_core_cli.shared.module import get_github_credentials
+from pulse8_core_cli.shared.runner import run_command
+from pulse8_core_cli.shared.template_batch import (
+    DEFAULT_JOBS,
+    BatchProject,
+    create_batch_log_dir,
+    create_templates,
+    read_answers_file,
+    redirect_output,
+)
+from pulse8_core_cli.shared.template_cache import (
+    get_latest_template_tag,
+    get_template_mirror,
+)
+from pulse8_core_cli.shared.template_management import (
+    get_answers_value,
+    get_update_src_path,
+    template_precheck,
+    update_template,
+)
+
+ANSWERS_FILE_NAMES = (".copier-answers.yml", ".copier-answers.yaml")
+# never searched for projects
+IGNORED_DIRS = {".git", "node_modules", "target", "build", "dist", ".venv", "venv"}
+# markers copier writes into files with conflicting changes, or .rej files
+CONFLICT_MARKER = "<<<<<<< before updating"
+
+UPDATED = "updated"
+UP_TO_DATE = "up to date"
+CONFLICTED = "conflicted"
+FAILED = "failed"
+
+
+@dataclass(frozen=True, slots=True)
+class ProjectType:
+    template_repo_name: str
+    callback_after_git_init: Callable[[], None] | None = None
+    callback_after_update: Callable[[], None] | None = None
+    check_win_registry: bool = False
+
+
+# keyed by the command names of the project types
+PROJECT_TYPES = {
+    "backend": ProjectType(
+        TEMPLATE_REPO_BACKEND_SPRING,
+        callback_after_git_init=backend_callback_after_git_init,
+        callback_after_update=backend_callback_after_update,
+        check_win_registry=True,
+    ),
+    "backend-fastapi": ProjectType(
+        TEMPLATE_REPO_BACKEND_FASTAPI,
+        callback_after_git_init=backend_fastapi_callback_after_git_init,
+        callback_after_update=backend_fastapi_callback_after_update,
+    ),
+    "backend-shared-lib": ProjectType(
+        TEMPLATE_REPO_BACKEND_SHARED_LIB_JAVA,
+        callback_after_git_init=backend_shared_lib_callback_after_git_init,
+        callback_after_update=backend_shared_lib_callback_after_update,
+        check_win_registry=True,
+    ),
+    "frontend": ProjectType(TEMPLATE_REPO_FRONTEND_NEXTJS),
+    "frontend-angular": ProjectType(
+        TEMPLATE_REPO_FRONTEND_ANGULAR,
+        callback_after_git_init=frontend_angular_callback_after_git_init,
+        callback_after_update=frontend_angular_callback_after_update,
+    ),
+    "frontend-shared-lib": ProjectType(
+        TEMPLATE_REPO_FRONTEND_SHARED_LIB_REACT,
+        callback_after_git_init=frontend_shared_lib_callback_after_git_init,
+        callback_after_update=frontend_shared_lib_callback_after_update,
+    ),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class FleetProject:
+    path: str
+    answers_file_path: str
+    # from the _src_path of the answers file
+    template_repo_name: str
+    src_path: str
+
+
+@dataclass(frozen=True, slots=True)
+class UpdateResult:
+    path: str
+    template_repo_name: str
+    status: str
+    duration: float
+    log_path: str | None = None
+    message: str = ""
+
+
+def read_manifest(manifest_path: Path) -> list[BatchProject]:
+    """
+    Projects of a manifest like
+
+    projects:
+      - type: backend
+        answers: answers/orders.yml  # relative to the manifest
+      - type: frontend
+        name: shop
+        answers:
+          project_id: shop
+    """
+    if not manifest_path.is_file():
+        print(f"[bold red]manifest {manifest_path} not found[/bold red]")
+        exit(1)
+    with open(manifest_path, "r") as manifest_file:
+        manifest = yaml.safe_load(manifest_file) or {}
+    entries = manifest.get("projects") if isinstance(manifest, dict) else None
+    if not entries:
+        print(f"[bold red]no projects defined in {manifest_path}[/bold red]")
+        exit(1)
+    projects = []
+    for index, entry in enumerate(entries):
+        project_type = PROJECT_TYPES.get(entry.get("type"))
+        if project_type is None:
+            print(
+                f"[bold red]project {index + 1}: unknown type {entry.get('type')} - "
+                f"use one of {', '.join(PROJECT_TYPES)}[/bold red]"
+            )
+            exit(1)
+        answers = entry.get("answers") or {}
+        if isinstance(answers, str):
+            answers_path = manifest_path.parent.joinpath(answers)
+            if not answers_path.is_file():
+                print(f"[bold red]answers file {answers_path} not found[/bold red]")
+                exit(1)
+            default_name = answers_path.stem
+            answers = read_answers_file(answers_path)
+        else:
+            default_name = answers.get("project_id") or f"{entry['type']}-{index + 1}"
+        projects.append(
+            BatchProject(
+                name=entry.get("name") or default_name,
+                template_repo_name=project_type.template_repo_name,
+                answers=answers,
+                callback_after_git_init=project_type.callback_after_git_init,
+                check_win_registry=project_type.check_win_registry,
+                project_type=entry["type"],
+            )
+        )
+    return projects
+
+
+def fleet_create(
+    manifest_path: Path,
+    jobs: int = DEFAULT_JOBS,
+    ssh: bool = False,
+    offline: bool = False,
+    create_remote_repo: bool = False,
+) -> None:
+    projects = read_manifest(manifest_path)
+    results = create_templates(
+        projects,
+        jobs=jobs,
+        ssh=ssh,
+        offline=offline,
+        create_remote_repo=create_remote_repo,
+    )
+    if not all(result.ok for result in results):
+        exit(1)
+
+
+def get_project_type(template_repo_name: str) -> ProjectType | None:
+    for project_type in PROJECT_TYPES.values():
+        if project_type.template_repo_name == template_repo_name:
+            return project_type
+    return None
+
+
+def find_projects(root_dir: Path) -> list[FleetProject]:
+    """
+    Projects generated from a template below the directory, found by their
+    copier answers files. Projects are not searched for nested projects.
+    """
+    projects = []
+    for dir_path, dir_names, file_names in os.walk(root_dir):
+        answers_file_name = next(
+            (name for name in ANSWERS_FILE_NAMES if name in file_names), None
+        )
+        if answers_file_name is None:
+            dir_names[:] = sorted(
+                name for name in dir_names if name not in IGNORED_DIRS
+            )
+            continue
+        dir_names.clear()
+        answers_file_path = os.path.join(dir_path, answers_file_name)
+        src_path = get_answers_value(answers_file_path, "_src_path") or ""
+        projects.append(
+            FleetProject(
+                path=dir_path,
+                answers_file_path=answers_file_name,
+                template_repo_name=src_path.rstrip("/")
+                .rsplit("/", 1)[-1]
+                .rsplit(":", 1)[-1]
+                .removesuffix(".git"),
+                src_path=src_path,
+            )
+        )
+    return projects
+
+
+def get_conflicts(project_path: str) -> list[str]:
+    marked = run_command(
+        ("git", "grep", "--files-with-matches", "-e", CONFLICT_MARKER),
+        cwd=project_path,
+    ).stdout.split()
+    rejected = run_command(
+        ("git", "ls-files", "--others", "--exclude-standard", "*.rej"),
+        cwd=project_path,
+    ).stdout.split()
+    return sorted(set(marked + rejected))
+
+
+def update_project(project: FleetProject, log_path: str) -> UpdateResult:
+    """
+    Update one project - run in a worker process, with the template mirror
+    already up to date.
+    """
+    start = time.monotonic()
+    project_type = get_project_type(project.template_repo_name)
+
+    def result(status: str, message: str = "") -> UpdateResult:
+        return UpdateResult(
+            path=project.path,
+            template_repo_name=project.template_repo_name,
+            status=status,
+            duration=time.monotonic() - start,
+            log_path=log_path,
+            message=message,
+        )
+
+    with redirect_output(log_path):
+        try:
+            os.chdir(project.path)
+            updated = update_template(
+                project.template_repo_name,
+                project.answers_file_path,
+                defaults=True,
+                skip_answered=True,
+                callback_after_update=project_type.callback_after_update,
+                offline=True,
+            )
+            if not updated:
+                return result(UP_TO_DATE)
+            conflicts = get_conflicts(project.path)
+            if conflicts:
+                return result(CONFLICTED, ", ".join(conflicts))
+            return result(UPDATED)
+        except (Exception, SystemExit) as e:
+            traceback.print_exc()
+            return result(FAILED, str(e) or type(e).__name__)
+
+
+def print_update_report(results: list[UpdateResult], root_dir: Path) -> None:
+    styles = {
+        UPDATED: "green",
+        UP_TO_DATE: "dim",
+        CONFLICTED: "yellow",
+        FAILED: "bold red",
+    }
+    table = Table(title="Updated projects")
+    table.add_column("Project", overflow="fold")
+    table.add_column("Template", overflow="fold")
+    table.add_column("Result")
+    table.add_column("Duration", justify="right")
+    table.add_column("Details / log", overflow="fold")
+    for result in results:
+        style = styles[result.status]
+        details = result.message
+        if result.status in (CONFLICTED, FAILED):
+            details = f"{details} ({result.log_path})"
+        table.add_row(
+            os.path.relpath(result.path, root_dir),
+            result.template_repo_name,
+            f"[{style}]{result.status}[/{style}]",
+            f"{result.duration:.1f}s",
+            details,
+        )
+    print(table)
+    counts = {
+        status: sum(1 for result in results if result.status == status)
+        for status in styles
+    }
+    print(", ".join(f"{count} {status}" for status, count in counts.items()))
+
+
+def fleet_update(
+    root_dir: Path, jobs: int = DEFAULT_JOBS, offline: bool = False
+) -> None:
+    projects = find_projects(root_dir)
+    if not projects:
+        print(f"[bold red]no template projects found in {root_dir}[/bold red]")
+        exit(1)
+    unknown = [p for p in projects if get_project_type(p.template_repo_name) is None]
+    for project in unknown:
+        print(
+            f"[yellow]skipping {project.path} - unknown template {project.template_repo_name or '(no _src_path)'}[/yellow]"
+        )
+    projects = [p for p in projects if p not in unknown]
+    if not projects:
+        exit(1)
+
+    template_precheck(
+        any(
+            get_project_type(p.template_repo_name).check_win_registry for p in projects
+        ),
+        caller_command=" ".join(["pulse8", *sys.argv[1:]]),
+    )
+    get_github_credentials()
+    # fetch every template once - the workers only use the mirrors
+    templates: dict[str, list[FleetProject]] = dict()
+    for project in projects:
+        templates.setdefault(project.template_repo_name, []).append(project)
+    for template_repo_name, template_projects in sorted(templates.items()):
+        template_path = get_template_mirror(
+            template_repo_name,
+            get_update_src_path(template_repo_name, template_projects[0].src_path),
+            offline,
+        )
+        print(
+            f"{template_repo_name}: version {get_latest_template_tag(template_path)} for {len(template_projects)} projects"
+        )
+
+    log_dir = create_batch_log_dir()
+    print(
+        f"[bold]updating {len(projects)} projects with {jobs} parallel jobs (logs: {log_dir})...[/bold]"
+    )
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {
+            executor.submit(
+                update_project,
+                project,
+                str(log_dir.joinpath(f"{index:02d}-{Path(project.path).name}.log")),
+            ): index
+            for index, project in enumerate(projects)
+        }
+        results: list[UpdateResult | None] = [None] * len(projects)
+        for future in as_completed(futures):
+            result = future.result()
+            print(f"{os.path.relpath(result.path, root_dir)}: {result.status}")
+            results[futures[future]] = result
+
+    print_update_report(results, root_dir)
+    if any(result.status in (CONFLICTED, FAILED) for result in results):
+        exit(1)
@@ -0,0 +1,50 @@
+from pathlib import Path
+
+import typer
+from typing_extensions import Annotated
+
+from pulse8_core_cli.fleet.functions import fleet_create, fleet_update
+from pulse8_core_cli.shared.template_batch import DEFAULT_JOBS
+
+app = typer.Typer()
+
+
+@app.command()
+def create(
+    manifest: Annotated[
+        Path, typer.Argument(help="YAML manifest with the projects to create")
+    ],
+    jobs: Annotated[
+        int, typer.Option(help="Projects created in parallel")
+    ] = DEFAULT_JOBS,
+    create_remote_repository: Annotated[
+        bool,
+        typer.Option(help="Create private remote repositories"),
+    ] = False,
+    ssh: Annotated[bool, typer.Option(help="Use SSH for git remote")] = False,
+    offline: Annotated[
+        bool, typer.Option(help="Only use the locally cached templates")
+    ] = False,
+):
+    """
+    Create all projects of a manifest, of any project type
+    """
+    fleet_create(manifest, jobs, ssh, offline, create_remote_repository)
+
+
+@app.command()
+def update(
+    root_dir: Annotated[
+        Path, typer.Argument(help="Directory searched for template projects")
+    ],
+    jobs: Annotated[
+        int, typer.Option(help="Projects updated in parallel")
+    ] = DEFAULT_JOBS,
+    offline: Annotated[
+        bool, typer.Option(help="Only use the locally cached templates")
+    ] = False,
+):
+    """
+    Update all template projects below a directory to their latest template versions
+    """
+    fleet_update(root_dir, jobs, offline)
@@ -1,6 +1,11 @@
 import os
+from pathlib import Path
 
 from pulse8_core_cli.shared.constants import TEMPLATE_REPO_FRONTEND_NEXTJS, PNPM
+from pulse8_core_cli.shared.template_batch import (
+    DEFAULT_JOBS,
+    create_templates_from_answers_dir,
+)
 from pulse8_core_cli.shared.template_management import (
     create_template,
     update_template,
@@ -14,7 +19,22 @@ def frontend_create(
     defaults: bool,
     skip_answered: bool,
     ssh: bool,
+    offline: bool = False,
+    answers_dir: Path | None = None,
+    jobs: int = DEFAULT_JOBS,
 ):
+    if answers_dir is not None:
+        create_templates_from_answers_dir(
+            TEMPLATE_REPO_FRONTEND_NEXTJS,
+            answers_dir,
+            project_type="frontend",
+            jobs=jobs,
+            ssh=ssh,
+            offline=offline,
+            create_remote_repo=bool(create_remote_repo),
+        )
+        return
+
     create_template(
         TEMPLATE_REPO_FRONTEND_NEXTJS,
         create_remote_repo,
@@ -22,12 +42,24 @@ def frontend_create(
         defaults,
         skip_answered,
         ssh,
+        offline=offline,
     )
 
 
-def frontend_update(answers_file: str, defaults: bool, skip_answered: bool):
+def frontend_update(
+    answers_file: str,
+    defaults: bool,
+    skip_answered: bool,
+    offline: bool = False,
+    dry_run: bool = False,
+):
     update_template(
-        TEMPLATE_REPO_FRONTEND_NEXTJS, answers_file, defaults, skip_answered
+        TEMPLATE_REPO_FRONTEND_NEXTJS,
+        answers_file,
+        defaults,
+        skip_answered,
+        offline=offline,
+        dry_run=dry_run,
     )
 
 
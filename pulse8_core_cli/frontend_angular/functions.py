@@ -1,6 +1,12 @@
-import os
+from pathlib import Path
 
 from pulse8_core_cli.shared.constants import TEMPLATE_REPO_FRONTEND_ANGULAR, PNPM
+from pulse8_core_cli.shared.project_tasks import get_pnpm_tasks
+from pulse8_core_cli.shared.task_runner import run_tasks
+from pulse8_core_cli.shared.template_batch import (
+    DEFAULT_JOBS,
+    create_templates_from_answers_dir,
+)
 from pulse8_core_cli.shared.template_management import (
     create_template,
     update_template,
@@ -8,16 +14,37 @@ from pulse8_core_cli.shared.template_management import (
 )
 
 
+def frontend_angular_callback_after_git_init():
+    run_tasks(get_pnpm_tasks(), force=True)
+    # execute_shell_steps([["husky", "install"]])
+
+
+def frontend_angular_callback_after_update():
+    run_tasks(get_pnpm_tasks())
+
+
 def frontend_angular_create(
     create_remote_repo: bool,
     answers_file: str,
     defaults: bool,
     skip_answered: bool,
     ssh: bool,
+    offline: bool = False,
+    answers_dir: Path | None = None,
+    jobs: int = DEFAULT_JOBS,
 ):
-    def callback_after_git_init():
-        os.system("pnpm install")
-        # os.system("husky install")
+    if answers_dir is not None:
+        create_templates_from_answers_dir(
+            TEMPLATE_REPO_FRONTEND_ANGULAR,
+            answers_dir,
+            callback_after_git_init=frontend_angular_callback_after_git_init,
+            project_type="frontend-angular",
+            jobs=jobs,
+            ssh=ssh,
+            offline=offline,
+            create_remote_repo=bool(create_remote_repo),
+        )
+        return
 
     create_template(
         TEMPLATE_REPO_FRONTEND_ANGULAR,
@@ -26,13 +53,26 @@ def frontend_angular_create(
         defaults,
         skip_answered,
         ssh,
-        callback_after_git_init=callback_after_git_init,
+        callback_after_git_init=frontend_angular_callback_after_git_init,
+        offline=offline,
     )
 
 
-def frontend_angular_update(answers_file: str, defaults: bool, skip_answered: bool):
+def frontend_angular_update(
+    answers_file: str,
+    defaults: bool,
+    skip_answered: bool,
+    offline: bool = False,
+    dry_run: bool = False,
+):
     update_template(
-        TEMPLATE_REPO_FRONTEND_ANGULAR, answers_file, defaults, skip_answered
+        TEMPLATE_REPO_FRONTEND_ANGULAR,
+        answers_file,
+        defaults,
+        skip_answered,
+        callback_after_update=frontend_angular_callback_after_update,
+        offline=offline,
+        dry_run=dry_run,
     )
 
 
@@ -1,9 +1,15 @@
-import os
+from pathlib import Path
 
 from pulse8_core_cli.shared.constants import (
     TEMPLATE_REPO_FRONTEND_SHARED_LIB_REACT,
     PNPM,
 )
+from pulse8_core_cli.shared.project_tasks import get_pnpm_tasks
+from pulse8_core_cli.shared.task_runner import run_tasks
+from pulse8_core_cli.shared.template_batch import (
+    DEFAULT_JOBS,
+    create_templates_from_answers_dir,
+)
 from pulse8_core_cli.shared.template_management import (
     create_template,
     update_template,
@@ -11,17 +17,36 @@ from pulse8_core_cli.shared.template_management import (
 )
 
 
+def frontend_shared_lib_callback_after_git_init():
+    run_tasks(get_pnpm_tasks(prepare=True, format=True), force=True)
+
+
+def frontend_shared_lib_callback_after_update():
+    run_tasks(get_pnpm_tasks(format=True))
+
+
 def frontend_shared_lib_create(
     create_remote_repo: bool,
     answers_file: str,
     defaults: bool,
     skip_answered: bool,
     ssh: bool,
+    offline: bool = False,
+    answers_dir: Path | None = None,
+    jobs: int = DEFAULT_JOBS,
 ):
-    def callback_after_git_init():
-        os.system(f"pnpm install")
-        os.system(f"pnpm prepare")
-        os.system(f"pnpm format")
+    if answers_dir is not None:
+        create_templates_from_answers_dir(
+            TEMPLATE_REPO_FRONTEND_SHARED_LIB_REACT,
+            answers_dir,
+            callback_after_git_init=frontend_shared_lib_callback_after_git_init,
+            project_type="frontend-shared-lib",
+            jobs=jobs,
+            ssh=ssh,
+            offline=offline,
+            create_remote_repo=bool(create_remote_repo),
+        )
+        return
 
     create_template(
         TEMPLATE_REPO_FRONTEND_SHARED_LIB_REACT,
@@ -30,22 +55,26 @@ def frontend_shared_lib_create(
         defaults,
         skip_answered,
         ssh,
-        callback_after_git_init=callback_after_git_init,
+        callback_after_git_init=frontend_shared_lib_callback_after_git_init,
+        offline=offline,
     )
 
 
-def frontend_shared_lib_update(answers_file: str, defaults: bool, skip_answered: bool):
-    def callback_after_update():
-        os.system(f"pnpm install")
-        os.system(f"pnpm format")
-        os.system(f"git add -u :/")
-
+def frontend_shared_lib_update(
+    answers_file: str,
+    defaults: bool,
+    skip_answered: bool,
+    offline: bool = False,
+    dry_run: bool = False,
+):
     update_template(
         TEMPLATE_REPO_FRONTEND_SHARED_LIB_REACT,
         answers_file,
         defaults,
         skip_answered,
-        callback_after_update=callback_after_update,
+        callback_after_update=frontend_shared_lib_callback_after_update,
+        offline=offline,
+        dry_run=dry_run,
     )
 
 
@@ -1,80 +1,80 @@
-import typer
-
-from pulse8_core_cli.environment import module as environment_module
-from pulse8_core_cli.auth import module as auth_module
-from pulse8_core_cli.backend import module as backend_module
-from pulse8_core_cli.backend_fastapi import module as backend_fastapi_module
-from pulse8_core_cli.backend_shared_lib import module as backend_shared_lib_module
-from pulse8_core_cli.frontend import module as frontend_module
-from pulse8_core_cli.frontend_angular import module as frontend_angular_module
-from pulse8_core_cli.frontend_shared_lib import module as frontend_shared_lib_module
-from pulse8_core_cli.utils import module as utils_module
-
-pulse8_cli = typer.Typer(no_args_is_help=True)
-
+from pathlib import Path
+from typing import Annotated
 
-pulse8_cli.add_typer(
-    auth_module.app,
-    name="auth",
-    help="Manage Authentication (Synpulse8 infrastructure)",
-    no_args_is_help=True,
-)
-
-pulse8_cli.add_typer(
-    backend_module.app,
-    name="backend",
-    help="Manage Pulse8 Spring Boot backends",
-    no_args_is_help=True,
-)
-
-pulse8_cli.add_typer(
-    backend_fastapi_module.app,
-    name="backend-fastapi",
-    help="Manage Pulse8 FastAPI backends",
-    no_args_is_help=True,
-)
-
-pulse8_cli.add_typer(
-    backend_shared_lib_module.app,
-    name="backend-shared-lib",
-    help="Manage Pulse8 Java backend shared libs",
-    no_args_is_help=True,
-)
+import typer
 
-pulse8_cli.add_typer(
-    environment_module.app,
-    name="environment",
-    help="Manage Pulse8 environments",
-    no_args_is_help=True,
-)
+from pulse8_core_cli.shared.lazy_typer import LazySubApp, lazy_typer_group
+from pulse8_core_cli.shared.profiling import start_profiling
 
-pulse8_cli.add_typer(
-    frontend_module.app,
-    name="frontend",
-    help="Manage Pulse8 NextJS frontends",
-    no_args_is_help=True,
-)
+# sub-apps are imported on first use, see lazy_typer_group
+SUB_APPS = [
+    LazySubApp(
+        name="auth",
+        import_path="pulse8_core_cli.auth.module",
+        help="Manage Authentication (Synpulse8 infrastructure)",
+    ),
+    LazySubApp(
+        name="backend",
+        import_path="pulse8_core_cli.backend.module",
+        help="Manage Pulse8 Spring Boot backends",
+    ),
+    LazySubApp(
+        name="backend-fastapi",
+        import_path="pulse8_core_cli.backend_fastapi.module",
+        help="Manage Pulse8 FastAPI backends",
+    ),
+    LazySubApp(
+        name="backend-shared-lib",
+        import_path="pulse8_core_cli.backend_shared_lib.module",
+        help="Manage Pulse8 Java backend shared libs",
+    ),
+    LazySubApp(
+        name="environment",
+        import_path="pulse8_core_cli.environment.module",
+        help="Manage Pulse8 environments",
+    ),
+    LazySubApp(
+        name="fleet",
+        import_path="pulse8_core_cli.fleet.module",
+        help="Manage many Pulse8 projects at once",
+    ),
+    LazySubApp(
+        name="frontend",
+        import_path="pulse8_core_cli.frontend.module",
+        help="Manage Pulse8 NextJS frontends",
+    ),
+    LazySubApp(
+        name="frontend-angular",
+        import_path="pulse8_core_cli.frontend_angular.module",
+        help="Manage Pulse8 Angular frontends",
+    ),
+    LazySubApp(
+        name="frontend-shared-lib",
+        import_path="pulse8_core_cli.frontend_shared_lib.module",
+        help="Manage Pulse8 React frontend shared libs",
+    ),
+    LazySubApp(
+        name="utils",
+        import_path="pulse8_core_cli.utils.module",
+        help="Pulse8 utility commands",
+    ),
+]
 
-pulse8_cli.add_typer(
-    frontend_angular_module.app,
-    name="frontend-angular",
-    help="Manage Pulse8 Angular frontends",
-    no_args_is_help=True,
-)
+pulse8_cli = typer.Typer(no_args_is_help=True, cls=lazy_typer_group(SUB_APPS))
 
-pulse8_cli.add_typer(
-    frontend_shared_lib_module.app,
-    name="frontend-shared-lib",
-    help="Manage Pulse8 React frontend shared libs",
-    no_args_is_help=True,
-)
 
-pulse8_cli.add_typer(
-    utils_module.app,
-    name="utils",
-    help="Pulse8 utility commands",
-    no_args_is_help=True,
-)
+@pulse8_cli.callback()
+def main(
+    ctx: typer.Context,
+    profile: Annotated[
+        Path,
+        typer.Option(
+            help="Write a Chrome trace of all steps and external commands to this file."
+        ),
+    ] = None,
+):
+    if profile is not None:
+        start_profiling(profile, ctx.invoked_subcommand or "")
 
 
 if __name__ == "__main__":
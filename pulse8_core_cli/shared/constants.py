@@ -16,6 +16,11 @@ ENV_GITHUB_GHCR_TOKEN = "GITHUB_GHCR_TOKEN"  # general, non-user-specific token
 ENV_GITHUB_USER = "GITHUB_USER"
 ENV_JFROG_TOKEN = "JFROG_TOKEN"
 ENV_JFROG_USER = "JFROG_USER"
+# talk to the cluster via kubectl instead of the api client
+ENV_USE_KUBECTL = "PULSE8_USE_KUBECTL"
+ENV_CREDENTIALS_CACHE = "PULSE8_CREDENTIALS_CACHE"  # keep parsed credentials in ~/.pulse8 across invocations
+# memory of running environments, e.g. 12g or 60% of docker
+ENV_MEMORY_BUDGET = "PULSE8_MEMORY_BUDGET"
 
 # repository types
 REPOSITORY_PRIVATE = "private"
@@ -0,0 +1,157 @@
+import json
+import os
+import stat
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import yaml
+
+from pulse8_core_cli.shared.constants import (
+    ENV_GITHUB_GHCR_TOKEN,
+    ENV_GITHUB_TOKEN,
+    ENV_GITHUB_USER,
+    ENV_JFROG_TOKEN,
+    ENV_JFROG_USER,
+)
+from pulse8_core_cli.shared.platform_discovery import is_windows
+
+JFROG_REGISTRY = "synpulse.jfrog.io"
+
+
+@dataclass(frozen=True, slots=True)
+class GitHubCredentials:
+    user: str
+    token: str
+
+
+@dataclass(frozen=True, slots=True)
+class Credentials:
+    github: GitHubCredentials
+    ghcr_token: str
+    jfrog_user: str
+    jfrog_token: str
+
+    def as_env_variables(self) -> dict[str, str]:
+        return {
+            ENV_GITHUB_GHCR_TOKEN: self.ghcr_token,
+            ENV_GITHUB_USER: self.github.user,
+            ENV_GITHUB_TOKEN: self.github.token,
+            ENV_JFROG_TOKEN: self.jfrog_token,
+            ENV_JFROG_USER: self.jfrog_user,
+        }
+
+
+def get_file_key(path: Path) -> tuple[str, int, int]:
+    file_stat = path.stat()
+    return str(path), file_stat.st_mtime_ns, file_stat.st_size
+
+
+def parse_github_credentials(hosts_path: Path) -> GitHubCredentials:
+    with open(hosts_path) as hosts_file:
+        github_com = yaml.load(hosts_file.read(), yaml.Loader)["github.com"]
+    return GitHubCredentials(user=github_com["user"], token=github_com["oauth_token"])
+
+
+def parse_credentials(
+    hosts_path: Path, ghcr_token_path: Path, docker_config_path: Path
+) -> Credentials:
+    with open(ghcr_token_path, "r") as ghcr_token_file:
+        ghcr_token = ghcr_token_file.read()
+    with open(docker_config_path) as docker_config_file:
+        jfrog_auth = json.loads(docker_config_file.read())["auths"][JFROG_REGISTRY]
+    return Credentials(
+        github=parse_github_credentials(hosts_path),
+        ghcr_token=ghcr_token,
+        jfrog_user=jfrog_auth["email"],
+        jfrog_token=jfrog_auth["auth"],
+    )
+
+
+def is_secured(path: Path) -> bool:
+    """
+    The cache file may only be used if nobody but the current user can access it.
+    """
+    if is_windows():
+        # files below the user profile are private by default
+        return True
+    file_stat = path.stat()
+    return file_stat.st_uid == os.getuid() and not (
+        stat.S_IMODE(file_stat.st_mode) & 0o077
+    )
+
+
+def read_disk_cache(cache_path: Path, key: list) -> Credentials | None:
+    try:
+        if not is_secured(cache_path):
+            return None
+        with open(cache_path, "r") as cache_file:
+            cache = json.load(cache_file)
+        if cache.get("key") != key:
+            return None
+        credentials = cache["credentials"]
+        return Credentials(
+            github=GitHubCredentials(**credentials.pop("github")), **credentials
+        )
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def write_disk_cache(cache_path: Path, key: list, credentials: Credentials) -> None:
+    file_descriptor = os.open(cache_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    # the mode of os.open only applies to new files
+    if not is_windows():
+        os.fchmod(file_descriptor, 0o600)
+    with os.fdopen(file_descriptor, "w") as cache_file:
+        json.dump({"key": key, "credentials": asdict(credentials)}, cache_file)
+
+
+class CredentialsProvider:
+    """
+    Parses the credential files (GitHub CLI hosts.yml, GHCR token, docker
+    config.json) once per process. Results are cached on the mtime and size of
+    the files, so `pulse8 auth login` in between is picked up.
+    """
+
+    def __init__(self):
+        self._cache: dict[tuple, GitHubCredentials | Credentials] = {}
+
+    def get_github_credentials(self, hosts_path: Path) -> GitHubCredentials:
+        key = ("github", get_file_key(hosts_path))
+        if key not in self._cache:
+            self._cache[key] = parse_github_credentials(hosts_path)
+        return self._cache[key]
+
+    def get_credentials(
+        self,
+        hosts_path: Path,
+        ghcr_token_path: Path,
+        docker_config_path: Path,
+        disk_cache_path: Path | None = None,
+    ) -> Credentials:
+        """
+        With a disk_cache_path the parsed credentials are also kept in a file
+        only readable by the current user, valid as long as the files are unchanged.
+        """
+        file_keys = [
+            get_file_key(path)
+            for path in (hosts_path, ghcr_token_path, docker_config_path)
+        ]
+        key = ("all", *file_keys)
+        if key in self._cache:
+            return self._cache[key]
+        credentials = None
+        # json round trip of the key - lists instead of tuples
+        disk_cache_key = [list(file_key) for file_key in file_keys]
+        if disk_cache_path is not None and disk_cache_path.exists():
+            credentials = read_disk_cache(disk_cache_path, disk_cache_key)
+        if credentials is None:
+            credentials = parse_credentials(
+                hosts_path, ghcr_token_path, docker_config_path
+            )
+            if disk_cache_path is not None:
+                write_disk_cache(disk_cache_path, disk_cache_key, credentials)
+        self._cache[key] = credentials
+        return credentials
+
+
+credentials_provider = CredentialsProvider()
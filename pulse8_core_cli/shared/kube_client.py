@@ -0,0 +1,500 @@
+import base64
+import http.client
+import json
+import os
+import queue
+import ssl
+import tempfile
+import threading
+from pathlib import Path
+from typing import Iterator
+from urllib.parse import urlencode, urlparse
+
+import yaml
+
+from pulse8_core_cli.shared.constants import ENV_USE_KUBECTL
+from pulse8_core_cli.shared.profiling import span
+from pulse8_core_cli.shared.runner import CommandStream, run_command
+
+DEFAULT_NAMESPACE = "default"
+REQUEST_TIMEOUT = 30
+
+
+class KubernetesApiError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(f"{status}: {message}")
+        self.status = status
+        self.message = message
+
+
+def get_kubeconfig_paths() -> list[Path]:
+    kubeconfig = os.environ.get("KUBECONFIG")
+    if kubeconfig:
+        return [Path(path) for path in kubeconfig.split(os.pathsep) if path]
+    return [Path.home().joinpath(".kube", "config")]
+
+
+def load_kubeconfig() -> dict:
+    """
+    Load and merge the kubeconfig files like kubectl does - the first file
+    defining an entry (or the current context) wins.
+    """
+    merged = {"current-context": None, "clusters": {}, "contexts": {}, "users": {}}
+    for path in get_kubeconfig_paths():
+        if not path.exists():
+            continue
+        with open(path, "r") as kubeconfig_file:
+            kubeconfig = yaml.load(kubeconfig_file.read(), yaml.Loader) or {}
+        if merged["current-context"] is None:
+            merged["current-context"] = kubeconfig.get("current-context") or None
+        for section, entry_key in (
+            ("clusters", "cluster"),
+            ("contexts", "context"),
+            ("users", "user"),
+        ):
+            for entry in kubeconfig.get(section) or []:
+                merged[section].setdefault(entry["name"], entry.get(entry_key) or {})
+    return merged
+
+
+def get_current_context() -> str | None:
+    return load_kubeconfig()["current-context"]
+
+
+def get_kubeconfig_key() -> tuple:
+    key = [os.environ.get("KUBECONFIG"), os.environ.get(ENV_USE_KUBECTL)]
+    for path in get_kubeconfig_paths():
+        try:
+            stat = path.stat()
+            key.append((str(path), stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            key.append((str(path), None, None))
+    return tuple(key)
+
+
+def split_api_version(api_version: str) -> tuple[str, str]:
+    if "/" in api_version:
+        group, version = api_version.split("/", 1)
+        return group, version
+    return "", api_version
+
+
+class WatchStream:
+    """
+    Iterates over the (event type, object) tuples of a watch until the
+    server closes it or close() is called from another thread.
+    """
+
+    def __init__(self, events: Iterator[tuple[str, dict]], close):
+        self._events = events
+        self._close = close
+
+    def __iter__(self) -> Iterator[tuple[str, dict]]:
+        return self._events
+
+    def close(self) -> None:
+        self._close()
+
+
+class KubernetesClient:
+    """
+    Talks to the api server of the current kubeconfig context directly. Connections
+    are kept alive and reused, resource paths are discovered once per api group.
+    """
+
+    def __init__(self, kubeconfig: dict, context_name: str | None = None):
+        self.context_name = context_name or kubeconfig["current-context"]
+        if self.context_name not in kubeconfig["contexts"]:
+            raise ValueError(f"context {self.context_name} not found in kubeconfig")
+        context = kubeconfig["contexts"][self.context_name]
+        cluster = kubeconfig["clusters"][context["cluster"]]
+        user = kubeconfig["users"].get(context.get("user"), {})
+        if "exec" in user or "auth-provider" in user:
+            raise ValueError("credential plugins are only supported by kubectl")
+        if cluster.get("tls-server-name") or cluster.get("proxy-url"):
+            raise ValueError(
+                "tls server names and proxies are only supported by kubectl"
+            )
+        self.namespace = context.get("namespace") or DEFAULT_NAMESPACE
+        server = urlparse(cluster["server"])
+        if server.scheme != "https":
+            raise ValueError("only https api servers are supported")
+        self.host = server.hostname
+        self.port = server.port or 443
+        self.base_path = server.path.rstrip("/")
+        self.headers = {"Accept": "application/json"}
+        if user.get("token"):
+            self.headers["Authorization"] = f"Bearer {user['token']}"
+        elif user.get("tokenFile"):
+            with open(user["tokenFile"], "r") as token_file:
+                self.headers["Authorization"] = f"Bearer {token_file.read().strip()}"
+        elif user.get("username"):
+            credentials = f"{user['username']}:{user.get('password', '')}"
+            self.headers["Authorization"] = (
+                f"Basic {base64.b64encode(credentials.encode('utf8')).decode('utf8')}"
+            )
+        self.ssl_context = self._create_ssl_context(cluster, user)
+        self._connections: queue.LifoQueue = queue.LifoQueue()
+        self._resources: dict[tuple[str, str], tuple[str, bool]] = dict()
+        self._resources_lock = threading.Lock()
+
+    @staticmethod
+    def _create_ssl_context(cluster: dict, user: dict) -> ssl.SSLContext:
+        if cluster.get("insecure-skip-tls-verify"):
+            context = ssl.create_default_context()
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+        elif cluster.get("certificate-authority-data"):
+            context = ssl.create_default_context(
+                cadata=base64.b64decode(cluster["certificate-authority-data"]).decode(
+                    "utf8"
+                )
+            )
+        elif cluster.get("certificate-authority"):
+            context = ssl.create_default_context(
+                cafile=cluster["certificate-authority"]
+            )
+        else:
+            context = ssl.create_default_context()
+        if user.get("client-certificate-data") and user.get("client-key-data"):
+            # the ssl module only loads client certificates from files
+            fd, cert_path = tempfile.mkstemp(suffix=".pem")
+            try:
+                with os.fdopen(fd, "wb") as cert_file:
+                    cert_file.write(base64.b64decode(user["client-certificate-data"]))
+                    cert_file.write(b"\n")
+                    cert_file.write(base64.b64decode(user["client-key-data"]))
+                context.load_cert_chain(cert_path)
+            finally:
+                os.remove(cert_path)
+        elif user.get("client-certificate") and user.get("client-key"):
+            context.load_cert_chain(user["client-certificate"], user["client-key"])
+        return context
+
+    def _connect(self, timeout: float | None = REQUEST_TIMEOUT):
+        connection = http.client.HTTPSConnection(
+            self.host, self.port, timeout=timeout, context=self.ssl_context
+        )
+        return connection
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        query: dict | None = None,
+        body: dict | list | None = None,
+        content_type: str = "application/json",
+    ) -> dict | None:
+        url = self.base_path + path
+        if query:
+            url += "?" + urlencode(query)
+        headers = dict(self.headers)
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode("utf8")
+            headers["Content-Type"] = content_type
+        with span(f"{method} {path}", "kubernetes"):
+            for attempt in range(2):
+                try:
+                    connection = self._connections.get_nowait()
+                    reused = True
+                except queue.Empty:
+                    connection = self._connect()
+                    reused = False
+                try:
+                    connection.request(method, url, body=payload, headers=headers)
+                    response = connection.getresponse()
+                    data = response.read()
+                except (http.client.HTTPException, ConnectionError, OSError):
+                    connection.close()
+                    # the server may have closed an idle keep-alive connection
+                    if reused and attempt == 0:
+                        continue
+                    raise
+                self._connections.put(connection)
+                break
+        text = data.decode("utf8", errors="replace")
+        is_json = response.getheader("Content-Type", "").startswith("application/json")
+        if response.status >= 400:
+            # proxies and the api server itself may answer errors as plain text
+            try:
+                message = json.loads(text)["message"] if is_json else None
+            except (ValueError, KeyError, TypeError):
+                message = None
+            if message is None:
+                message = f"{response.reason} {text.strip()}".strip()
+            raise KubernetesApiError(response.status, message)
+        if not data:
+            return None
+        try:
+            return json.loads(text)
+        except ValueError:
+            raise KubernetesApiError(
+                response.status, f"invalid response: {text.strip()[:200]}"
+            )
+
+    def _get_resource(self, api_version: str, kind: str) -> tuple[str, bool]:
+        """
+        Resolve the plural resource name of a kind and whether it is namespaced.
+        """
+        key = (api_version, kind)
+        with self._resources_lock:
+            if key not in self._resources:
+                group, version = split_api_version(api_version)
+                path = f"/apis/{group}/{version}" if group else f"/api/{version}"
+                for resource in self.request("GET", path)["resources"]:
+                    if "/" not in resource["name"]:
+                        self._resources[(api_version, resource["kind"])] = (
+                            resource["name"],
+                            resource["namespaced"],
+                        )
+            if key not in self._resources:
+                raise KubernetesApiError(404, f"unknown kind {kind} ({api_version})")
+            return self._resources[key]
+
+    def _get_path(
+        self,
+        api_version: str,
+        kind: str,
+        name: str | None = None,
+        namespace: str | None = None,
+        all_namespaces: bool = False,
+    ) -> str:
+        group, version = split_api_version(api_version)
+        path = f"/apis/{group}/{version}" if group else f"/api/{version}"
+        resource, namespaced = self._get_resource(api_version, kind)
+        if namespaced and not all_namespaces:
+            path += f"/namespaces/{namespace or self.namespace}"
+        path += f"/{resource}"
+        if name is not None:
+            path += f"/{name}"
+        return path
+
+    def get(
+        self,
+        api_version: str,
+        kind: str,
+        name: str | None = None,
+        namespace: str | None = None,
+        all_namespaces: bool = False,
+    ) -> dict | list[dict] | None:
+        """
+        Get a single object (None if it does not exist) or list all objects of a kind.
+        """
+        path = self._get_path(api_version, kind, name, namespace, all_namespaces)
+        try:
+            result = self.request("GET", path)
+        except KubernetesApiError as e:
+            if e.status == 404 and name is not None:
+                return None
+            raise
+        return result if name is not None else result["items"]
+
+    def apply(self, manifests: list[dict], field_manager: str) -> None:
+        """
+        Server-side apply every manifest, taking over conflicting fields.
+        """
+        for manifest in manifests:
+            metadata = manifest["metadata"]
+            path = self._get_path(
+                manifest["apiVersion"],
+                manifest["kind"],
+                metadata["name"],
+                metadata.get("namespace"),
+            )
+            self.request(
+                "PATCH",
+                path,
+                query={"fieldManager": field_manager, "force": "true"},
+                body=manifest,
+                content_type="application/apply-patch+yaml",
+            )
+
+    def delete(self, manifests: list[dict]) -> None:
+        """
+        Delete every manifest without waiting, ignoring objects that do not exist.
+        """
+        for manifest in manifests:
+            metadata = manifest["metadata"]
+            try:
+                path = self._get_path(
+                    manifest["apiVersion"],
+                    manifest["kind"],
+                    metadata["name"],
+                    metadata.get("namespace"),
+                )
+                self.request("DELETE", path)
+            except KubernetesApiError as e:
+                if e.status != 404:
+                    raise
+
+    def watch(
+        self,
+        api_version: str,
+        kind: str,
+        namespace: str | None = None,
+        resource_version: str | None = None,
+    ) -> WatchStream:
+        """
+        Watch a kind in a namespace (or all namespaces). Existing objects are
+        reported as ADDED events first, unless the watch resumes from a
+        resource version. Watches use a dedicated connection, connection
+        errors are raised while iterating.
+        """
+        path = self._get_path(
+            api_version, kind, namespace=namespace, all_namespaces=namespace is None
+        )
+        query = {"watch": "1", "allowWatchBookmarks": "true"}
+        if resource_version is not None:
+            query["resourceVersion"] = resource_version
+        connection = self._connect(timeout=None)
+        connection.request(
+            "GET", f"{self.base_path}{path}?{urlencode(query)}", headers=self.headers
+        )
+        response = connection.getresponse()
+        if response.status >= 400:
+            connection.close()
+            raise KubernetesApiError(response.status, response.reason)
+
+        def events() -> Iterator[tuple[str, dict]]:
+            try:
+                for line in response:
+                    if line.strip():
+                        event = json.loads(line.decode("utf8"))
+                        yield event["type"], event["object"]
+            finally:
+                connection.close()
+
+        def close() -> None:
+            if connection.sock is not None:
+                try:
+                    connection.sock.shutdown(2)
+                except OSError:
+                    pass
+
+        return WatchStream(events(), close)
+
+
+class KubectlClient:
+    """
+    Fallback using kubectl for kubeconfigs the client cannot handle itself,
+    e.g. credential plugins. Forced with PULSE8_USE_KUBECTL=1.
+    """
+
+    def __init__(self, context_name: str | None):
+        self.context_name = context_name
+
+    def _get_command(self) -> list[str]:
+        if self.context_name is None:
+            return ["kubectl"]
+        return ["kubectl", "--context", self.context_name]
+
+    def _kubectl(self, args: list[str], stdin_input: str | None = None) -> str:
+        result = run_command([*self._get_command(), *args], stdin_input=stdin_input)
+        if not result.ok:
+            message = result.stderr.strip()
+            raise KubernetesApiError(404 if "NotFound" in message else 500, message)
+        return result.stdout
+
+    @staticmethod
+    def _get_resource(api_version: str, kind: str) -> str:
+        group, _ = split_api_version(api_version)
+        return f"{kind}.{group}" if group else kind
+
+    def get(
+        self,
+        api_version: str,
+        kind: str,
+        name: str | None = None,
+        namespace: str | None = None,
+        all_namespaces: bool = False,
+    ) -> dict | list[dict] | None:
+        args = ["get", self._get_resource(api_version, kind), "-o", "json"]
+        if name is not None:
+            args.insert(2, name)
+        args += ["--all-namespaces"] if all_namespaces else []
+        args += ["--namespace", namespace] if namespace else []
+        try:
+            result = json.loads(self._kubectl(args))
+        except KubernetesApiError as e:
+            if e.status == 404 and name is not None:
+                return None
+            raise
+        return result if name is not None else result["items"]
+
+    def apply(self, manifests: list[dict], field_manager: str) -> None:
+        self._kubectl(
+            [
+                "apply",
+                "--server-side",
+                "--force-conflicts",
+                f"--field-manager={field_manager}",
+                "-f",
+                "-",
+            ],
+            stdin_input=yaml.safe_dump_all(manifests, sort_keys=False),
+        )
+
+    def delete(self, manifests: list[dict]) -> None:
+        self._kubectl(
+            ["delete", "--ignore-not-found=true", "--wait=false", "-f", "-"],
+            stdin_input=yaml.safe_dump_all(manifests, sort_keys=False),
+        )
+
+    def watch(
+        self,
+        api_version: str,
+        kind: str,
+        namespace: str | None = None,
+        resource_version: str | None = None,
+    ) -> WatchStream:
+        # kubectl cannot resume a watch - it lists the objects again
+        args = [*self._get_command(), "get", self._get_resource(api_version, kind)]
+        args += ["--watch", "--output-watch-events", "-o", "json"]
+        args += ["--namespace", namespace] if namespace else ["--all-namespaces"]
+        stream = CommandStream(args)
+
+        def events() -> Iterator[tuple[str, dict]]:
+            buffer = []
+            for line in stream:
+                buffer.append(line)
+                # kubectl pretty-prints every event, a top-level object ends with "}"
+                if line.rstrip("\n") == "}":
+                    try:
+                        event = json.loads("".join(buffer))
+                    except json.JSONDecodeError:
+                        continue
+                    buffer = []
+                    yield event["type"], event["object"]
+
+        return WatchStream(events(), stream.stop)
+
+
+_clients: dict[tuple, KubernetesClient | KubectlClient] = dict()
+_clients_lock = threading.Lock()
+
+
+def get_kube_client(
+    context_name: str | None = None,
+) -> KubernetesClient | KubectlClient:
+    """
+    Return the client of a kubeconfig context, the current one by default. The
+    kubeconfig is only loaded again if it changed (e.g. after k3d switched the context).
+    """
+    kubeconfig_key = get_kubeconfig_key()
+    key = (kubeconfig_key, context_name)
+    with _clients_lock:
+        if key not in _clients:
+            kubeconfig = load_kubeconfig()
+            context_name = context_name or kubeconfig["current-context"]
+            if os.environ.get(ENV_USE_KUBECTL):
+                client = KubectlClient(context_name)
+            else:
+                try:
+                    client = KubernetesClient(kubeconfig, context_name)
+                except (KeyError, ValueError, OSError, ssl.SSLError):
+                    client = KubectlClient(context_name)
+            for outdated_key in [k for k in _clients if k[0] != kubeconfig_key]:
+                del _clients[outdated_key]
+            _clients[key] = client
+        return _clients[key]
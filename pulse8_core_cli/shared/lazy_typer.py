@@ -0,0 +1,63 @@
+import importlib
+from dataclasses import dataclass
+
+import click
+import typer
+from typer.core import TyperGroup
+
+
+@dataclass(frozen=True)
+class LazySubApp:
+    """
+    A sub-command group of the CLI, the `app` of its module is only imported when
+    the group is used.
+    """
+
+    name: str
+    import_path: str
+    help: str
+
+
+class LazySubAppGroup(TyperGroup):
+    """
+    Stands in for the group of a sub-app - its name and help are known upfront,
+    its commands are loaded on first use.
+    """
+
+    def __init__(self, sub_app: LazySubApp):
+        super().__init__(name=sub_app.name, help=sub_app.help, no_args_is_help=True)
+        self.import_path = sub_app.import_path
+        self.loaded = False
+
+    def load(self) -> None:
+        if self.loaded:
+            return
+        module = importlib.import_module(self.import_path)
+        group = typer.main.get_group(module.app)
+        self.commands.update(group.commands)
+        self.loaded = True
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        self.load()
+        return super().list_commands(ctx)
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        self.load()
+        return super().get_command(ctx, cmd_name)
+
+
+def lazy_typer_group(sub_apps: list[LazySubApp]) -> type[TyperGroup]:
+    """
+    Build the group class of the root Typer app (`typer.Typer(cls=...)`), listing
+    the sub-apps without importing them. `pulse8 --help` and shell completion of
+    the top level commands stay cheap, `pulse8 environment list` only imports the
+    environment module.
+    """
+
+    class LazyTyperGroup(TyperGroup):
+        def __init__(self, **kwargs):
+            super().__init__(**kwargs)
+            for sub_app in sub_apps:
+                self.add_command(LazySubAppGroup(sub_app))
+
+    return LazyTyperGroup
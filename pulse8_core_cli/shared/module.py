@@ -1,136 +1,158 @@
-import json
 import os
 import re
-import subprocess
 
 from pathlib import Path
 from uuid import uuid4
 
-import yaml
 from rich import print
 
 from pulse8_core_cli.shared.constants import (
     ENV_GITHUB_USER,
-    ENV_JFROG_TOKEN,
-    ENV_JFROG_USER,
     ENV_GITHUB_TOKEN,
-    ENV_GITHUB_GHCR_TOKEN,
+    ENV_CREDENTIALS_CACHE,
+)
+from pulse8_core_cli.shared.credentials import (
+    Credentials,
+    GitHubCredentials,
+    credentials_provider,
 )
 from pulse8_core_cli.shared.platform_discovery import is_windows
+from pulse8_core_cli.shared.profiling import profiled
+from pulse8_core_cli.shared.runner import run_command
 
+INITIAL_COMMIT_MESSAGE = "[PULSE8] Generated using Pulse8 Core Template"
 
-def get_env_variables(silent: bool = False) -> dict[str, any]:
+
+def get_github_cli_hosts_path() -> Path:
+    if is_windows():
+        return Path(os.getenv("APPDATA")).joinpath("GitHub CLI").joinpath("hosts.yml")
+    return Path.home().joinpath(".config").joinpath("gh").joinpath("hosts.yml")
+
+
+def get_credentials_cache_path() -> Path | None:
+    if os.getenv(ENV_CREDENTIALS_CACHE, "").lower() not in ("1", "true"):
+        return None
+    return get_cli_dir().joinpath("credentials_cache.json")
+
+
+def exit_credentials_missing() -> None:
+    print(
+        "[bold red]Error retrieving environment variables - please use 'pulse8 auth login'[/bold red]"
+    )
+    exit(1)
+
+
+def get_github_credentials() -> GitHubCredentials:
     try:
-        config_github_cli_path: Path
-        try:
-            if is_windows():
-                config_github_cli_path = (
-                    Path(os.getenv("APPDATA"))
-                    .joinpath("GitHub CLI")
-                    .joinpath("hosts.yml")
-                )
-            else:
-                config_github_cli_path = (
-                    Path.home().joinpath(".config").joinpath("gh").joinpath("hosts.yml")
-                )
-        except Exception as e:
-            print(f"[red]Error reading from GitHub CLI hosts.yml[/red]")
-            print(
-                f"[italic]Hint: Please try to reauthorize using [bold]pulse8 auth login[/bold][/italic]"
-            )
-            raise e
-        config_github_cli_file_raw: str
-        with open(config_github_cli_path) as config_github_cli_file:
-            config_github_cli_file_raw = config_github_cli_file.read()
-        config_github_cli = yaml.load(config_github_cli_file_raw, yaml.Loader)
-        github_com = config_github_cli["github.com"]
-        github_user = github_com["user"]
-        github_token = github_com["oauth_token"]
-        with open(get_ghcrtoken_path(), "r") as file:
-            ghcr_token = file.read()
-        if not silent:
-            print(f"[green]GitHub authentication set to user {github_user}[/green]")
-        docker_config_json_path = get_dotdocker_config_file_path()
-        docker_config_json_raw: str
-        with open(docker_config_json_path) as docker_config_json_file:
-            docker_config_json_raw = docker_config_json_file.read()
-        docker_config_json = json.loads(docker_config_json_raw)
-        jfrog_token = docker_config_json["auths"]["synpulse.jfrog.io"]["auth"]
-        jfrog_user = docker_config_json["auths"]["synpulse.jfrog.io"]["email"]
-        return {
-            ENV_GITHUB_GHCR_TOKEN: ghcr_token,
-            ENV_GITHUB_USER: github_user,
-            ENV_GITHUB_TOKEN: github_token,
-            ENV_JFROG_TOKEN: jfrog_token,
-            ENV_JFROG_USER: jfrog_user,
-        }
-    except KeyError:
-        print(
-            "[bold red]Error retrieving environment variables - please use 'pulse8 auth login'[/bold red]"
-        )
-        exit(1)
+        return credentials_provider.get_github_credentials(get_github_cli_hosts_path())
+    except (KeyError, TypeError, OSError):
+        exit_credentials_missing()
 
-def get_env_variables_small(silent: bool = False) -> dict[str, any]:
+
+def get_credentials() -> Credentials:
     try:
-        config_github_cli_path: Path
-        try:
-            if is_windows():
-                config_github_cli_path = (
-                    Path(os.getenv("APPDATA"))
-                    .joinpath("GitHub CLI")
-                    .joinpath("hosts.yml")
-                )
-            else:
-                config_github_cli_path = (
-                    Path.home().joinpath(".config").joinpath("gh").joinpath("hosts.yml")
-                )
-        except Exception as e:
-            print(f"[red]Error reading from GitHub CLI hosts.yml[/red]")
-            print(
-                f"[italic]Hint: Please try to reauthorize using [bold]pulse8 auth login[/bold][/italic]"
-            )
-            raise e
-        config_github_cli_file_raw: str
-        with open(config_github_cli_path) as config_github_cli_file:
-            config_github_cli_file_raw = config_github_cli_file.read()
-        config_github_cli = yaml.load(config_github_cli_file_raw, yaml.Loader)
-        github_com = config_github_cli["github.com"]
-        github_user = github_com["user"]
-        github_token = github_com["oauth_token"]
-        return {
-            ENV_GITHUB_USER: github_user,
-            ENV_GITHUB_TOKEN: github_token,
-        }
-    except KeyError:
+        return credentials_provider.get_credentials(
+            get_github_cli_hosts_path(),
+            get_ghcrtoken_path(),
+            get_dotdocker_config_file_path(),
+            disk_cache_path=get_credentials_cache_path(),
+        )
+    except (KeyError, TypeError, OSError):
+        exit_credentials_missing()
+
+
+def get_env_variables(silent: bool = False) -> dict[str, any]:
+    credentials = get_credentials()
+    if not silent:
         print(
-            "[bold red]Error retrieving environment variables - please use 'pulse8 auth login'[/bold red]"
+            f"[green]GitHub authentication set to user {credentials.github.user}[/green]"
         )
-        exit(1)
+    return credentials.as_env_variables()
+
+
+def get_env_variables_small(silent: bool = False) -> dict[str, any]:
+    github_credentials = get_github_credentials()
+    return {
+        ENV_GITHUB_USER: github_credentials.user,
+        ENV_GITHUB_TOKEN: github_credentials.token,
+    }
+
 
-def git_init(callback_after_git_init):
-    os.system("git init")
+@profiled()
+def git_init(callback_after_git_init) -> bool:
+    """
+    Commit the generated project as the first commit of branch main. Files
+    ignored by .gitignore (e.g. installed dependencies) are not committed,
+    commit hooks installed by the callback do not run on the initial commit.
+    """
+    if not execute_shell_steps(
+        [["git", "init", "--quiet", "--initial-branch", "main"]]
+    ):
+        return False
     if callback_after_git_init is not None:
         callback_after_git_init()
-    os.system("git add .")
-    os.system('git commit -m "[PULSE8] Generated using Pulse8 Core Template" --quiet')
-    os.system("git branch -M main")
-    current_git_path = os.getcwd().replace("\\", "/")
-    os.system(f"git config --global --add safe.directory {current_git_path}")
+    committed = execute_shell_steps(
+        [
+            ["git", "add", "--all"],
+            [
+                "git",
+                "commit",
+                "--quiet",
+                "--no-verify",
+                "--message",
+                INITIAL_COMMIT_MESSAGE,
+            ],
+        ]
+    )
+    if committed:
+        add_git_safe_directory(os.getcwd().replace("\\", "/"))
+    return committed
+
+
+def add_git_safe_directory(path: str) -> None:
+    # replaces only an identical entry - adds the path once, never duplicates it
+    run_command(
+        [
+            "git",
+            "config",
+            "--global",
+            "--replace-all",
+            "safe.directory",
+            path,
+            f"^{re.escape(path)}$",
+        ]
+    )
 
 
+@profiled()
 def git_create_remote(
     create_remote_repo: bool, repository_name: str, github_user: str, github_token: str
 ):
     if create_remote_repo:
         print(f"[green]Creating private remote repository {repository_name}[/green]")
 
-        os.system(
-            f"gh repo create {repository_name} --private --source=. --remote=upstream"
+        execute_shell_steps(
+            [
+                [
+                    "gh",
+                    "repo",
+                    "create",
+                    repository_name,
+                    "--private",
+                    "--source=.",
+                    "--remote=upstream",
+                ],
+                [
+                    "git",
+                    "remote",
+                    "add",
+                    "origin",
+                    f"https://{github_token}@github.com/{github_user}/{repository_name}.git",
+                ],
+                ["git", "push", "-u", "origin", "main"],
+            ],
+            interactive=True,
         )
-        os.system(
-            f"git remote add origin https://{github_token}@github.com/{github_user}/{repository_name}.git"
-        )
-        os.system("git push -u origin main")
 
         print(
             f"[bold green]Pushed generated project to newly created {create_remote_repo} "
@@ -158,6 +180,48 @@ def get_environments_dir_path() -> Path:
     return environments_dir
 
 
+def get_environments_db_path() -> Path:
+    return get_cli_dir().joinpath("environments.db")
+
+
+def get_residency_file_path() -> Path:
+    return get_cli_dir().joinpath("residency.json")
+
+
+def get_images_file_path() -> Path:
+    return get_cli_dir().joinpath("images.json")
+
+
+def get_templates_dir_path() -> Path:
+    templates_dir: Path = get_cli_dir().joinpath("templates")
+    templates_dir.mkdir(parents=True, exist_ok=True)
+    return templates_dir
+
+
+def get_task_cache_dir_path() -> Path:
+    task_cache_dir: Path = get_cli_dir().joinpath("tasks")
+    task_cache_dir.mkdir(parents=True, exist_ok=True)
+    return task_cache_dir
+
+
+def get_pool_dir_path() -> Path:
+    pool_dir: Path = get_cli_dir().joinpath("pool")
+    pool_dir.mkdir(parents=True, exist_ok=True)
+    return pool_dir
+
+
+def get_snapshots_dir_path() -> Path:
+    snapshots_dir: Path = get_cli_dir().joinpath("snapshots")
+    snapshots_dir.mkdir(parents=True, exist_ok=True)
+    return snapshots_dir
+
+
+def get_registry_cache_dir_path() -> Path:
+    registry_cache_dir: Path = get_cli_dir().joinpath("registry-cache")
+    registry_cache_dir.mkdir(parents=True, exist_ok=True)
+    return registry_cache_dir
+
+
 def get_dotdocker_dir_path() -> Path:
     docker_dir: Path = Path.home().joinpath(".docker")
     docker_dir.mkdir(parents=True, exist_ok=True)
@@ -215,24 +279,42 @@ def execute_shell_command(
     message_success: str = "",
     message_failure: str = "",
     print_output: bool = True,
+    stdin_input: str | None = None,
 ) -> str:
     """
     Execute a command and print the output.
     If the command fails, print the error message and exit with error code 1.
     """
 
-    pipe = subprocess.Popen(
-        command_array, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-    )
-    res: tuple[bytes, bytes] = pipe.communicate()
-    if pipe.returncode == 1:
+    result = run_command(command_array, stdin_input=stdin_input)
+    if not result.ok:
         if message_failure:
-            print(f"[bold red]{message_failure})[/bold red]")
-        print(res[0].decode("utf8"))
-        print(res[1].decode("utf8"))
+            print(f"[bold red]{message_failure}[/bold red]")
+        print(result.stdout)
+        print(result.stderr)
         exit(1)
     if print_output:
-        print(res[0].decode("utf8"))
+        print(result.stdout)
     if message_success:
         print(f"[green]{message_success}[/green]")
-    return res[0].decode("utf8")
+    return result.stdout
+
+
+def execute_shell_steps(
+    steps: list[list[str]], interactive: bool = False, message_failure: str = ""
+) -> bool:
+    """
+    Execute commands one after another while streaming their output.
+    Stops at the first failing command and prints its exit code.
+    """
+    for step in steps:
+        result = run_command(step, stream=not interactive, interactive=interactive)
+        if not result.ok:
+            # only the executable and sub command - arguments may contain tokens
+            print(
+                f"[bold red]{' '.join(step[:2])} failed with exit code {result.returncode}[/bold red]"
+            )
+            if message_failure:
+                print(f"[bold red]{message_failure}[/bold red]")
+            return False
+    return True
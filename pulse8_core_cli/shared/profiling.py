@@ -0,0 +1,190 @@
+import atexit
+import functools
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Sequence
+
+from pulse8_core_cli.shared.runner import CommandResult, history
+
+REDACTED = "***"
+# flags / keys whose values are secrets, e.g. --proxy-password=... or password=...
+SECRET_KEY_PATTERN = re.compile(r"(?i)(password|passwd|token|secret|auth|credential)")
+URL_CREDENTIALS_PATTERN = re.compile(r"://[^/@\s]+@")
+# lane ids of external commands start here - steps use the lane of their thread
+COMMAND_LANE_OFFSET = 1000
+
+
+def redact(value: str) -> str:
+    value = URL_CREDENTIALS_PATTERN.sub(f"://{REDACTED}@", value)
+    if "=" in value:
+        key, _ = value.split("=", 1)
+        if SECRET_KEY_PATTERN.search(key):
+            return f"{key}={REDACTED}"
+    return value
+
+
+def redact_args(args: Sequence[str]) -> list[str]:
+    redacted = []
+    previous = ""
+    for arg in args:
+        if (
+            previous.startswith("-")
+            and "=" not in previous
+            and SECRET_KEY_PATTERN.search(previous)
+        ):
+            redacted.append(REDACTED)
+        else:
+            redacted.append(redact(arg))
+        previous = arg
+    return redacted
+
+
+class Profiler:
+    """
+    Collects spans of CLI steps and external commands and writes them in the
+    Chrome trace event format (open with chrome://tracing or ui.perfetto.dev).
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.path: Path | None = None
+        self.events: list[dict] = []
+        self.lock = threading.Lock()
+        # end time of the last command per lane, commands may run concurrently
+        self.command_lanes: list[float] = []
+
+    def enable(self, path: Path) -> None:
+        self.enabled = True
+        self.path = path
+        history.listeners.append(self.record_command)
+
+    def add_span(
+        self,
+        name: str,
+        category: str,
+        start: float,
+        end: float,
+        args: dict | None = None,
+        lane: int | None = None,
+    ) -> None:
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": int(start * 1_000_000),
+            "dur": max(int((end - start) * 1_000_000), 1),
+            "pid": os.getpid(),
+            "tid": lane if lane is not None else threading.get_ident(),
+            "args": args or {},
+        }
+        with self.lock:
+            self.events.append(event)
+
+    def get_command_lane(self, start: float, end: float) -> int:
+        with self.lock:
+            for index, lane_end in enumerate(self.command_lanes):
+                if lane_end <= start:
+                    self.command_lanes[index] = end
+                    return COMMAND_LANE_OFFSET + index
+            self.command_lanes.append(end)
+            return COMMAND_LANE_OFFSET + len(self.command_lanes) - 1
+
+    def record_command(self, result: CommandResult, started: float) -> None:
+        end = started + result.duration
+        name = " ".join(
+            [os.path.basename(result.args[0])]
+            + [arg for arg in result.args[1:3] if not arg.startswith("-")][:1]
+        )
+        self.add_span(
+            name,
+            "command",
+            started,
+            end,
+            args={
+                "args": redact_args(result.args),
+                "exit_code": result.returncode,
+            },
+            lane=self.get_command_lane(started, end),
+        )
+
+    @contextmanager
+    def span(self, name: str, category: str = "step", **args) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.add_span(
+                name,
+                category,
+                start,
+                time.time(),
+                args={key: redact(str(value)) for key, value in args.items()},
+            )
+
+    def write(self) -> None:
+        if not self.enabled or self.path is None:
+            return
+        metadata = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": os.getpid(),
+                "tid": COMMAND_LANE_OFFSET + index,
+                "args": {"name": f"commands {index + 1}"},
+            }
+            for index in range(len(self.command_lanes))
+        ]
+        with open(self.path, "w") as trace_file:
+            json.dump(
+                {"traceEvents": metadata + self.events, "displayTimeUnit": "ms"},
+                trace_file,
+            )
+
+
+profiler = Profiler()
+
+
+def span(name: str, category: str = "step", **args):
+    """
+    Record a step of the CLI when profiling is enabled (pulse8 --profile).
+    """
+    return profiler.span(name, category, **args)
+
+
+def profiled(name: str | None = None):
+    """
+    Decorator recording every call of a function as a step.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with profiler.span(name or func.__name__):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def start_profiling(path: Path, command: str) -> None:
+    """
+    Profile the whole CLI run - the trace is written when the process exits,
+    also if a step exits early.
+    """
+    profiler.enable(path)
+    start = time.time()
+
+    def finish() -> None:
+        profiler.add_span(f"pulse8 {command}", "cli", start, time.time())
+        profiler.write()
+
+    atexit.register(finish)
@@ -0,0 +1,77 @@
+from pulse8_core_cli.shared.module import get_maven_wrapper_executable
+from pulse8_core_cli.shared.task_runner import Task
+
+# root and first level modules - skips build output and dependency directories
+MAVEN_INPUTS = ("pom.xml", "*/pom.xml", ".mvn/**/*", "src/**/*", "*/src/**/*")
+POETRY_INPUTS = ("pyproject.toml", "poetry.lock")
+PNPM_INPUTS = ("package.json", "pnpm-lock.yaml", ".npmrc")
+MAVEN_OUTPUTS = ("target",)
+# only exists for in-project virtualenvs - else poetry install always runs
+POETRY_OUTPUTS = (".venv",)
+PNPM_OUTPUTS = ("node_modules/.modules.yaml",)
+PNPM_SOURCE_INPUTS = ("src/**/*", "package.json", ".prettierrc*", ".prettierignore")
+
+
+def get_maven_tasks() -> list[Task]:
+    maven_wrapper = get_maven_wrapper_executable()
+    return [
+        Task(
+            name="format",
+            steps=((maven_wrapper, "spotless:apply"), ("git", "add", "-u", ":/")),
+            inputs=MAVEN_INPUTS,
+        ),
+        Task(
+            name="build",
+            steps=((maven_wrapper, "clean", "install"),),
+            inputs=MAVEN_INPUTS,
+            outputs=MAVEN_OUTPUTS,
+            dependencies=("format",),
+        ),
+    ]
+
+
+def get_poetry_tasks() -> list[Task]:
+    return [
+        Task(
+            name="lock",
+            steps=(("poetry", "lock", "--no-update"),),
+            inputs=POETRY_INPUTS,
+        ),
+        Task(
+            name="install",
+            steps=(("poetry", "install", "--no-root"),),
+            inputs=POETRY_INPUTS,
+            outputs=POETRY_OUTPUTS,
+            dependencies=("lock",),
+        ),
+    ]
+
+
+def get_pnpm_tasks(prepare: bool = False, format: bool = False) -> list[Task]:
+    tasks = [
+        Task(
+            name="install",
+            steps=(("pnpm", "install"),),
+            inputs=PNPM_INPUTS,
+            outputs=PNPM_OUTPUTS,
+        )
+    ]
+    if prepare:
+        tasks.append(
+            Task(
+                name="prepare",
+                steps=(("pnpm", "prepare"),),
+                inputs=PNPM_INPUTS,
+                dependencies=("install",),
+            )
+        )
+    if format:
+        tasks.append(
+            Task(
+                name="format",
+                steps=(("pnpm", "format"), ("git", "add", "-u", ":/")),
+                inputs=PNPM_SOURCE_INPUTS,
+                dependencies=("install",),
+            )
+        )
+    return tasks
@@ -0,0 +1,276 @@
+import asyncio
+import os
+import shutil
+import signal
+import subprocess
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterator, Sequence
+
+from rich.console import Console
+from rich.markup import escape
+
+from pulse8_core_cli.shared.platform_discovery import is_windows
+
+# lines kept of streamed (not captured) output for error reporting
+STREAM_TAIL_LINES = 200
+# seconds a cancelled command gets to terminate before it is killed
+TERMINATE_TIMEOUT = 5
+DEFAULT_CONCURRENCY = 4
+# longest output line read - e.g. k3d prints its JSON output on a single line
+STREAM_LINE_LIMIT = 64 * 1024 * 1024
+
+console = Console(highlight=False)
+
+
+@dataclass(frozen=True)
+class CommandResult:
+    args: tuple[str, ...]
+    returncode: int
+    stdout: str
+    stderr: str
+    duration: float
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0
+
+
+@dataclass
+class CommandHistory:
+    """
+    Duration and exit status of every command run in this process.
+    """
+
+    results: deque = field(default_factory=lambda: deque(maxlen=1000))
+    listeners: list[Callable[[CommandResult, float], None]] = field(
+        default_factory=list
+    )
+
+    def record(self, result: CommandResult, started: float) -> None:
+        self.results.append(result)
+        for listener in self.listeners:
+            listener(result, started)
+
+
+history = CommandHistory()
+
+
+class CommandFailedError(Exception):
+    def __init__(self, result: CommandResult):
+        super().__init__(
+            f"{' '.join(result.args)} failed with exit code {result.returncode}"
+        )
+        self.result = result
+
+
+async def _read_lines(
+    reader: asyncio.StreamReader,
+    lines: list | deque,
+    echo: bool,
+    on_line: Callable[[str], None] | None,
+) -> None:
+    while True:
+        line = await reader.readline()
+        if not line:
+            return
+        text = line.decode("utf8", errors="replace")
+        lines.append(text)
+        if echo:
+            console.print(escape(text.rstrip("\n")))
+        if on_line is not None:
+            on_line(text)
+
+
+async def _stop_process(process: asyncio.subprocess.Process) -> None:
+    if process.returncode is not None:
+        return
+    try:
+        if is_windows():
+            process.terminate()
+        else:
+            # the command runs in its own process group - stop its children too
+            os.killpg(process.pid, signal.SIGTERM)
+        await asyncio.wait_for(process.wait(), TERMINATE_TIMEOUT)
+    except (ProcessLookupError, asyncio.TimeoutError):
+        try:
+            if is_windows():
+                process.kill()
+            else:
+                os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        await process.wait()
+
+
+async def run_command_async(
+    args: Sequence[str],
+    stdin_input: str | None = None,
+    stream: bool = False,
+    interactive: bool = False,
+    cwd: str | Path | None = None,
+    env: dict | None = None,
+    on_line: Callable[[str], None] | None = None,
+) -> CommandResult:
+    """
+    Run a command and return its result, whatever the exit code is.
+    Captured output is kept completely, streamed output is printed line by line
+    and only its tail is kept. Interactive commands inherit the terminal.
+    """
+    args = tuple(str(arg) for arg in args)
+    executable = _resolve_args(args)[0]
+    started = time.time()
+    start = time.monotonic()
+    try:
+        if interactive:
+            process = await asyncio.create_subprocess_exec(
+                executable, *args[1:], cwd=cwd, env=env
+            )
+        else:
+            process = await asyncio.create_subprocess_exec(
+                executable,
+                *args[1:],
+                stdin=(
+                    asyncio.subprocess.PIPE
+                    if stdin_input is not None
+                    else asyncio.subprocess.DEVNULL
+                ),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=cwd,
+                env=env,
+                start_new_session=not is_windows(),
+                limit=STREAM_LINE_LIMIT,
+            )
+    except FileNotFoundError:
+        result = CommandResult(
+            args=args,
+            returncode=127,
+            stdout="",
+            stderr=f"command not found: {args[0]}",
+            duration=time.monotonic() - start,
+        )
+        history.record(result, started)
+        return result
+    stdout_lines = deque(maxlen=STREAM_TAIL_LINES) if stream else []
+    stderr_lines = deque(maxlen=STREAM_TAIL_LINES) if stream else []
+    try:
+        if interactive:
+            await process.wait()
+        else:
+            if stdin_input is not None:
+                process.stdin.write(stdin_input.encode("utf8"))
+                await process.stdin.drain()
+                process.stdin.close()
+            await asyncio.gather(
+                _read_lines(process.stdout, stdout_lines, stream, on_line),
+                _read_lines(process.stderr, stderr_lines, stream, None),
+                process.wait(),
+            )
+    except BaseException:
+        # cancelled (e.g. ctrl-c) - do not leave the command running
+        await asyncio.shield(_stop_process(process))
+        raise
+    result = CommandResult(
+        args=args,
+        returncode=process.returncode,
+        stdout="".join(stdout_lines),
+        stderr="".join(stderr_lines),
+        duration=time.monotonic() - start,
+    )
+    history.record(result, started)
+    return result
+
+
+def run_command(args: Sequence[str], check: bool = False, **kwargs) -> CommandResult:
+    """
+    Run a single command. With check=True any non-zero exit raises CommandFailedError.
+    """
+    result = asyncio.run(run_command_async(args, **kwargs))
+    if check and not result.ok:
+        raise CommandFailedError(result)
+    return result
+
+
+def run_commands(
+    commands: Sequence[Sequence[str]],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    **kwargs,
+) -> list[CommandResult]:
+    """
+    Run commands concurrently, at most `concurrency` at a time. Results are
+    returned in the order of the commands.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_one(args: Sequence[str]) -> CommandResult:
+        async with semaphore:
+            return await run_command_async(args, **kwargs)
+
+    async def run_all() -> list[CommandResult]:
+        return list(await asyncio.gather(*(run_one(args) for args in commands)))
+
+    return asyncio.run(run_all())
+
+
+def _resolve_args(args: Sequence[str]) -> tuple[str, ...]:
+    args = tuple(str(arg) for arg in args)
+    # resolve shims like pnpm.cmd through PATHEXT on Windows
+    return (shutil.which(args[0]) or args[0], *args[1:])
+
+
+class CommandStream:
+    """
+    A long running command (e.g. a watch) whose stdout is read line by line
+    from a thread, stderr is discarded. stop() ends the command and its
+    children. Raises FileNotFoundError if the command does not exist.
+    """
+
+    def __init__(self, args: Sequence[str], cwd: str | Path | None = None):
+        self.process = subprocess.Popen(
+            _resolve_args(args),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            cwd=cwd,
+            start_new_session=not is_windows(),
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.process.stdout
+        self.process.wait()
+
+    def stop(self) -> None:
+        if self.process.poll() is not None:
+            return
+        try:
+            if is_windows():
+                self.process.terminate()
+            else:
+                os.killpg(self.process.pid, signal.SIGTERM)
+            self.process.wait(TERMINATE_TIMEOUT)
+        except ProcessLookupError:
+            pass
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+
+def start_detached(
+    args: Sequence[str], log_path: str | Path, cwd: str | Path | None = None
+) -> None:
+    """
+    Start a command that outlives this process, e.g. a background job of the
+    CLI itself. Its output is appended to the log file.
+    """
+    with open(log_path, "a") as log_file:
+        subprocess.Popen(
+            _resolve_args(args),
+            stdin=subprocess.DEVNULL,
+            stdout=log_file,
+            stderr=subprocess.STDOUT,
+            cwd=cwd,
+            start_new_session=True,
+        )
@@ -0,0 +1,169 @@
+import asyncio
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+from rich import print
+from rich.markup import escape
+
+from pulse8_core_cli.shared.module import get_task_cache_dir_path
+from pulse8_core_cli.shared.profiling import profiled
+from pulse8_core_cli.shared.runner import console, run_command_async
+
+# lines of a failed step printed
+FAILURE_TAIL_LINES = 30
+
+
+@dataclass(frozen=True, slots=True)
+class Task:
+    name: str
+    # commands run one after another
+    steps: tuple[tuple[str, ...], ...]
+    # glob patterns of the files the task depends on, relative to the project
+    inputs: tuple[str, ...]
+    # names of tasks which have to succeed first
+    dependencies: tuple[str, ...] = ()
+    # glob patterns of what the task produces, e.g. installed dependencies - the
+    # task is not skipped while one of them is missing
+    outputs: tuple[str, ...] = ()
+
+
+def get_task_cache_path(project_dir: Path) -> Path:
+    digest = hashlib.sha256(project_dir.resolve().as_posix().encode()).hexdigest()
+    return get_task_cache_dir_path().joinpath(f"{digest[:16]}.json")
+
+
+def read_task_cache(project_dir: Path) -> dict[str, str]:
+    path = get_task_cache_path(project_dir)
+    if not path.exists():
+        return dict()
+    try:
+        with open(path, "r") as cache_file:
+            return json.load(cache_file)
+    except (OSError, ValueError):
+        return dict()
+
+
+def write_task_cache(project_dir: Path, hashes: dict[str, str]) -> None:
+    with open(get_task_cache_path(project_dir), "w") as cache_file:
+        json.dump(hashes, cache_file, indent=2)
+
+
+def get_task_hash(task: Task, project_dir: Path) -> str:
+    """
+    Hash of the steps and of the path and content of every input file.
+    """
+    digest = hashlib.sha256(json.dumps(task.steps).encode())
+    paths = sorted(
+        {
+            path
+            for pattern in task.inputs
+            for path in project_dir.glob(pattern)
+            if path.is_file()
+        }
+    )
+    for path in paths:
+        digest.update(path.relative_to(project_dir).as_posix().encode())
+        with open(path, "rb") as input_file:
+            digest.update(hashlib.file_digest(input_file, "sha256").digest())
+    return digest.hexdigest()
+
+
+def has_outputs(task: Task, project_dir: Path) -> bool:
+    return all(
+        next(project_dir.glob(pattern), None) is not None for pattern in task.outputs
+    )
+
+
+def sort_tasks(tasks: list[Task]) -> list[Task]:
+    names = {task.name for task in tasks}
+    for task in tasks:
+        unknown = set(task.dependencies) - names
+        if unknown:
+            raise ValueError(f"{task.name} depends on unknown tasks {unknown}")
+    ordered: list[Task] = []
+    done: set[str] = set()
+    while len(ordered) < len(tasks):
+        ready = [
+            task
+            for task in tasks
+            if task.name not in done and done.issuperset(task.dependencies)
+        ]
+        if not ready:
+            raise ValueError("circular task dependencies")
+        ordered += ready
+        done.update(task.name for task in ready)
+    return ordered
+
+
+async def run_task(task: Task, project_dir: Path) -> bool:
+    def print_line(line: str) -> None:
+        console.print(f"[dim]{task.name} |[/dim] {escape(line.rstrip())}")
+
+    for step in task.steps:
+        result = await run_command_async(step, cwd=project_dir, on_line=print_line)
+        if not result.ok:
+            for line in result.stderr.splitlines()[-FAILURE_TAIL_LINES:]:
+                print_line(line)
+            # only the executable and sub command - arguments may contain tokens
+            print(
+                f"[bold red]{task.name}: {' '.join(step[:2])} failed with exit code {result.returncode}[/bold red]"
+            )
+            return False
+    return True
+
+
+@profiled()
+def run_tasks(
+    tasks: list[Task], project_dir: Path | None = None, force: bool = False
+) -> bool:
+    """
+    Run the tasks of a project, independent ones in parallel. A task whose
+    inputs did not change since its last successful run and whose outputs
+    exist is skipped, a task whose dependency failed is not run. Returns if
+    all tasks succeeded.
+    """
+    project_dir = Path(project_dir or os.getcwd())
+    tasks = sort_tasks(tasks)
+    cache = read_task_cache(project_dir)
+
+    async def run_all() -> dict[str, bool]:
+        outcomes: dict[str, asyncio.Future] = {
+            task.name: asyncio.get_running_loop().create_future() for task in tasks
+        }
+
+        async def run_one(task: Task) -> None:
+            dependencies_ok = all(
+                [await outcomes[dependency] for dependency in task.dependencies]
+            )
+            if not dependencies_ok:
+                print(f"[yellow]{task.name}: skipped - a dependency failed[/yellow]")
+                outcomes[task.name].set_result(False)
+                return
+            task_hash = get_task_hash(task, project_dir)
+            if (
+                not force
+                and cache.get(task.name) == task_hash
+                and has_outputs(task, project_dir)
+            ):
+                print(f"[italic]{task.name}: inputs unchanged - skipped[/italic]")
+                outcomes[task.name].set_result(True)
+                return
+            print(f"[bold]{task.name}: running...[/bold]")
+            ok = await run_task(task, project_dir)
+            if ok:
+                # the task may change its own inputs, e.g. formatting
+                cache[task.name] = get_task_hash(task, project_dir)
+                print(f"[green]{task.name}: done[/green]")
+            else:
+                cache.pop(task.name, None)
+            outcomes[task.name].set_result(ok)
+
+        await asyncio.gather(*(run_one(task) for task in tasks))
+        return {name: outcome.result() for name, outcome in outcomes.items()}
+
+    results = asyncio.run(run_all())
+    write_task_cache(project_dir, cache)
+    return all(results.values())
@@ -0,0 +1,286 @@
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterator
+
+import yaml
+from rich import print
+from rich.table import Table
+
+from pulse8_core_cli.shared.module import (
+    create_template_tmp_dir,
+    get_cli_dir,
+    get_github_credentials,
+    git_create_remote,
+    git_init,
+    rename_template_tmp_dir,
+)
+from pulse8_core_cli.shared.template_cache import (
+    get_template_mirror,
+    remove_credentials,
+)
+from pulse8_core_cli.shared.template_management import (
+    get_template_src_path,
+    template_precheck,
+    update_answers_file_src_path,
+)
+
+DEFAULT_JOBS = 4
+ANSWERS_FILE_PATTERNS = ("*.yml", "*.yaml")
+
+
+@dataclass(frozen=True, slots=True)
+class BatchProject:
+    name: str
+    template_repo_name: str
+    answers: dict
+    # module level function - it is run by a worker process
+    callback_after_git_init: Callable[[], None] | None = None
+    check_win_registry: bool = False
+    # mixed-type manifests
+    project_type: str = ""
+
+
+@dataclass(frozen=True, slots=True)
+class ProjectResult:
+    name: str
+    project_type: str
+    ok: bool
+    duration: float
+    path: str | None = None
+    log_path: str | None = None
+    message: str = ""
+
+
+def read_answers_file(path: Path) -> dict:
+    with open(path, "r") as answers_file:
+        answers = yaml.safe_load(answers_file) or {}
+    if not isinstance(answers, dict):
+        print(f"[bold red]{path} is not a copier answers file[/bold red]")
+        exit(1)
+    # copier internal answers like _src_path / _commit are not questions
+    return {key: value for key, value in answers.items() if not key.startswith("_")}
+
+
+def read_answers_dir(answers_dir: Path) -> list[tuple[str, dict]]:
+    """
+    Every answers file of a directory, by project name (the file name).
+    """
+    if not answers_dir.is_dir():
+        print(f"[bold red]{answers_dir} is not a directory[/bold red]")
+        exit(1)
+    paths = sorted(
+        path for pattern in ANSWERS_FILE_PATTERNS for path in answers_dir.glob(pattern)
+    )
+    if not paths:
+        print(f"[bold red]no answers files (*.yml, *.yaml) in {answers_dir}[/bold red]")
+        exit(1)
+    return [(path.stem, read_answers_file(path)) for path in paths]
+
+
+def create_batch_log_dir() -> Path:
+    log_dir = get_cli_dir().joinpath(
+        "batch-logs", datetime.now().strftime("%Y%m%d-%H%M%S")
+    )
+    log_dir.mkdir(parents=True, exist_ok=True)
+    return log_dir
+
+
+@contextmanager
+def redirect_output(log_path: str) -> Iterator[None]:
+    stdout, stderr = sys.stdout, sys.stderr
+    with open(log_path, "w") as log_file:
+        sys.stdout = sys.stderr = log_file
+        try:
+            yield
+        finally:
+            sys.stdout, sys.stderr = stdout, stderr
+
+
+def create_project(
+    project: BatchProject,
+    template_path: str,
+    src_path: str,
+    output_dir: str,
+    log_path: str,
+) -> ProjectResult:
+    """
+    Render, initialize and commit one project - run in a worker process, all
+    output goes to the log file of the project.
+    """
+    start = time.monotonic()
+    with redirect_output(log_path):
+        try:
+            from copier import run_copy
+
+            os.chdir(output_dir)
+            tmp_dir = create_template_tmp_dir()
+            worker = run_copy(
+                template_path,
+                ".",
+                data=project.answers,
+                defaults=True,
+                unsafe=True,
+            )
+            update_answers_file_src_path(src_path)
+            project_id = worker.answers.user.get("project_id") or project.name
+            rename_template_tmp_dir(tmp_dir, project_id)
+            if not git_init(project.callback_after_git_init):
+                raise RuntimeError("failed to create the initial commit")
+            return ProjectResult(
+                name=project.name,
+                project_type=project.project_type,
+                ok=True,
+                duration=time.monotonic() - start,
+                path=os.getcwd(),
+                log_path=log_path,
+            )
+        except (Exception, SystemExit) as e:
+            traceback.print_exc()
+            return ProjectResult(
+                name=project.name,
+                project_type=project.project_type,
+                ok=False,
+                duration=time.monotonic() - start,
+                log_path=log_path,
+                message=str(e) or type(e).__name__,
+            )
+
+
+def print_batch_report(results: list[ProjectResult]) -> None:
+    table = Table(title="Created projects")
+    table.add_column("Project")
+    table.add_column("Type")
+    table.add_column("Result")
+    table.add_column("Duration", justify="right")
+    table.add_column("Path / log", overflow="fold")
+    for result in results:
+        table.add_row(
+            result.name,
+            result.project_type,
+            "[green]created[/green]" if result.ok else "[bold red]failed[/bold red]",
+            f"{result.duration:.1f}s",
+            result.path if result.ok else f"{result.log_path} ({result.message})",
+        )
+    print(table)
+
+
+def validate_projects(projects: list[BatchProject]) -> None:
+    """
+    Every project is rendered into a directory named by its project_id - reject
+    duplicates before any worker starts.
+    """
+    names: dict[str, list[str]] = dict()
+    for project in projects:
+        project_id = project.answers.get("project_id") or project.name
+        names.setdefault(project_id, []).append(project.name)
+    duplicates = {
+        project_id: project_names
+        for project_id, project_names in names.items()
+        if len(project_names) > 1
+    }
+    if duplicates:
+        for project_id, project_names in duplicates.items():
+            print(
+                f"[bold red]project_id {project_id} is used by {', '.join(project_names)}[/bold red]"
+            )
+        exit(1)
+
+
+def create_templates(
+    projects: list[BatchProject],
+    jobs: int = DEFAULT_JOBS,
+    ssh: bool = False,
+    offline: bool = False,
+    create_remote_repo: bool = False,
+) -> list[ProjectResult]:
+    """
+    Create many projects at once: precheck, credentials and the template
+    mirrors are handled once, the projects are rendered and their callbacks
+    run in a pool of at most `jobs` processes.
+    """
+    validate_projects(projects)
+    template_precheck(
+        any(project.check_win_registry for project in projects),
+        caller_command=" ".join(["pulse8", *sys.argv[1:]]),
+    )
+    github_credentials = get_github_credentials()
+    # mirror path and answers file source of every template
+    templates: dict[str, tuple[str, str]] = dict()
+    for project in projects:
+        if project.template_repo_name not in templates:
+            src_path = get_template_src_path(
+                project.template_repo_name, ssh, github_credentials
+            )
+            templates[project.template_repo_name] = (
+                get_template_mirror(project.template_repo_name, src_path, offline),
+                remove_credentials(src_path),
+            )
+
+    log_dir = create_batch_log_dir()
+    output_dir = os.getcwd()
+    print(
+        f"[bold]creating {len(projects)} projects with {jobs} parallel jobs (logs: {log_dir})...[/bold]"
+    )
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {
+            executor.submit(
+                create_project,
+                project,
+                *templates[project.template_repo_name],
+                output_dir,
+                str(log_dir.joinpath(f"{index:02d}-{project.name}.log")),
+            ): index
+            for index, project in enumerate(projects)
+        }
+        results: list[ProjectResult | None] = [None] * len(projects)
+        for future in as_completed(futures):
+            result = future.result()
+            status = "[green]created[/green]" if result.ok else "[red]failed[/red]"
+            print(f"{result.name}: {status} ({result.duration:.1f}s)")
+            results[futures[future]] = result
+
+    if create_remote_repo:
+        # gh may ask questions - remotes are created one after another
+        for result in results:
+            if result.ok:
+                os.chdir(result.path)
+                git_create_remote(
+                    True,
+                    Path(result.path).name,
+                    github_credentials.user,
+                    github_credentials.token,
+                )
+        os.chdir(output_dir)
+    print_batch_report(results)
+    return results
+
+
+def create_templates_from_answers_dir(
+    template_repo_name: str,
+    answers_dir: Path,
+    callback_after_git_init: Callable[[], None] | None = None,
+    check_win_registry: bool = False,
+    project_type: str = "",
+    **kwargs,
+) -> None:
+    projects = [
+        BatchProject(
+            name=name,
+            template_repo_name=template_repo_name,
+            answers=answers,
+            callback_after_git_init=callback_after_git_init,
+            check_win_registry=check_win_registry,
+            project_type=project_type,
+        )
+        for name, answers in read_answers_dir(answers_dir)
+    ]
+    results = create_templates(projects, **kwargs)
+    if not all(result.ok for result in results):
+        exit(1)
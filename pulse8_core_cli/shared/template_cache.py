@@ -0,0 +1,151 @@
+import os
+import re
+import shutil
+from pathlib import Path
+
+from rich import print
+
+from pulse8_core_cli.shared.module import get_templates_dir_path
+from pulse8_core_cli.shared.profiling import profiled
+from pulse8_core_cli.shared.runner import run_command
+
+# number of template mirrors kept, the least recently used are removed
+TEMPLATE_CACHE_SIZE = 10
+FETCH_REFSPECS = ("+refs/heads/*:refs/heads/*", "+refs/tags/*:refs/tags/*")
+
+
+def remove_credentials(url: str) -> str:
+    return re.sub("//.*:.*@github\\.com/", "//github.com/", url)
+
+
+def get_template_mirror_path(template_repo_name: str) -> Path:
+    return get_templates_dir_path().joinpath(f"{template_repo_name}.git")
+
+
+def create_template_mirror(mirror_path: Path, remote_url: str) -> bool:
+    result = run_command(("git", "clone", "--bare", "--quiet", remote_url, mirror_path))
+    if not result.ok:
+        shutil.rmtree(mirror_path, ignore_errors=True)
+        print(result.stderr)
+        return False
+    # the remote is only fetched with explicit urls - keep no credentials on disk
+    run_command(
+        (
+            "git",
+            "--git-dir",
+            mirror_path,
+            "remote",
+            "set-url",
+            "origin",
+            remove_credentials(remote_url),
+        )
+    )
+    return True
+
+
+def fetch_template_mirror(mirror_path: Path, remote_url: str) -> bool:
+    """
+    Fetch only what changed since the last use - branches and tags are
+    overwritten, deleted ones are pruned.
+    """
+    result = run_command(
+        (
+            "git",
+            "--git-dir",
+            mirror_path,
+            "fetch",
+            "--quiet",
+            "--prune",
+            remote_url,
+            *FETCH_REFSPECS,
+        )
+    )
+    if not result.ok:
+        print(result.stderr)
+    return result.ok
+
+
+def prune_template_cache() -> None:
+    mirrors = sorted(
+        get_templates_dir_path().glob("*.git"),
+        key=lambda path: path.stat().st_mtime,
+        reverse=True,
+    )
+    for mirror_path in mirrors[TEMPLATE_CACHE_SIZE:]:
+        print(f"removing unused template cache {mirror_path.name}...")
+        shutil.rmtree(mirror_path, ignore_errors=True)
+
+
+@profiled()
+def get_template_mirror(
+    template_repo_name: str, remote_url: str, offline: bool = False
+) -> str:
+    """
+    Path of the local bare mirror of a template repository for copier. The
+    mirror is created on first use and brought up to date on every later use,
+    offline only the cached mirror is used.
+    """
+    mirror_path = get_template_mirror_path(template_repo_name)
+    if not mirror_path.exists():
+        if offline:
+            print(
+                f"[bold red]template {template_repo_name} is not cached yet - run once without --offline[/bold red]"
+            )
+            exit(1)
+        print(f"caching template {template_repo_name}...")
+        if not create_template_mirror(mirror_path, remote_url):
+            print(f"[bold red]failed to clone template {template_repo_name}[/bold red]")
+            exit(1)
+    elif not offline:
+        print(f"updating cached template {template_repo_name}...")
+        if not fetch_template_mirror(mirror_path, remote_url):
+            print(
+                f"[yellow]failed to update template {template_repo_name} - using the cached version[/yellow]"
+            )
+    else:
+        print(f"using cached template {template_repo_name} (offline)")
+    # the modification time orders the mirrors by last use
+    os.utime(mirror_path)
+    prune_template_cache()
+    return mirror_path.as_posix()
+
+
+def get_latest_template_tag(template_path: str) -> str | None:
+    """
+    The tag copier updates to - the highest PEP 440 version, without
+    prereleases. None if the template has no version tags.
+    """
+    from packaging import version
+
+    result = run_command(("git", "--git-dir", template_path, "tag", "--list"))
+    versions = []
+    for tag in result.stdout.split():
+        try:
+            tag_version = version.parse(tag)
+        except version.InvalidVersion:
+            continue
+        if not tag_version.is_prerelease:
+            versions.append((tag_version, tag))
+    return max(versions)[1] if versions else None
+
+
+def is_latest_template_commit(template_path: str, commit: str | None) -> bool:
+    """
+    If the commit (copier's `_commit`, a `git describe` of the template) is the
+    commit of the latest tag.
+    """
+    latest_tag = get_latest_template_tag(template_path)
+    if not commit or latest_tag is None:
+        return False
+    result = run_command(
+        (
+            "git",
+            "--git-dir",
+            template_path,
+            "rev-parse",
+            f"{commit}^{{commit}}",
+            f"{latest_tag}^{{commit}}",
+        )
+    )
+    hashes = result.stdout.split()
+    return result.ok and len(hashes) == 2 and hashes[0] == hashes[1]
@@ -1,9 +1,10 @@
 import winreg
-import os
 import pyuac
 
 from rich import print
 
+from pulse8_core_cli.shared.runner import run_command
+
 
 def setup_win_registry():
     long_paths_value = get_win_registry_value_long_paths_enabled()
@@ -38,7 +39,8 @@ def setup_win_registry_admin(caller_command: str = None):
         if return_code == 0:
             print("[green]Successfully updated Windows registry.[/green]")
             if caller_command is not None:
-                os.system(caller_command)
+                # run the original command again now that long paths are enabled
+                run_command(caller_command.split(), interactive=True)
                 exit(0)
         else:
             print(
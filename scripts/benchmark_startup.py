@@ -0,0 +1,107 @@
+"""
+Measure the cold-start time of the pulse8 CLI and the import cost of each of its
+sub-apps. Exits with code 1 if a startup time exceeds its budget.
+
+    python scripts/benchmark_startup.py --runs 10
+"""
+
+import statistics
+import subprocess
+import sys
+import time
+from typing import Annotated
+
+import typer
+from rich import print
+from rich.table import Table
+
+from pulse8_core_cli.main import SUB_APPS
+
+# median wall time in ms of `pulse8 --help`, i.e. interpreter start, typer and
+# the root command without any sub-app
+ROOT_STARTUP_BUDGET_MS = 400
+# median wall time in ms of `pulse8 <sub-app> --help`, imports the sub-app only
+SUB_APP_STARTUP_BUDGET_MS = 500
+
+app = typer.Typer()
+
+
+def measure_startup(args: list[str], runs: int) -> float:
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-m", "pulse8_core_cli.main", *args],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=False,
+        )
+        durations.append((time.perf_counter() - start) * 1000)
+    return statistics.median(durations)
+
+
+def measure_import_cost(import_path: str) -> float:
+    """
+    Cumulative import time in ms of a module on top of what the root command
+    already imports (python -X importtime).
+    """
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            f"import pulse8_core_cli.main; import {import_path}",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        _, _, columns = line.partition("import time:")
+        fields = columns.split("|")
+        if len(fields) == 3 and fields[2].strip() == import_path:
+            return int(fields[1]) / 1000
+    return 0.0
+
+
+@app.command()
+def main(
+    runs: Annotated[int, typer.Option(help="Runs per measurement")] = 5,
+    root_budget_ms: Annotated[
+        int, typer.Option(help="Budget of the root command")
+    ] = ROOT_STARTUP_BUDGET_MS,
+    sub_app_budget_ms: Annotated[
+        int, typer.Option(help="Budget of each sub-app")
+    ] = SUB_APP_STARTUP_BUDGET_MS,
+):
+    table = Table("command", "startup (ms)", "import cost (ms)", "budget (ms)")
+    over_budget = []
+
+    root_startup = measure_startup(["--help"], runs)
+    table.add_row("pulse8", f"{root_startup:.0f}", "", str(root_budget_ms))
+    if root_startup > root_budget_ms:
+        over_budget.append("pulse8")
+
+    for sub_app in SUB_APPS:
+        startup = measure_startup([sub_app.name, "--help"], runs)
+        import_cost = measure_import_cost(sub_app.import_path)
+        table.add_row(
+            f"pulse8 {sub_app.name}",
+            f"{startup:.0f}",
+            f"{import_cost:.0f}",
+            str(sub_app_budget_ms),
+        )
+        if startup > sub_app_budget_ms:
+            over_budget.append(f"pulse8 {sub_app.name}")
+
+    print(table)
+    if over_budget:
+        print(f"[bold red]over budget: {', '.join(over_budget)}[/bold red]")
+        exit(1)
+    print("[green]startup within budget[/green]")
+
+
+if __name__ == "__main__":
+    app()